@@ -0,0 +1 @@
+"""Микробенчмарки игрового ядра (запуск: ``python -m benchmarks.<модуль>``)."""
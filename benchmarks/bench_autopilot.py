@@ -0,0 +1,61 @@
+"""Время решения ``Autopilot`` на большом поле.
+
+Запуск::
+
+    python -m benchmarks.bench_autopilot [--size 100] [--ticks 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from snake_game.ai import Autopilot
+from snake_game.core import SnakeGameConfig, SnakeGameEngine
+
+
+def bench(size: int, ticks: int, seed: int = 3) -> dict[str, float]:
+    """Играет автопилотом и возвращает статистику решений в мс."""
+
+    engine = SnakeGameEngine(
+        SnakeGameConfig(cols=size, rows=size, rng_seed=seed)
+    )
+    autopilot = Autopilot()
+    timings: list[float] = []
+    for _ in range(ticks):
+        if engine.state.game_over:
+            break
+        start = time.perf_counter()
+        direction = autopilot.decide(engine)
+        timings.append(time.perf_counter() - start)
+        if direction is not None:
+            engine.set_direction(direction)
+        engine.step()
+    timings.sort()
+    count = len(timings)
+    return {
+        "decisions": count,
+        "score": engine.state.score,
+        "mean": sum(timings) / count * 1000,
+        "p50": timings[count // 2] * 1000,
+        "p99": timings[int(count * 0.99)] * 1000,
+        "max": timings[-1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    args = parser.parse_args()
+    stats = bench(args.size, args.ticks)
+    print(
+        f"autopilot {args.size}×{args.size}: "
+        f"{stats['decisions']:.0f} решений, счёт {stats['score']:.0f}"
+    )
+    for name in ("mean", "p50", "p99", "max"):
+        print(f"  {name}: {stats[name]:.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
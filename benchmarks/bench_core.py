@@ -0,0 +1,340 @@
+"""Набор микробенчмарков ядра: шаг, появление еды, resize и сессия.
+
+Замеряет пропускную способность (операций в секунду на одном ядре) на
+полях от 10×10 до 1000×1000 и для разной длины змейки. Результаты
+пишутся в JSON; с ``--baseline`` они сравниваются с сохранённым
+прогоном, и замеры медленнее базы больше чем на ``--threshold``
+считаются регрессией (код возврата 1). Запуск::
+
+    python -m benchmarks.bench_core --output base.json
+    python -m benchmarks.bench_core --baseline base.json [--threshold 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from snake_game.core import Direction, SnakeGameConfig, SnakeGameEngine
+from snake_game.services import SnakeSession
+
+from .bench_resize import serpentine
+
+SIZES: tuple[tuple[int, int], ...] = ((10, 10), (100, 100), (1000, 1000))
+OPERATIONS = ("step", "session_step", "spawn_food", "resize")
+DEFAULT_THRESHOLD = 0.10
+
+# Формат файла результатов; сравниваются только совпадающие версии
+FORMAT_VERSION = 1
+
+
+@dataclass(slots=True)
+class Measurement:
+    """Итог замера: сколько операций и за какое время (лучший раунд)."""
+
+    operations: int
+    seconds: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.operations / self.seconds if self.seconds else 0.0
+
+
+@dataclass(slots=True)
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Относительное изменение скорости (отрицательное — медленнее)."""
+
+        return self.current / self.baseline - 1.0
+
+
+def snake_lengths(cols: int, rows: int) -> list[int]:
+    """Длины змейки для поля: стартовая, строка, 10 % и 50 % клеток."""
+
+    cells = cols * rows
+    return sorted({3, cols, cells // 10, cells // 2} - {0, 1, 2})
+
+
+def _config(cols: int, rows: int, compact_body: bool) -> SnakeGameConfig:
+    return SnakeGameConfig(
+        cols=cols,
+        rows=rows,
+        rng_seed=1,
+        wrap_edges=True,
+        compact_body=compact_body,
+    )
+
+
+def _place_snake(engine: SnakeGameEngine, length: int) -> None:
+    """Кладёт змейку-«змеевик» по нижним строкам, голова смотрит вверх.
+
+    Над головой свободный столбец, еда лежит в стороне от него, поэтому
+    каждый тик замера — обычное движение без еды и столкновений.
+    """
+
+    state = engine.state
+    cols = state.cols
+    rows = state.rows
+    snake = serpentine(cols, rows, length)
+    head_x, head_y = snake[0]
+    if head_y + 1 >= rows:
+        raise ValueError("Над головой змейки не осталось свободных строк")
+    state.snake = engine._new_body(cols, rows, snake)
+    state.direction = state.pending_direction = Direction.UP
+    state.food = ((head_x + 1) % cols, rows - 1)
+    engine.snapshot()  # синхронизирует индексы поля
+
+
+def free_ticks(engine: SnakeGameEngine) -> int:
+    """Сколько тиков голова идёт вверх по свободному столбцу."""
+
+    return engine.state.rows - 1 - engine.state.snake[0][1]
+
+
+# Пачка операций: возвращает их число и чистое время выполнения (без
+# подготовки следующей пачки)
+Batch = Callable[[], tuple[int, float]]
+
+
+def measure(batch: Batch, *, min_time: float, rounds: int) -> Measurement:
+    """Гоняет пачки не меньше ``min_time`` секунд за раунд, лучший раунд."""
+
+    best: Measurement | None = None
+    for _ in range(rounds):
+        operations = 0
+        seconds = 0.0
+        while True:
+            done, elapsed = batch()
+            operations += done
+            seconds += elapsed
+            if seconds >= min_time:
+                break
+        current = Measurement(operations, seconds)
+        if best is None or current.ops_per_second > best.ops_per_second:
+            best = current
+    assert best is not None
+    return best
+
+
+def _ticks_batch(
+    engine: SnakeGameEngine, step: Callable[[], object]
+) -> Batch:
+    """Тики до конца свободного столбца, затем откат к снимку."""
+
+    snapshot = engine.snapshot()
+    ticks = free_ticks(engine)
+    clock = time.perf_counter
+
+    def batch() -> tuple[int, float]:
+        start = clock()
+        for _ in range(ticks):
+            step()
+        elapsed = clock() - start
+        engine.restore(snapshot)
+        return ticks, elapsed
+
+    return batch
+
+
+def _step_batch(engine: SnakeGameEngine) -> Batch:
+    return _ticks_batch(engine, engine.step)
+
+
+def _session_batch(session: SnakeSession) -> Batch:
+    return _ticks_batch(session.engine, session.step)
+
+
+def _spawn_batch(engine: SnakeGameEngine) -> Batch:
+    spawn = engine._spawn_food
+    state = engine.state
+    clock = time.perf_counter
+
+    def batch() -> tuple[int, float]:
+        start = clock()
+        for _ in range(1000):
+            spawn(state)
+        return 1000, clock() - start
+
+    return batch
+
+
+def _resize_batch(engine: SnakeGameEngine) -> Batch:
+    cols = engine.state.cols
+    rows = engine.state.rows
+    clock = time.perf_counter
+
+    def batch() -> tuple[int, float]:
+        # Туда и обратно: змейка лежит внутри исходного поля и не меняется
+        start = clock()
+        engine.resize(cols + 1, rows + 1, preserve_state=True)
+        engine.resize(cols, rows, preserve_state=True)
+        return 2, clock() - start
+
+    return batch
+
+
+_BATCHES: dict[str, Callable[[SnakeGameEngine], Batch]] = {
+    "step": _step_batch,
+    "spawn_food": _spawn_batch,
+    "resize": _resize_batch,
+}
+
+
+def run_suite(
+    sizes: Iterable[tuple[int, int]] = SIZES,
+    operations: Iterable[str] = OPERATIONS,
+    *,
+    min_time: float = 0.2,
+    rounds: int = 3,
+    compact_body: bool = False,
+    progress: Callable[[str, Measurement], None] | None = None,
+) -> dict[str, Measurement]:
+    """Прогоняет все замеры; ключ — ``операция/COLSxROWS/lenN``."""
+
+    wanted = tuple(operations)
+    unknown = set(wanted) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Неизвестные операции: {sorted(unknown)}")
+    results: dict[str, Measurement] = {}
+    for cols, rows in sizes:
+        for length in snake_lengths(cols, rows):
+            for operation in wanted:
+                config = _config(cols, rows, compact_body)
+                if operation == "session_step":
+                    session = SnakeSession(config)
+                    _place_snake(session.engine, length)
+                    batch = _session_batch(session)
+                else:
+                    engine = SnakeGameEngine(config)
+                    _place_snake(engine, length)
+                    batch = _BATCHES[operation](engine)
+                name = f"{operation}/{cols}x{rows}/len{length}"
+                results[name] = measure(
+                    batch, min_time=min_time, rounds=rounds
+                )
+                if progress is not None:
+                    progress(name, results[name])
+    return results
+
+
+def to_json(
+    results: dict[str, Measurement], **meta: Any
+) -> dict[str, Any]:
+    return {
+        "version": FORMAT_VERSION,
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": {
+            name: {
+                "ops_per_second": measurement.ops_per_second,
+                "operations": measurement.operations,
+                "seconds": measurement.seconds,
+            }
+            for name, measurement in results.items()
+        },
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Замеры, которые медленнее базы больше чем на ``threshold``.
+
+    Сравниваются только замеры, которые есть в обоих прогонах.
+    """
+
+    if baseline.get("version") != current.get("version"):
+        raise ValueError("Версии формата результатов не совпадают")
+    regressions = []
+    base_results = baseline["results"]
+    for name, entry in current["results"].items():
+        base = base_results.get(name)
+        if base is None or base["ops_per_second"] <= 0:
+            continue
+        speed = entry["ops_per_second"]
+        if speed < base["ops_per_second"] * (1.0 - threshold):
+            regressions.append(
+                Regression(name, base["ops_per_second"], speed)
+            )
+    return regressions
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    cols, _, rows = value.partition("x")
+    return int(cols), int(rows or cols)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size",
+        action="append",
+        type=_parse_size,
+        help="размер поля COLSxROWS (можно несколько раз)",
+    )
+    parser.add_argument(
+        "--operation", action="append", choices=OPERATIONS
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--compact-body", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD
+    )
+    args = parser.parse_args(argv)
+
+    def report(name: str, measurement: Measurement) -> None:
+        print(f"{name:<40} {measurement.ops_per_second:>14,.0f} оп/с")
+
+    results = run_suite(
+        args.size or SIZES,
+        args.operation or OPERATIONS,
+        min_time=args.min_time,
+        rounds=args.rounds,
+        compact_body=args.compact_body,
+        progress=report,
+    )
+    document = to_json(results, compact_body=args.compact_body)
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(document, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(document, baseline, args.threshold)
+    for regression in regressions:
+        print(
+            f"РЕГРЕССИЯ {regression.name}: {regression.baseline:,.0f} → "
+            f"{regression.current:,.0f} оп/с ({regression.change:+.1%})"
+        )
+    if not regressions:
+        print(f"Регрессий больше {args.threshold:.0%} нет")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Прогон движка до заполнения поля гамильтоновым ботом.
+
+Змейка растёт до размера поля, поэтому прогон нагружает пути движка,
+линейные по длине тела. Запуск::
+
+    python -m benchmarks.bench_full_board [--cols 40] [--rows 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from snake_game.ai import HamiltonianCycle, HamiltonianSolver
+from snake_game.core import SnakeGameConfig, SnakeGameEngine
+
+
+def bench(cols: int, rows: int, seed: int = 1) -> dict[str, float]:
+    """Играет до заполнения поля; возвращает тики, длину и время."""
+
+    start = time.perf_counter()
+    HamiltonianCycle.for_board(cols, rows)
+    cycle_seconds = time.perf_counter() - start
+
+    engine = SnakeGameEngine(
+        SnakeGameConfig(cols=cols, rows=rows, rng_seed=seed)
+    )
+    solver = HamiltonianSolver()
+    start = time.perf_counter()
+    summary = engine.run(cols * rows * cols * rows, solver)
+    seconds = time.perf_counter() - start
+    return {
+        "cycle_ms": cycle_seconds * 1000,
+        "ticks": summary.ticks,
+        "length": len(engine.state.snake),
+        "seconds": seconds,
+        "ticks_per_second": summary.ticks / seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--rows", type=int, default=30)
+    args = parser.parse_args()
+    stats = bench(args.cols, args.rows)
+    print(
+        f"поле {args.cols}×{args.rows}: цикл за {stats['cycle_ms']:.1f} мс, "
+        f"длина {stats['length']:.0f} за {stats['ticks']:.0f} тиков, "
+        f"{stats['seconds']:.2f} с ({stats['ticks_per_second']:.0f} тиков/с)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Бенчмарк ``SnakeGameEngine.resize(preserve_state=True)`` на длинной змейке.
+
+Запуск::
+
+    python -m benchmarks.bench_resize [--segments 10000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from snake_game.core import SnakeGameConfig, SnakeGameEngine
+from snake_game.core.state import Point
+
+
+def serpentine(cols: int, rows: int, length: int) -> list[Point]:
+    """Змейка-«змеевик» заданной длины, уложенная по строкам поля."""
+
+    snake: list[Point] = []
+    for y in range(rows):
+        xs = range(cols) if y % 2 == 0 else range(cols - 1, -1, -1)
+        for x in xs:
+            snake.append((x, y))
+            if len(snake) == length:
+                snake.reverse()
+                return snake
+    raise ValueError("Змейка не помещается на поле")
+
+
+def bench(segments: int, repeat: int) -> dict[str, float]:
+    """Возвращает среднее время (мс) для разных сценариев изменения размера."""
+
+    cols = 200
+    rows = max(segments // cols + 2, 10)
+    scenarios = {
+        "same_size": (cols, rows),
+        "grow": (cols + 40, rows + 20),
+        "shrink": (cols // 2, rows),
+    }
+    results: dict[str, float] = {}
+    for name, (new_cols, new_rows) in scenarios.items():
+        total = 0.0
+        for _ in range(repeat):
+            engine = SnakeGameEngine(
+                SnakeGameConfig(cols=cols, rows=rows, rng_seed=1)
+            )
+            engine.state.snake = serpentine(cols, rows, segments)
+            engine.step()  # синхронизирует индексы
+            start = time.perf_counter()
+            engine.resize(new_cols, new_rows, preserve_state=True)
+            total += time.perf_counter() - start
+        results[name] = total / repeat * 1000
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for name, millis in bench(args.segments, args.repeat).items():
+        print(f"resize[{name}] {args.segments} сегментов: {millis:.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
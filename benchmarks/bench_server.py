@@ -0,0 +1,215 @@
+"""Нагрузочный клиент сервера сессий: джиттер тиков и сессии на ядро.
+
+Открывает ``--sessions`` соединений, в каждом начинает игру и играет
+случайными поворотами, перезапуская её после проигрыша. Джиттер — это
+отклонение интервала между строками ``T`` от ``1 / speed``; число
+сессий на ядро считается по времени процессора самого сервера за окно
+замера. Без ``--tcp``/``--unix`` сервер запускается отдельным процессом
+на свободном порту localhost. Клиент на той же машине делит с
+сервером процессор, поэтому джиттер включает и его собственные
+задержки; опоздание колеса сервер меряет сам. Для тысяч соединений
+поднимите ``ulimit -n``.
+
+Запуск::
+
+    python -m benchmarks.bench_server [--sessions 1000] [--duration 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from functools import partial
+
+from snake_game.core import Direction, GameStepEvent
+from snake_game.services import LatencyHistogram
+
+Connect = Callable[
+    [], Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+]
+
+GAME_OVER = GameStepEvent.GAME_OVER.mask
+DIRECTIONS = [direction.name for direction in Direction]
+
+
+async def _read_stats(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    reset: bool = False,
+) -> dict[str, float]:
+    writer.write(b"STATS RESET\n" if reset else b"STATS\n")
+    await writer.drain()
+    line = await reader.readline()
+    _, *pairs = line.decode().split()
+    return {
+        key: float(value)
+        for key, value in (pair.split("=") for pair in pairs)
+    }
+
+
+async def _play(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    jitter: LatencyHistogram,
+    rng: random.Random,
+    stop: asyncio.Event,
+) -> None:
+    writer.write(b"START\n")
+    previous: float | None = None
+    interval = 0.0
+    while not stop.is_set():
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("сервер закрыл соединение")
+        now = time.perf_counter()
+        fields = line.split()
+        if fields[0] != b"T":
+            continue
+        if previous is not None:
+            jitter.record(int(abs(now - previous - interval) * 1e9))
+        previous = now
+        interval = 1.0 / float(fields[4])
+        if int(fields[2]) & GAME_OVER:
+            writer.write(b"RESTART\n")
+            # Пауза до RESTART — не джиттер тика
+            previous = None
+        elif rng.random() < 0.2:
+            writer.write(f"TURN {rng.choice(DIRECTIONS)}\n".encode())
+    writer.write(b"QUIT\n")
+    with contextlib.suppress(ConnectionError):
+        await writer.drain()
+    writer.close()
+
+
+async def run_load(
+    connect: Connect, sessions: int, duration: float, seed: int = 0
+) -> dict[str, float]:
+    """Ведёт ``sessions`` игр ``duration`` секунд и возвращает сводку.
+
+    Джиттер — в мкс; ``server_cpu`` — доля ядра, которую сервер занял
+    за окно замера.
+    """
+
+    jitter = LatencyHistogram()
+    stop = asyncio.Event()
+    control = await connect()
+    players = []
+    for index in range(sessions):
+        # По одному: очередь accept сервера не переполняется
+        reader, writer = await connect()
+        rng = random.Random(seed + index)  # noqa: B311,S311  # nosec
+        players.append(
+            asyncio.create_task(_play(reader, writer, jitter, rng, stop))
+        )
+    # Подключение тысяч клиентов в окно замера не входит
+    while (await _read_stats(*control))["sessions"] < sessions:
+        for player in players:
+            if player.done():
+                player.result()
+        await asyncio.sleep(0.1)
+    await asyncio.sleep(1.0)
+    jitter.reset()
+    before = await _read_stats(*control, reset=True)
+    await asyncio.sleep(duration)
+    after = await _read_stats(*control)
+    stop.set()
+    await asyncio.gather(*players)
+    control[1].close()
+
+    wall = after["wall"] - before["wall"]
+    cpu = after["cpu"] - before["cpu"]
+    load = cpu / wall if wall > 0 else 0.0
+    summary = {
+        f"jitter_{key}": value for key, value in jitter.summary().items()
+    }
+    summary.update(
+        sessions=sessions,
+        ticks_per_second=(after["ticks"] - before["ticks"]) / wall,
+        server_cpu=load,
+        sessions_per_core=sessions / load if load > 0 else float("inf"),
+        late_p99_us=after["late_p99_us"],
+        late_max_us=after["late_max_us"],
+    )
+    return summary
+
+
+@contextlib.contextmanager
+def spawn_server(resolution: float) -> Iterator[int]:
+    """Запускает сервер на свободном порту localhost и отдаёт порт."""
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port: int = probe.getsockname()[1]
+    process = subprocess.Popen(  # noqa: S603  # nosec
+        [
+            sys.executable,
+            "-m",
+            "snake_game.services.server",
+            "--tcp",
+            f"127.0.0.1:{port}",
+            "--resolution",
+            str(resolution),
+        ]
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port)).close()
+                break
+            except ConnectionRefusedError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("сервер не запустился") from None
+                time.sleep(0.05)
+        yield port
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--resolution", type=float, default=0.005)
+    parser.add_argument("--tcp", metavar="HOST:PORT")
+    parser.add_argument("--unix", metavar="PATH")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        connect: Connect
+        if args.unix is not None:
+            connect = partial(asyncio.open_unix_connection, args.unix)
+        elif args.tcp is not None:
+            host, _, port = args.tcp.rpartition(":")
+            connect = partial(
+                asyncio.open_connection, host or "127.0.0.1", int(port)
+            )
+        else:
+            port = stack.enter_context(spawn_server(args.resolution))
+            connect = partial(asyncio.open_connection, "127.0.0.1", port)
+        stats = asyncio.run(run_load(connect, args.sessions, args.duration))
+
+    print(
+        f"server: {stats['sessions']:.0f} сессий, "
+        f"{stats['ticks_per_second']:.0f} тиков/с, "
+        f"загрузка ядра {stats['server_cpu']:.0%}, "
+        f"≈{stats['sessions_per_core']:.0f} сессий на ядро"
+    )
+    for name in ("p50", "p99", "p99.9", "max"):
+        print(f"  jitter {name}: {stats[f'jitter_{name}']:.0f} мкс")
+    print(
+        f"  опоздание колеса p99: {stats['late_p99_us']:.0f} мкс, "
+        f"max: {stats['late_max_us']:.0f} мкс"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Необязательная сборка ядра игры mypyc.
+
+Компилирует модули ``snake_game.core`` в расширения C рядом с
+исходниками; Python загружает их вместо ``.py`` сам. Без сборки (или
+для другой версии Python) игра работает на чистом Python, поведение
+не меняется — это проверяет ``tests/test_core_compiled.py``. Запуск::
+
+    python build_mypyc.py build_ext --inplace
+
+Откат на чистый Python — удалить собранные файлы::
+
+    python build_mypyc.py clean_inplace
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+from setuptools import setup
+
+ROOT = Path(__file__).resolve().parent
+CORE = ROOT / "snake_game" / "core"
+
+# vector.py работает на NumPy и от сборки не выигрывает; arena.py
+# mypyc пока не компилирует (внутренняя ошибка компилятора)
+EXCLUDED = {"__init__.py", "native.py", "vector.py", "arena.py"}
+
+
+def core_modules() -> list[str]:
+    return sorted(
+        str(path.relative_to(ROOT))
+        for path in CORE.glob("*.py")
+        if path.name not in EXCLUDED
+    )
+
+
+def clean_inplace() -> None:
+    for suffix in (".so", ".pyd"):
+        # Общая библиотека рантайма mypyc ложится в корень проекта
+        built = [*CORE.glob(f"*{suffix}"), *ROOT.glob(f"*__mypyc*{suffix}")]
+        for path in built:
+            print(f"Удаляю {path.relative_to(ROOT)}")
+            path.unlink()
+
+
+def main() -> None:
+    # mypycify и build_ext --inplace считают пути от текущего каталога
+    os.chdir(ROOT)
+    if sys.argv[1:] == ["clean_inplace"]:
+        clean_inplace()
+        return
+    from mypyc.build import mypycify
+
+    setup(
+        name="snake-game-core",
+        packages=[],
+        ext_modules=mypycify(core_modules(), opt_level="3"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,11 @@ except ImportError:
     logging.info("Running on desktop platform")
 
 import pygame  # noqa: E402
+from snake_game.core.effects import Effect, EffectScheduler  # noqa: E402
+from snake_game.core.food import (  # noqa: E402
+    FOOD_TABLES,
+    FOOD_TYPE_CONFIG as CORE_FOOD_TYPE_CONFIG,
+)
 # Removed Kivy imports; not used in Pygame implementation
 
 # Import leaderboard module
@@ -68,6 +73,8 @@ if NEW_RELIC_AVAILABLE:
 else:
     logging.info("New Relic package not installed; telemetry disabled")
 rng = random.SystemRandom()
+# Food type draws need no cryptographic strength; avoid a syscall per draw
+food_rng = random.Random()  # noqa: B311,S311  # nosec
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSET_FOLDERS = (
     '',
@@ -608,10 +615,11 @@ teal = pygame.Color(64, 224, 208)
 level = 1  # Initial level
 score = 0
 speed_boost_on_food = False
-speed_boost_active_until = 0
-invincible_until = 0
+# Boost and shield timers count game ticks, so they stop while paused
+effects = EffectScheduler()
 snake_body = []
 walls = []
+wall_cells = set()  # topleft of each wall, rebuilt by load_level
 moving_walls = []
 wrap_edges = False
 food_type = 'normal'
@@ -628,27 +636,21 @@ change_to = 'RIGHT'
 snake_color = green
 
 
+FOOD_COLORS = {
+    'normal': white,
+    'bonus': gold,
+    'speed': orange,
+    'shield': teal,
+}
+
+# Scores and effects come from the core; only colors are UI-specific
 FOOD_TYPE_CONFIG = {
-    'normal': {
-        'color': white,
-        'score': 1,
-        'effect': None,
-    },
-    'bonus': {
-        'color': gold,
-        'score': 5,
-        'effect': None,
-    },
-    'speed': {
-        'color': orange,
-        'score': 1,
-        'effect': 'speed',
-    },
-    'shield': {
-        'color': teal,
-        'score': 1,
-        'effect': 'shield',
-    },
+    food.value: {
+        'color': FOOD_COLORS[food.value],
+        'score': spec.score,
+        'effect': spec.effect,
+    }
+    for food, spec in CORE_FOOD_TYPE_CONFIG.items()
 }
 
 FOOD_LABELS = {
@@ -658,28 +660,6 @@ FOOD_LABELS = {
     'shield': 'Щит',
 }
 
-MODE_FOOD_CONFIG = {
-    'mvp': {
-        'bonus': {'base': 0.03, 'level': 0.01, 'score': 0.005, 'cap': 0.18},
-        'shield': {'base': 0.02, 'level': 0.008, 'score': 0.004, 'cap': 0.16},
-        'speed': {'base': 0.03, 'level': 0.012, 'score': 0.006, 'cap': 0.2},
-        'max_total': 0.55,
-    },
-    'map': {
-        'bonus': {'base': 0.07, 'level': 0.02, 'score': 0.01, 'cap': 0.35},
-        'shield': {'base': 0.06, 'level': 0.018, 'score': 0.009, 'cap': 0.32},
-        'speed': {'base': 0.05, 'level': 0.02, 'score': 0.01, 'cap': 0.3},
-        'max_total': 0.75,
-    },
-    'survival': {
-        'bonus': {'base': 0.04, 'level': 0.012, 'score': 0.007, 'cap': 0.25},
-        'shield': {'base': 0.07, 'level': 0.015, 'score': 0.01, 'cap': 0.35},
-        'speed': {'base': 0.06, 'level': 0.02, 'score': 0.012, 'cap': 0.32},
-        'max_total': 0.65,
-    },
-}
-
-
 # Theme-dependent colors
 def update_colors():
     global bg_color, text_color, wall_color, food_color
@@ -801,8 +781,8 @@ def reset_game():
     """Reset the game to initial state."""
     global snake_pos, snake_body, food_pos, food_spawn, direction, change_to
     global score, paused, played_death, level, walls, moving_walls
-    global wrap_edges, speed_boost_on_food, speed_boost_active_until
-    global invincible_until, premium_offer_active, difficulty, start_time
+    global wrap_edges, speed_boost_on_food
+    global premium_offer_active, difficulty, start_time
     
     snake_pos = [100, 50]
     snake_body = [[100, 50], [100 - 10, 50], [100 - (2 * 10), 50]]
@@ -818,8 +798,7 @@ def reset_game():
     moving_walls = []
     wrap_edges = False
     speed_boost_on_food = False
-    speed_boost_active_until = 0
-    invincible_until = 0
+    effects.clear()
     premium_offer_active = False
     load_level(level)
     
@@ -838,6 +817,11 @@ def toggle_pause():
     paused = not paused
 
 
+def effect_seconds(effect):
+    """Remaining effect time in whole seconds at the current game speed."""
+    return effects.remaining(effect) // max(difficulty, 1)
+
+
 def update_and_show_game_status():
     """Calculates and displays the current game status."""
     now = time.time()
@@ -868,11 +852,11 @@ def update_and_show_game_status():
         mode_text = ''
         countdown = ''
     effects_parts = []
-    if speed_boost_active_until > now:
-        boost_time = int(speed_boost_active_until - now)
+    if Effect.SPEED_BOOST in effects:
+        boost_time = effect_seconds(Effect.SPEED_BOOST)
         effects_parts.append(f'Буст:{boost_time}')
-    if invincible_until > now:
-        shield_time = int(invincible_until - now)
+    if Effect.SHIELD in effects:
+        shield_time = effect_seconds(Effect.SHIELD)
         effects_parts.append(f'Щит:{shield_time}')
     if food_type != 'normal':
         food_label = FOOD_LABELS.get(food_type, food_type)
@@ -895,8 +879,8 @@ def gameLoop():
     global game_over, game_close, paused, premium_offer_active
     global snake_List, Length_of_snake, x1, y1, x1_change, y1_change
     global foodx, foody, food_type, score, start_time, last_move_time
-    global current_direction, change_to, speed_boost_active_until
-    global invincible_until, mode, map_end_time, current_premium_minutes
+    global current_direction, change_to
+    global mode, map_end_time, current_premium_minutes
     global last_mode_switch, level, game_state, speed_setting
     global sound_setting, theme_setting, promo_input, played_death
     game_over = False
@@ -919,8 +903,7 @@ def gameLoop():
     last_move_time = time.time()
 
     # Effects
-    speed_boost_active_until = 0
-    invincible_until = 0
+    effects.clear()
 
     # Main game loop
     while not game_over:
@@ -1497,41 +1480,10 @@ def choose_food_type():
     if mode == 'mvp':
         return 'normal'
 
-    config = MODE_FOOD_CONFIG.get(mode, MODE_FOOD_CONFIG['mvp'])
-    
-    # Calculate probabilities
-    bonus_prob = min(
-        config['bonus']['cap'],
-        config['bonus']['base']
-        + (level * config['bonus']['level'])
-        + (score * config['bonus']['score']),
-    )
-    shield_prob = min(
-        config['shield']['cap'],
-        config['shield']['base']
-        + (level * config['shield']['level'])
-        + (score * config['shield']['score']),
-    )
-    speed_prob = min(
-        config['speed']['cap'],
-        config['speed']['base']
-        + (level * config['speed']['level'])
-        + (score * config['speed']['score']),
-    )
-
-    # Total probability capped at max_total
-    # (bonus_prob + shield_prob + speed_prob <= config['max_total'])
-
-    rand_val = rng.random()
-
-    if rand_val < bonus_prob:
-        return 'bonus'
-    elif rand_val < bonus_prob + shield_prob:
-        return 'shield'
-    elif rand_val < bonus_prob + shield_prob + speed_prob:
-        return 'speed'
-    else:
-        return 'normal'
+    # Precomputed CDF tables from the core: one draw plus a bisect,
+    # with the mode's max_total applied
+    table = FOOD_TABLES.get(mode, FOOD_TABLES['mvp'])
+    return table.choose(food_rng, level, score).value
 
 
 def spawn_food(force_type=None):
@@ -1554,7 +1506,7 @@ def spawn_food(force_type=None):
         ]
         if (
             food_pos not in snake_body
-            and food_pos not in [wall.topleft for wall in walls]
+            and tuple(food_pos) not in wall_cells
             and food_pos
             not in [moving['rect'].topleft for moving in moving_walls]
         ):
@@ -1576,3 +1528,6 @@ def load_level(level_num):
                 walls.append(pygame.Rect(i * 10, frame_size_y // 2, 10, 10))
     elif mode == 'survival':
         pass  # No walls in survival
+
+    wall_cells.clear()
+    wall_cells.update(wall.topleft for wall in walls)
@@ -0,0 +1,11 @@
+"""Боты для нагрузочных тестов и демонстрационного режима."""
+
+from .autopilot import Autopilot, DistanceField
+from .hamiltonian import HamiltonianCycle, HamiltonianSolver
+
+__all__ = [
+    "Autopilot",
+    "DistanceField",
+    "HamiltonianCycle",
+    "HamiltonianSolver",
+]
@@ -0,0 +1,330 @@
+"""Автопилот: кратчайший путь к еде с проверкой на тупики.
+
+Поле расстояний строится BFS от еды один раз на каждое её появление и
+хранится кольцами: ``rings[d]`` — маска клеток на расстоянии ``d``.
+Кольца достраиваются лениво, ровно до тех клеток, о которых спросил
+автопилот, а клетка, освобождённая хвостом, сразу получает расстояние от
+соседей. Каждый ход проверяется заливкой: после него у головы должно
+остаться места не меньше длины змейки или путь к хвосту.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..core import (
+    Direction,
+    SnakeGameConfig,
+    SnakeGameEngine,
+    SnakeGameState,
+)
+from ..core.state import Point, SnakeBody
+from .bitboard import BitBoard
+
+if TYPE_CHECKING:
+    from ..services import SnakeSession
+
+DIRECTIONS: tuple[Direction, ...] = tuple(Direction)
+
+# Расстояние до недостижимой клетки
+UNREACHABLE = 1 << 30
+
+# Сколько колец волны можно достроить за одно решение. Кольцо — около
+# десятка операций над маской поля, так что на поле 100×100 решение
+# укладывается в 1 мс даже в лабиринте из тела змейки.
+RING_BUDGET = 96
+
+
+class DistanceField:
+    """Расстояния BFS от еды, хранящиеся кольцами битовых масок."""
+
+    __slots__ = ("_board", "_rings", "_reached", "food", "stale", "budget")
+
+    def __init__(self, board: BitBoard, food: int) -> None:
+        self._board = board
+        self.food = food
+        self._rings = [1 << food]
+        self._reached = 1 << food
+        # True, если освобождённая клетка открыла проход к клеткам,
+        # которые волна уже не достроит: поле стоит построить заново
+        self.stale = False
+        # Сколько колец ещё можно достроить; владелец пополняет бюджет
+        self.budget = RING_BUDGET
+
+    def distance(self, cell: int, free: int) -> int:
+        """Расстояние от еды до клетки по свободным клеткам ``free``.
+
+        Если клетка ещё не достигнута, кольца достраиваются до неё (или
+        пока волна не упрётся в препятствия). Когда бюджет колец исчерпан,
+        возвращается оценка снизу: клетка не ближе последнего кольца и не
+        ближе манхэттенского расстояния.
+        """
+
+        bit = 1 << cell
+        rings = self._rings
+        if not self._reached & bit:
+            spread = self._board.spread
+            unvisited = free & ~self._reached
+            front = rings[-1]
+            distance = UNREACHABLE
+            while True:
+                if self.budget <= 0:
+                    distance = max(len(rings), self._lower_bound(cell))
+                    break
+                self.budget -= 1
+                front = spread(front) & unvisited
+                if not front:
+                    break
+                rings.append(front)
+                unvisited ^= front
+                if front & bit:
+                    distance = len(rings) - 1
+                    break
+            self._reached |= free & ~unvisited
+            return distance
+        # BFS-расстояние не меньше манхэттенского, с него и начинаем
+        for distance in range(self._lower_bound(cell), len(rings)):
+            if rings[distance] & bit:
+                return distance
+        return UNREACHABLE  # pragma: no cover - клетка есть в кольцах
+
+    def relax(self, cell: int, free: int) -> None:
+        """Добавляет освободившуюся клетку рядом с уже достигнутыми."""
+
+        bit = 1 << cell
+        if self._reached & bit:
+            return
+        board = self._board
+        neighbours = board.spread(bit) & self._reached
+        if not neighbours:
+            return
+        rings = self._rings
+        # Кольцо последнее — клетку найдёт следующее достраивание
+        start = max(self._lower_bound(cell) - 1, 0)
+        for distance in range(start, len(rings) - 1):
+            if rings[distance] & neighbours:
+                rings[distance + 1] |= bit
+                self._reached |= bit
+                if board.spread(bit) & free & ~self._reached:
+                    self.stale = True
+                return
+
+    def _lower_bound(self, cell: int) -> int:
+        board = self._board
+        cols = board.cols
+        y, x = divmod(cell, cols)
+        food_y, food_x = divmod(self.food, cols)
+        dx = abs(x - food_x)
+        dy = abs(y - food_y)
+        if board.wrap:
+            dx = min(dx, cols - dx)
+            dy = min(dy, board.rows - dy)
+        return dx + dy
+
+
+class Autopilot:
+    """Бот, выбирающий направление по текущему состоянию движка.
+
+    Экземпляр — политика для ``SnakeGameEngine.run`` (его можно вызвать
+    с движком) и умеет управлять сессией через :meth:`steer`. Маска
+    занятых клеток обновляется по разнице между тиками, поэтому
+    автопилот нужно спрашивать на каждом тике; после пропусков,
+    ``restore`` или смены поля он сам пересобирает данные.
+    """
+
+    __slots__ = (
+        "_board",
+        "_walls",
+        "_wall_cells",
+        "_blocked",
+        "_field",
+        "_state",
+        "_snake",
+        "_steps",
+        "_head",
+        "_tail",
+        "_length",
+    )
+
+    def __init__(self) -> None:
+        self._board: BitBoard | None = None
+        self._walls = 0
+        self._wall_cells: frozenset[Point] | None = None
+        self._blocked = 0
+        self._field: DistanceField | None = None
+        self._state: SnakeGameState | None = None
+        self._snake: SnakeBody | None = None
+        self._steps = -1
+        self._head: Point = (0, 0)
+        self._tail: Point = (0, 0)
+        self._length = 0
+
+    def __call__(self, engine: SnakeGameEngine) -> Direction | None:
+        return self.decide(engine)
+
+    def steer(self, session: SnakeSession) -> Direction | None:
+        """Выбирает направление и передаёт его в ``session.set_direction``."""
+
+        direction = self.decide(session.engine)
+        if direction is not None:
+            session.set_direction(direction)
+        return direction
+
+    def decide(self, engine: SnakeGameEngine) -> Direction | None:
+        """Лучшее безопасное направление или None, если ходов нет."""
+
+        state = engine.state
+        if state.game_over:
+            return None
+        board = self._sync(state, engine.config)
+        cols = state.cols
+        blocked = self._blocked
+        free = board.full & ~blocked
+        food_x, food_y = state.food
+        food = food_y * cols + food_x
+        field = self._field
+        if field is None or field.food != food:
+            field = self._field = DistanceField(board, food)
+        else:
+            field.budget = RING_BUDGET
+
+        head_x, head_y = state.snake[0]
+        head = head_y * cols + head_x
+        tail_x, tail_y = state.snake[-1]
+        tail_bit = 1 << (tail_y * cols + tail_x)
+        length = len(state.snake)
+        current = state.direction
+
+        best: Direction | None = None
+        best_key: tuple[int, int] | None = None
+        fallback: Direction | None = None
+        fallback_room = -1
+        for direction in DIRECTIONS:
+            if length > 1 and direction.is_opposite(current):
+                continue
+            cell = board.neighbour(head, direction.dx, direction.dy)
+            if cell is None or blocked >> cell & 1:
+                continue
+            bit = 1 << cell
+            # После хода клетка занята головой, хвост (если не съели)
+            # освобождается
+            after = free & ~bit
+            if cell != food:
+                after |= tail_bit
+            room = self._room(board, bit, after, tail_bit, length)
+            if room < length:
+                if room > fallback_room:
+                    fallback = direction
+                    fallback_room = room
+                continue
+            key = (field.distance(cell, free), direction is not current)
+            if best_key is None or key < best_key:
+                best = direction
+                best_key = key
+        if best_key is not None and best_key[0] >= UNREACHABLE:
+            if field.stale:
+                # Хвост открыл проход к еде: на следующем тике поле
+                # строится заново
+                self._field = None
+        return best if best is not None else fallback
+
+    # ------------------------------------------------------------------
+    # Внутренняя логика
+    # ------------------------------------------------------------------
+    def _sync(
+        self, state: SnakeGameState, config: SnakeGameConfig
+    ) -> BitBoard:
+        """Приводит маску занятых клеток в соответствие с состоянием."""
+
+        board = self._board
+        snake = state.snake
+        wrap = config.wrap_edges
+        if (
+            board is None
+            or board.cols != state.cols
+            or board.rows != state.rows
+            or board.wrap != wrap
+            or config.walls is not self._wall_cells
+        ):
+            board = self._board = BitBoard(state.cols, state.rows, wrap)
+            # Стены входят в маску занятых клеток и никогда из неё не
+            # уходят: хвост на стене не бывает
+            self._wall_cells = config.walls
+            self._walls = board.from_cells(
+                y * state.cols + x
+                for x, y in config.walls
+                if 0 <= x < state.cols and 0 <= y < state.rows
+            )
+            self._rebuild(state)
+            return board
+
+        steps = state.steps
+        if state is not self._state or snake is not self._snake:
+            self._rebuild(state)
+        elif steps == self._steps + 1 and self._advance(snake):
+            self._steps = steps
+        elif steps != self._steps or snake[0] != self._head:
+            self._rebuild(state)
+        return board
+
+    def _advance(self, snake: SnakeBody) -> bool:
+        """Учитывает один тик: новую голову и, если не росли, хвост."""
+
+        grown = len(snake) - self._length
+        if grown not in (0, 1) or len(snake) < 2 or snake[1] != self._head:
+            return False
+        board = self._board
+        assert board is not None
+        cols = board.cols
+        head_x, head_y = snake[0]
+        self._blocked |= 1 << (head_y * cols + head_x)
+        if not grown:
+            tail_x, tail_y = self._tail
+            tail = tail_y * cols + tail_x
+            self._blocked &= ~(1 << tail)
+            if self._field is not None:
+                self._field.relax(tail, board.full & ~self._blocked)
+        self._head = snake[0]
+        self._tail = snake[-1]
+        self._length = len(snake)
+        return True
+
+    def _rebuild(self, state: SnakeGameState) -> None:
+        board = self._board
+        assert board is not None
+        cols = state.cols
+        snake = state.snake
+        self._blocked = self._walls | board.from_cells(
+            y * cols + x for x, y in snake
+        )
+        self._field = None
+        self._state = state
+        self._snake = snake
+        self._steps = state.steps
+        self._head = snake[0]
+        self._tail = snake[-1]
+        self._length = len(snake)
+
+    @staticmethod
+    def _room(
+        board: BitBoard, start: int, free: int, tail: int, needed: int
+    ) -> int:
+        """Сколько клеток доступно из ``start`` (не больше нужного).
+
+        Если заливка дошла до хвоста, змейка может идти за ним бесконечно,
+        и места считается достаточно.
+        """
+
+        region = start
+        front = start
+        count = 0
+        while front:
+            front = board.spread(front) & free & ~region
+            region |= front
+            count += front.bit_count()
+            if count >= needed or front & tail:
+                return needed
+        return count
+
+
+__all__ = ["Autopilot", "DistanceField", "UNREACHABLE"]
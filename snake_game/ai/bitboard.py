@@ -0,0 +1,92 @@
+"""Поле как битовая маска: клетка ``y * cols + x`` — бит целого числа.
+
+Волна BFS или заливки продвигается на слой за несколько сдвигов и
+побитовых операций над всем полем сразу, а не по клетке за раз.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+class BitBoard:
+    """Геометрия поля для битовых масок: соседи, границы и перенос."""
+
+    __slots__ = (
+        "cols",
+        "rows",
+        "wrap",
+        "full",
+        "_first_col",
+        "_last_col",
+        "_not_first_col",
+        "_not_last_col",
+        "_first_row",
+        "_last_row_shift",
+    )
+
+    def __init__(self, cols: int, rows: int, wrap: bool) -> None:
+        self.cols = cols
+        self.rows = rows
+        self.wrap = wrap
+        size = cols * rows
+        self.full = (1 << size) - 1
+        # Столбец x = 0: по биту в начале каждой строки
+        first_col = int.from_bytes(
+            bytes_from_cells(range(0, size, cols), size), "little"
+        )
+        self._first_col = first_col
+        self._last_col = first_col << (cols - 1)
+        self._not_first_col = self.full & ~first_col
+        self._not_last_col = self.full & ~self._last_col
+        self._first_row = (1 << cols) - 1
+        self._last_row_shift = size - cols
+
+    def from_cells(self, cells: Iterable[int]) -> int:
+        """Маска из индексов клеток (без создания промежуточных чисел)."""
+
+        size = self.cols * self.rows
+        return int.from_bytes(bytes_from_cells(cells, size), "little")
+
+    def spread(self, bits: int) -> int:
+        """Все клетки, соседние с клетками маски (с учётом переноса)."""
+
+        cols = self.cols
+        # Сдвиг на бит переносит крайний столбец в соседнюю строку,
+        # такие биты отсекаем масками столбцов
+        east = (bits << 1) & self._not_first_col
+        west = (bits >> 1) & self._not_last_col
+        vertical = (bits << cols | bits >> cols) & self.full
+        if self.wrap:
+            east |= (bits & self._last_col) >> (cols - 1)
+            west |= (bits & self._first_col) << (cols - 1)
+            vertical |= bits >> self._last_row_shift
+            vertical |= (bits & self._first_row) << self._last_row_shift
+        return east | west | vertical
+
+    def neighbour(self, cell: int, dx: int, dy: int) -> int | None:
+        """Соседняя клетка в направлении (dx, dy) или None за границей."""
+
+        cols = self.cols
+        rows = self.rows
+        y, x = divmod(cell, cols)
+        x += dx
+        y += dy
+        if self.wrap:
+            x %= cols
+            y %= rows
+        elif not (0 <= x < cols and 0 <= y < rows):
+            return None
+        return y * cols + x
+
+
+def bytes_from_cells(cells: Iterable[int], size: int) -> bytearray:
+    """Упакованные little-endian байты маски для ``int.from_bytes``."""
+
+    packed = bytearray((size + 7) >> 3)
+    for cell in cells:
+        packed[cell >> 3] |= 1 << (cell & 7)
+    return packed
+
+
+__all__ = ["BitBoard", "bytes_from_cells"]
@@ -0,0 +1,424 @@
+"""Бот на гамильтоновом цикле: заполняет поле целиком и не погибает.
+
+Цикл обходит каждую клетку поля ровно один раз. Змейка, идущая по нему,
+никогда не врезается в себя, а срезки к еде разрешены, только пока
+впереди головы остаётся запас свободных клеток больше длины змейки.
+
+Таблицы цикла для каждого размера поля строятся один раз за процесс.
+Построение линейно по числу клеток; с ``cache_dir`` (или переменной
+окружения ``SNAKE_GAME_CACHE_DIR``) обе таблицы ещё и сохраняются на
+диск и читаются оттуда без циклов Python — быстрее построения.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from ..core import Direction, SnakeGameEngine, SnakeGameState
+from ..core.state import Point, SnakeBody
+from .autopilot import Autopilot
+
+if TYPE_CHECKING:
+    from ..services import SnakeSession
+
+MAGIC = b"SNH2"
+CACHE_ENV = "SNAKE_GAME_CACHE_DIR"
+
+DIRECTIONS: tuple[Direction, ...] = tuple(Direction)
+
+# Запас клеток сверх длины змейки, который должен остаться между головой
+# и хвостом после срезки: на случай еды, съеденной до закрытия дыр
+SHORTCUT_MARGIN = 3
+
+
+class HamiltonianCycle:
+    """Гамильтонов цикл поля без переноса через край.
+
+    ``order[cell]`` — позиция клетки в цикле, ``cells[position]`` —
+    обратная таблица. Клетка кодируется индексом ``y * cols + x``.
+    """
+
+    __slots__ = ("cols", "rows", "order", "cells", "_reverse")
+
+    # Таблицы, уже загруженные в этом процессе
+    _loaded: ClassVar[dict[tuple[int, int], HamiltonianCycle]] = {}
+
+    def __init__(
+        self,
+        cols: int,
+        rows: int,
+        cells: array[int],
+        order: array[int] | None = None,
+    ) -> None:
+        if len(cells) != cols * rows:
+            raise ValueError("Размер цикла не совпадает с полем")
+        self.cols = cols
+        self.rows = rows
+        self.cells = cells
+        if order is None:
+            order = array("i", bytes(4 * len(cells)))
+            for position, cell in enumerate(cells):
+                order[cell] = position
+        self.order = order
+        self._reverse: HamiltonianCycle | None = None
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    @staticmethod
+    def exists(cols: int, rows: int) -> bool:
+        """Есть ли цикл: обе стороны не меньше 2, хотя бы одна чётная."""
+
+        return cols >= 2 and rows >= 2 and not (cols % 2 and rows % 2)
+
+    @classmethod
+    def build(cls, cols: int, rows: int) -> HamiltonianCycle:
+        """Строит цикл «змеевиком» с возвратом по столбцу ``x = 0``.
+
+        Если цикла нет (см. :meth:`exists`), бросает ``ValueError``.
+        """
+
+        if cols < 2 or rows < 2:
+            raise ValueError("Гамильтонов цикл требует поле не уже 2 клеток")
+        if not cls.exists(cols, rows):
+            raise ValueError("На поле нечётного размера цикла нет")
+        if rows % 2:
+            # Строим цикл на транспонированном поле и переводим клетки
+            transposed = cls.build(rows, cols)
+            cells = array(
+                "i",
+                [
+                    (cell % rows) * cols + cell // rows
+                    for cell in transposed.cells
+                ],
+            )
+            return cls(cols, rows, cells)
+
+        path: list[int] = []
+        for y in range(rows):
+            xs = range(1, cols) if y % 2 == 0 else range(cols - 1, 0, -1)
+            path.extend(y * cols + x for x in xs)
+        # Последняя строка нечётная и заканчивается у x = 1: спускаемся
+        path.extend(y * cols for y in range(rows - 1, -1, -1))
+        return cls(cols, rows, array("i", path))
+
+    @classmethod
+    def for_board(
+        cls, cols: int, rows: int, cache_dir: Path | str | None = None
+    ) -> HamiltonianCycle:
+        """Цикл для поля из памяти, с диска или построенный заново.
+
+        Диск используется, только если задан ``cache_dir`` или
+        переменная окружения ``SNAKE_GAME_CACHE_DIR``.
+        """
+
+        key = (cols, rows)
+        cycle = cls._loaded.get(key)
+        if cycle is not None:
+            return cycle
+        path = _cache_path(cols, rows, cache_dir)
+        cycle = None if path is None else cls._read(path, cols, rows)
+        if cycle is None:
+            cycle = cls.build(cols, rows)
+            if path is not None:
+                cycle._write(path)
+        cls._loaded[key] = cycle
+        return cycle
+
+    def reversed(self) -> HamiltonianCycle:
+        """Тот же цикл, пройденный в обратную сторону."""
+
+        if self._reverse is None:
+            cells = array("i", self.cells)
+            cells.reverse()
+            self._reverse = HamiltonianCycle(self.cols, self.rows, cells)
+            self._reverse._reverse = self
+        return self._reverse
+
+    # ------------------------------------------------------------------
+    # Кэш на диске
+    # ------------------------------------------------------------------
+    @classmethod
+    def _read(
+        cls, path: Path, cols: int, rows: int
+    ) -> HamiltonianCycle | None:
+        # Формат: MAGIC, CRC32 остатка, таблицы cells и order (int32 LE)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        header = len(MAGIC) + 4
+        size = cols * rows * 4
+        if (
+            len(data) != header + 2 * size
+            or data[: len(MAGIC)] != MAGIC
+            or int.from_bytes(data[len(MAGIC) : header], "little")
+            != zlib.crc32(data[header:])
+        ):
+            # Обрезанный, испорченный или чужой файл — как промах кэша
+            return None
+        cells = array("i", data[header : header + size])
+        order = array("i", data[header + size :])
+        if sys.byteorder != "little":  # pragma: no cover - big-endian
+            cells.byteswap()
+            order.byteswap()
+        return cls(cols, rows, cells, order)
+
+    def _write(self, path: Path) -> None:
+        cells = array("i", self.cells)
+        order = array("i", self.order)
+        if sys.byteorder != "little":  # pragma: no cover - big-endian
+            cells.byteswap()
+            order.byteswap()
+        payload = cells.tobytes() + order.tobytes()
+        checksum = zlib.crc32(payload).to_bytes(4, "little")
+        temporary = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_bytes(MAGIC + checksum + payload)
+            # Атомарная замена: параллельные прогоны не увидят полфайла
+            os.replace(temporary, path)
+        except OSError:
+            # Кэш — лишь ускорение, без него цикл просто строится заново
+            return
+
+
+def _cache_path(
+    cols: int, rows: int, cache_dir: Path | str | None
+) -> Path | None:
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_ENV)
+        if not cache_dir:
+            return None
+    return Path(cache_dir) / "hamiltonian" / f"{cols}x{rows}.bin"
+
+
+class HamiltonianSolver:
+    """Политика, ведущая змейку по гамильтонову циклу со срезками.
+
+    Пока тело змейки лежит на цикле по порядку (от хвоста к голове),
+    следование циклу безопасно. Если это не так (стартовая змейка,
+    ``restore``, ручная правка состояния), бот идёт по циклу, когда
+    следующая клетка свободна, а иначе спрашивает :class:`Autopilot`;
+    через ``len(snake)`` тиков тело снова выстраивается по циклу.
+    """
+
+    __slots__ = (
+        "_cache_dir",
+        "shortcuts",
+        "_cycle",
+        "_fallback",
+        "_state",
+        "_snake",
+        "_steps",
+        "_expected",
+        "_ordered",
+        "_unordered_ticks",
+    )
+
+    def __init__(
+        self,
+        *,
+        shortcuts: bool = True,
+        cache_dir: Path | str | None = None,
+    ) -> None:
+        self.shortcuts = shortcuts
+        self._cache_dir = cache_dir
+        self._cycle: HamiltonianCycle | None = None
+        self._fallback = Autopilot()
+        self._state: SnakeGameState | None = None
+        self._snake: SnakeBody | None = None
+        self._steps = -1
+        self._expected: Point | None = None
+        self._ordered = False
+        self._unordered_ticks = 0
+
+    def __call__(self, engine: SnakeGameEngine) -> Direction | None:
+        return self.decide(engine)
+
+    def steer(self, session: SnakeSession) -> Direction | None:
+        """Выбирает направление и передаёт его в ``session.set_direction``."""
+
+        direction = self.decide(session.engine)
+        if direction is not None:
+            session.set_direction(direction)
+        return direction
+
+    def decide(self, engine: SnakeGameEngine) -> Direction | None:
+        state = engine.state
+        if state.game_over:
+            return None
+        if engine.config.walls or not HamiltonianCycle.exists(
+            state.cols, state.rows
+        ):
+            # Со стенами или на поле нечётного размера гамильтонова
+            # цикла по всему полю нет
+            return self._fallback.decide(engine)
+        cycle = self._sync(state)
+        head_x, head_y = state.snake[0]
+        head = cycle.order[head_y * state.cols + head_x]
+        direction = None
+        if self._ordered:
+            direction = self._step_ordered(state, cycle, head)
+        if direction is None:
+            direction = self._step_unordered(engine, cycle, head)
+        if direction is not None:
+            self._expected = self._target(state, direction)
+        self._steps = state.steps
+        return direction
+
+    # ------------------------------------------------------------------
+    # Внутренняя логика
+    # ------------------------------------------------------------------
+    def _step_ordered(
+        self, state: SnakeGameState, cycle: HamiltonianCycle, head: int
+    ) -> Direction | None:
+        snake = state.snake
+        cols = state.cols
+        size = len(cycle)
+        order = cycle.order
+        tail_x, tail_y = snake[-1]
+        food_x, food_y = state.food
+        # Расстояния вперёд по циклу от головы
+        to_tail = (order[tail_y * cols + tail_x] - head) % size
+        to_food = (order[food_y * cols + food_x] - head) % size
+        length = len(snake)
+        if to_tail == 1:
+            # Хвост сразу впереди: порядок нарушен, идём осторожно
+            self._ordered = False
+            return None
+
+        best = 1
+        if self.shortcuts and 2 * length < size:
+            # После срезки между головой и хвостом должно остаться не
+            # меньше length + SHORTCUT_MARGIN клеток
+            limit = to_tail - length - SHORTCUT_MARGIN - 1
+            if to_food < to_tail:
+                limit = min(limit, to_food)
+            best_direction: Direction | None = None
+            for direction in DIRECTIONS:
+                cell = self._neighbour(state, snake[0], direction)
+                if cell is None:
+                    continue
+                ahead = (order[cell] - head) % size
+                if best < ahead <= limit:
+                    best = ahead
+                    best_direction = direction
+            if best_direction is not None:
+                return best_direction
+        return self._direction_to(state, cycle.cells[(head + 1) % size])
+
+    def _step_unordered(
+        self, engine: SnakeGameEngine, cycle: HamiltonianCycle, head: int
+    ) -> Direction | None:
+        state = engine.state
+        cols = state.cols
+        target = cycle.cells[(head + 1) % len(cycle)]
+        point = (target % cols, target // cols)
+        direction = self._direction_to(state, target)
+        if (
+            direction is not None
+            and not engine.is_occupied(point)
+            and not (
+                len(state.snake) > 1 and direction.is_opposite(state.direction)
+            )
+        ):
+            self._unordered_ticks += 1
+            if self._unordered_ticks >= len(state.snake):
+                # Последние len(snake) ходов шли по циклу: тело на нём
+                self._ordered = self._check_order(state, cycle)
+                self._unordered_ticks = 0
+            return direction
+        self._unordered_ticks = 0
+        return self._fallback.decide(engine)
+
+    def _sync(self, state: SnakeGameState) -> HamiltonianCycle:
+        cycle = self._cycle
+        if (
+            cycle is None
+            or cycle.cols != state.cols
+            or cycle.rows != state.rows
+        ):
+            cycle = HamiltonianCycle.for_board(
+                state.cols, state.rows, self._cache_dir
+            )
+            return self._resync(state, cycle)
+        if (
+            state is not self._state
+            or state.snake is not self._snake
+            or state.steps != self._steps + 1
+            or state.snake[0] != self._expected
+        ):
+            return self._resync(state, cycle)
+        return cycle
+
+    def _resync(
+        self, state: SnakeGameState, cycle: HamiltonianCycle
+    ) -> HamiltonianCycle:
+        """Выбирает направление цикла, на котором тело лежит по порядку."""
+
+        self._state = state
+        self._snake = state.snake
+        self._unordered_ticks = 0
+        self._ordered = self._check_order(state, cycle)
+        if not self._ordered:
+            reverse = cycle.reversed()
+            if self._check_order(state, reverse):
+                cycle = reverse
+                self._ordered = True
+        self._cycle = cycle
+        return cycle
+
+    @staticmethod
+    def _check_order(state: SnakeGameState, cycle: HamiltonianCycle) -> bool:
+        """True, если от хвоста к голове позиции на цикле растут."""
+
+        cols = state.cols
+        order = cycle.order
+        size = len(cycle)
+        snake = state.snake
+        tail_x, tail_y = snake[-1]
+        tail = order[tail_y * cols + tail_x]
+        previous = 0
+        for x, y in reversed(snake[:-1]):
+            ahead = (order[y * cols + x] - tail) % size
+            if ahead <= previous:
+                return False
+            previous = ahead
+        # Между головой и хвостом нужна хотя бы одна свободная клетка
+        return previous < size - 1 or len(snake) == size
+
+    @staticmethod
+    def _neighbour(
+        state: SnakeGameState, point: Point, direction: Direction
+    ) -> int | None:
+        cols = state.cols
+        rows = state.rows
+        x = point[0] + direction.dx
+        y = point[1] + direction.dy
+        if not (0 <= x < cols and 0 <= y < rows):
+            # Срезки через край не нужны: клетки цикла соседствуют и так
+            return None
+        return y * cols + x
+
+    @staticmethod
+    def _direction_to(state: SnakeGameState, cell: int) -> Direction | None:
+        head_x, head_y = state.snake[0]
+        y, x = divmod(cell, state.cols)
+        for direction in DIRECTIONS:
+            if head_x + direction.dx == x and head_y + direction.dy == y:
+                return direction
+        return None
+
+    @staticmethod
+    def _target(state: SnakeGameState, direction: Direction) -> Point:
+        head_x, head_y = state.snake[0]
+        return (head_x + direction.dx, head_y + direction.dy)
+
+
+__all__ = ["CACHE_ENV", "HamiltonianCycle", "HamiltonianSolver"]
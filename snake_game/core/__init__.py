@@ -1,15 +1,38 @@
 """Игровое ядро: состояние, события и движок."""
 
+from . import game as _game
+from .arena import ArenaSnake, MultiSnakeEngine
 from .direction import Direction
-from .events import GameStepEvent, GameStepResult
+from .events import GameStepEvent, GameStepResult, RunSummary
+from .food import FOOD_TABLES, FoodTable, FoodType
 from .game import SnakeGameEngine
+from .snapshot import EngineSnapshot, SnapshotPool
 from .state import SnakeGameConfig, SnakeGameState
 
+try:
+    from .vector import VectorSnakeEngine
+except ImportError:  # pragma: no cover - NumPy не установлен
+    VectorSnakeEngine = None  # type: ignore[assignment,misc]
+
+# True, если ядро собрано mypyc (build_mypyc.py), иначе работает чистый
+# Python
+COMPILED = not (_game.__file__ or "").endswith(".py")
+
 __all__ = [
+    "COMPILED",
+    "ArenaSnake",
     "Direction",
+    "FOOD_TABLES",
+    "FoodTable",
+    "FoodType",
+    "EngineSnapshot",
     "GameStepEvent",
     "GameStepResult",
+    "MultiSnakeEngine",
+    "RunSummary",
     "SnakeGameConfig",
     "SnakeGameState",
+    "SnapshotPool",
     "SnakeGameEngine",
+    "VectorSnakeEngine",
 ]
@@ -0,0 +1,311 @@
+"""Арена: несколько змеек на одном поле с общей сеткой владения клетками."""
+
+from __future__ import annotations
+
+import random
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from .direction import Direction
+from .events import GameStepEvent
+from .grid import FreeCellSet, wall_bitmap
+from .state import Point, SnakeGameConfig
+
+# Значения сетки владения: 0 — пусто, FOOD — еда, WALL — стена,
+# id + 1 — тело змейки id
+EMPTY = 0
+FOOD = -1
+WALL = -2
+
+_MOVED = GameStepEvent.MOVED.mask
+_FOOD_EATEN = GameStepEvent.FOOD_EATEN.mask
+_GAME_OVER = GameStepEvent.GAME_OVER.mask
+
+# Сколько случайных клеток пробовать, подбирая место для новой змейки
+_SPAWN_ATTEMPTS = 64
+
+
+@dataclass(slots=True)
+class ArenaSnake:
+    """Змейка на арене. Голова — ``body[0]``."""
+
+    id: int
+    body: deque[Point]
+    direction: Direction
+    pending_direction: Direction
+    score: int = 0
+    alive: bool = True
+    # Кто погубил змейку: id владельца клетки (или свой), None — край
+    # поля или стена
+    killed_by: int | None = None
+
+    def head(self) -> Point:
+        return self.body[0]
+
+
+@dataclass(slots=True)
+class ArenaStepResult:
+    """События тика по змейкам (биты ``GameStepEvent.mask``).
+
+    Массив принадлежит движку и перезаписывается следующим шагом.
+    """
+
+    events: array[int] = field(default_factory=lambda: array("B"))
+    alive: int = 0
+
+
+class MultiSnakeEngine:
+    """Движок арены: все змейки делают ход одновременно за один тик.
+
+    Конфликты разрешаются детерминированно по состоянию до хода:
+
+    * голова в стене или в любом теле (включая хвосты, которые ещё не
+      сдвинулись, и свою шею) — змейка погибает;
+    * несколько голов в одной клетке — выживает единственная самая
+      длинная, при равной длине погибают все; еду в этой клетке съедает
+      победитель;
+    * погибшие змейки убираются с поля целиком.
+
+    Столкновения проверяются по общей сетке владения, поэтому тик стоит
+    O(число змеек); тело погибшей змейки очищается один раз, то есть
+    O(1) на сегмент в пересчёте на всю игру.
+    """
+
+    def __init__(
+        self, config: SnakeGameConfig, *, food_count: int = 1
+    ) -> None:
+        if config.cols <= 0 or config.rows <= 0:
+            raise ValueError("Размер игрового поля должен быть положительным")
+        if food_count <= 0:
+            raise ValueError("На арене должна быть хотя бы одна еда")
+        self.config = config
+        self.food_count = food_count
+        self._rng = random.Random(config.rng_seed)  # noqa: B311,S311  # nosec
+        self.snakes: list[ArenaSnake] = []
+        self.food: set[Point] = set()
+        self.steps = 0
+        walls = wall_bitmap(config.cols, config.rows, config.walls)
+        self._owners = array("i", [WALL if wall else EMPTY for wall in walls])
+        self._free = FreeCellSet.from_board(config.cols, config.rows, walls)
+        self._result = ArenaStepResult()
+        self._fill_food()
+
+    # ------------------------------------------------------------------
+    # Свойства
+    # ------------------------------------------------------------------
+    @property
+    def alive(self) -> int:
+        """Сколько змеек ещё в игре."""
+
+        return sum(snake.alive for snake in self.snakes)
+
+    def owner(self, cell: Point) -> int:
+        """Содержимое клетки: EMPTY, FOOD, WALL или ``id + 1`` змейки."""
+
+        x, y = cell
+        return self._owners[y * self.config.cols + x]
+
+    # ------------------------------------------------------------------
+    # Управление
+    # ------------------------------------------------------------------
+    def add_snake(
+        self,
+        body: Iterable[Point] | None = None,
+        direction: Direction = Direction.RIGHT,
+    ) -> ArenaSnake:
+        """Добавляет змейку с заданным телом или в случайном свободном месте.
+
+        Без ``body`` змейка длины 3 ставится горизонтально головой вправо.
+        """
+
+        if body is None:
+            segments = self._find_spawn()
+            direction = Direction.RIGHT
+        else:
+            segments = list(body)
+        cols = self.config.cols
+        rows = self.config.rows
+        if not segments:
+            raise ValueError("Тело змейки не может быть пустым")
+        cells: dict[int, None] = {}
+        for x, y in segments:
+            if not (0 <= x < cols and 0 <= y < rows):
+                raise ValueError(f"Сегмент {(x, y)} вне поля")
+            cell = y * cols + x
+            if self._owners[cell] not in (EMPTY, FOOD) or cell in cells:
+                raise ValueError(f"Клетка {(x, y)} уже занята")
+            cells[cell] = None
+
+        snake = ArenaSnake(
+            id=len(self.snakes),
+            body=deque(segments),
+            direction=direction,
+            pending_direction=direction,
+        )
+        self.snakes.append(snake)
+        self._result.events.append(0)
+        owners = self._owners
+        for cell in cells:
+            if owners[cell] == FOOD:
+                # Змейку поставили на еду: еду переносим
+                self.food.discard((cell % cols, cell // cols))
+            owners[cell] = snake.id + 1
+            self._free.discard(cell)
+        self._fill_food()
+        return snake
+
+    def set_direction(self, snake_id: int, direction: Direction) -> None:
+        """Меняет направление змейки по правилам ``SnakeGameEngine``."""
+
+        snake = self.snakes[snake_id]
+        if direction.is_opposite(snake.direction) and len(snake.body) > 1:
+            return
+        snake.pending_direction = direction
+
+    def step(self) -> ArenaStepResult:
+        """Делает один одновременный ход всех живых змеек."""
+
+        config = self.config
+        cols = config.cols
+        rows = config.rows
+        wrap = config.wrap_edges
+        owners = self._owners
+        result = self._result
+        events = result.events
+        for index in range(len(events)):
+            events[index] = 0
+
+        # 1. Цели ходов и столкновения со стенами и телами (до хода)
+        targets: dict[int, list[ArenaSnake]] = {}
+        dead: list[ArenaSnake] = []
+        for snake in self.snakes:
+            if not snake.alive:
+                continue
+            direction = snake.pending_direction
+            snake.direction = direction
+            dx, dy = direction.value
+            head_x, head_y = snake.body[0]
+            x = head_x + dx
+            y = head_y + dy
+            events[snake.id] = _MOVED
+            if wrap:
+                x %= cols
+                y %= rows
+            elif not (0 <= x < cols and 0 <= y < rows):
+                snake.killed_by = None
+                dead.append(snake)
+                continue
+            cell = y * cols + x
+            owner = owners[cell]
+            if owner > EMPTY or owner == WALL:
+                snake.killed_by = owner - 1 if owner > EMPTY else None
+                dead.append(snake)
+                continue
+            contenders = targets.get(cell)
+            if contenders is None:
+                targets[cell] = [snake]
+            else:
+                contenders.append(snake)
+
+        # 2. Лобовые столкновения: клетку получает самая длинная змейка
+        movers: list[tuple[ArenaSnake, int]] = []
+        for cell, contenders in targets.items():
+            if len(contenders) == 1:
+                movers.append((contenders[0], cell))
+                continue
+            longest = max(len(snake.body) for snake in contenders)
+            winners = [s for s in contenders if len(s.body) == longest]
+            winner = winners[0] if len(winners) == 1 else None
+            for snake in contenders:
+                if snake is winner:
+                    movers.append((snake, cell))
+                    continue
+                others = [s.id for s in contenders if s is not snake]
+                snake.killed_by = (
+                    winner.id if winner is not None else others[0]
+                )
+                dead.append(snake)
+
+        # 3. Погибшие освобождают клетки
+        for snake in dead:
+            snake.alive = False
+            events[snake.id] |= _GAME_OVER
+            self._clear_body(snake)
+
+        # 4. Ход выживших: хвосты, затем головы
+        eaten = 0
+        for snake, cell in movers:
+            if owners[cell] == FOOD:
+                continue
+            tail_x, tail_y = snake.body.pop()
+            tail_cell = tail_y * cols + tail_x
+            owners[tail_cell] = EMPTY
+            self._free.add(tail_cell)
+        for snake, cell in movers:
+            if owners[cell] == FOOD:
+                snake.score += 1
+                events[snake.id] |= _FOOD_EATEN
+                self.food.discard((cell % cols, cell // cols))
+                eaten += 1
+            owners[cell] = snake.id + 1
+            self._free.discard(cell)
+            snake.body.appendleft((cell % cols, cell // cols))
+
+        if eaten or dead:
+            self._fill_food()
+        self.steps += 1
+        result.alive = sum(snake.alive for snake in self.snakes)
+        return result
+
+    # ------------------------------------------------------------------
+    # Внутренняя логика
+    # ------------------------------------------------------------------
+    def _clear_body(self, snake: ArenaSnake) -> None:
+        cols = self.config.cols
+        owners = self._owners
+        free = self._free
+        for x, y in snake.body:
+            cell = y * cols + x
+            owners[cell] = EMPTY
+            free.add(cell)
+
+    def _fill_food(self) -> None:
+        """Доставляет еду до ``food_count``, пока есть свободные клетки."""
+
+        cols = self.config.cols
+        owners = self._owners
+        free = self._free
+        while len(self.food) < self.food_count:
+            cell = free.choice(self._rng)
+            if cell is None:
+                return
+            free.discard(cell)
+            owners[cell] = FOOD
+            self.food.add((cell % cols, cell // cols))
+
+    def _find_spawn(self) -> list[Point]:
+        cols = self.config.cols
+        owners = self._owners
+        rng = self._rng
+        for _ in range(_SPAWN_ATTEMPTS):
+            cell = self._free.choice(rng)
+            if cell is None:
+                break
+            y, x = divmod(cell, cols)
+            if x < 2:
+                continue
+            if owners[cell - 1] == EMPTY and owners[cell - 2] == EMPTY:
+                return [(x, y), (x - 1, y), (x - 2, y)]
+        raise RuntimeError("Не удалось найти место для новой змейки")
+
+
+__all__ = [
+    "ArenaSnake",
+    "ArenaStepResult",
+    "EMPTY",
+    "FOOD",
+    "MultiSnakeEngine",
+    "WALL",
+]
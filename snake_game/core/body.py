@@ -0,0 +1,243 @@
+"""Компактное тело змейки: кольцевой буфер упакованных индексов клеток."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, MutableSequence, Sequence
+from typing import Any, overload
+
+from .native import mypyc_attr
+
+# Минимальный прирост ёмкости при расширении буфера
+_GROWTH = 16
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class RingBody(MutableSequence[tuple[int, int]]):
+    """Тело змейки как последовательность точек ``(x, y)``, голова первой.
+
+    Сегменты хранятся индексами клеток ``y * cols + x`` в заранее
+    выделенном ``array('I')``: четыре байта на сегмент вместо кортежа
+    и указателя в списке. Добавление головы (``insert(0, point)``) и
+    снятие хвоста (``pop()``) — O(1), поэтому движок работает с этим
+    типом так же, как со списком. Точки создаются только при чтении.
+    Заполненный буфер растёт на восьмую часть, как список, так что
+    ``capacity`` — лишь начальная ёмкость. Прочие вставки и удаления
+    пересобирают буфер за O(n).
+    """
+
+    __slots__ = ("cols", "_cells", "_head", "_length")
+
+    def __init__(
+        self,
+        cols: int,
+        capacity: int,
+        points: Iterable[tuple[int, int]] = (),
+    ) -> None:
+        if cols <= 0 or capacity <= 0:
+            raise ValueError("Размер буфера тела должен быть положительным")
+        self.cols = cols
+        self._cells = array("I", bytes(4 * capacity))
+        # Позиция головы в буфере; сегмент i лежит в (_head + i) % capacity
+        self._head = 0
+        self._length = 0
+        for point in points:
+            self.append(point)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._cells)
+
+    # ------------------------------------------------------------------
+    # Операции движка
+    # ------------------------------------------------------------------
+    def push_head(self, point: tuple[int, int]) -> None:
+        length = self._length
+        cells = self._cells
+        if length == len(cells):
+            cells = self._grow()
+        x, y = point
+        head = self._head - 1
+        if head < 0:
+            head += len(cells)
+        cells[head] = y * self.cols + x
+        self._head = head
+        self._length = length + 1
+
+    def pop_tail(self) -> tuple[int, int]:
+        length = self._length
+        if not length:
+            raise IndexError("pop from empty RingBody")
+        cells = self._cells
+        length -= 1
+        position = self._head + length
+        if position >= len(cells):
+            position -= len(cells)
+        self._length = length
+        y, x = divmod(cells[position], self.cols)
+        return (x, y)
+
+    def append(self, value: tuple[int, int]) -> None:
+        length = self._length
+        cells = self._cells
+        if length == len(cells):
+            cells = self._grow()
+        x, y = value
+        cells[(self._head + length) % len(cells)] = y * self.cols + x
+        self._length = length + 1
+
+    def insert(self, index: int, value: tuple[int, int]) -> None:
+        if index == 0:
+            self.push_head(value)
+        elif index >= self._length:
+            self.append(value)
+        else:
+            points = list(self)
+            points.insert(index, value)
+            self._reset(points)
+
+    def pop(self, index: int = -1) -> tuple[int, int]:
+        if index == -1 or index == self._length - 1:
+            return self.pop_tail()
+        points = list(self)
+        value = points.pop(index)
+        self._reset(points)
+        return value
+
+    def cells(self) -> Iterator[int]:
+        """Упакованные индексы клеток от головы к хвосту."""
+
+        cells = self._cells
+        capacity = len(cells)
+        head = self._head
+        for offset in range(self._length):
+            position = head + offset
+            if position >= capacity:
+                position -= capacity
+            yield cells[position]
+
+    def load_cells(self, cells: Sequence[int], cols: int) -> None:
+        """Заменяет тело упакованными индексами, сохраняя сам объект.
+
+        Буфер выделяется заново, только если тело в него не помещается.
+        """
+
+        length = len(cells)
+        if length > len(self._cells):
+            self._cells = array("I", bytes(4 * length))
+        self._cells[:length] = array("I", cells)
+        self.cols = cols
+        self._head = 0
+        self._length = length
+
+    def copy(self) -> RingBody:
+        clone = RingBody.__new__(RingBody)
+        clone.cols = self.cols
+        clone._cells = array("I", self._cells)
+        clone._head = self._head
+        clone._length = self._length
+        return clone
+
+    # ------------------------------------------------------------------
+    # Протокол последовательности
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        cols = self.cols
+        for cell in self.cells():
+            y, x = divmod(cell, cols)
+            yield (x, y)
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[int, int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[int, int]]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> tuple[int, int] | list[tuple[int, int]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        y, x = divmod(self._cells[self._position(index)], self.cols)
+        return (x, y)
+
+    @overload
+    def __setitem__(self, index: int, value: tuple[int, int]) -> None: ...
+
+    @overload
+    def __setitem__(
+        self, index: slice, value: Iterable[tuple[int, int]]
+    ) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        if isinstance(index, slice):
+            points = list(self)
+            points[index] = value
+            self._reset(points)
+            return
+        x, y = value
+        self._cells[self._position(index)] = y * self.cols + x
+
+    def __delitem__(self, index: int | slice) -> None:
+        if index == -1 or index == self._length - 1:
+            self.pop_tail()
+            return
+        if (
+            isinstance(index, slice)
+            and not index.start
+            and index.step in (None, 1)
+        ):
+            # Срез с головы (откат журнала) — сдвиг начала кольца, O(1)
+            count = len(range(*index.indices(self._length)))
+            self._head = (self._head + count) % len(self._cells)
+            self._length -= count
+            return
+        points = list(self)
+        del points[index]
+        self._reset(points)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RingBody | list | tuple):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"RingBody({list(self)!r})"
+
+    # ------------------------------------------------------------------
+    # Внутренняя логика
+    # ------------------------------------------------------------------
+    def _position(self, index: int) -> int:
+        length = self._length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("RingBody index out of range")
+        position = self._head + index
+        capacity = len(self._cells)
+        return position - capacity if position >= capacity else position
+
+    def _grow(self) -> array[int]:
+        """Расширяет буфер, раскладывая тело с начала."""
+
+        cells = self._cells
+        head = self._head
+        grown = cells[head:] + cells[:head]
+        grown.frombytes(bytes(4 * (len(cells) // 8 + _GROWTH)))
+        self._cells = grown
+        self._head = 0
+        return grown
+
+    def _reset(self, points: list[tuple[int, int]]) -> None:
+        self._head = 0
+        self._length = 0
+        for point in points:
+            self.append(point)
+
+
+__all__ = ["RingBody"]
@@ -0,0 +1,185 @@
+"""Эффекты с длительностью в тиках на хешированном колесе таймеров.
+
+Время эффектов — это тики движка, а не часы: колесо сдвигается только
+шагом игры, поэтому на паузе эффекты замирают, а повтор игры с тем же
+вводом истекает их на тех же тиках.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Generic, TypeVar
+
+from .native import mypyc_attr
+
+T = TypeVar("T")
+
+_NOTHING: tuple[()] = ()
+
+
+class Effect(Enum):
+    """Эффекты змейки; значения совпадают с ``FoodTypeSpec.effect``."""
+
+    SPEED_BOOST = "speed"
+    SHIELD = "shield"
+    # Особая еда превращается в обычную
+    FOOD_EXPIRY = "food"
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class TimerWheel(Generic[T]):
+    """Хешированное колесо таймеров с шагом в один тик.
+
+    Таймер лежит в ячейке ``срок % size``; сдвиг колеса просматривает
+    одну ячейку и срабатывает таймеры, чей срок наступил (таймеры на
+    дальних оборотах остаются в ячейке). Постановка и отмена — O(1),
+    сдвиг — O(1) в среднем при числе таймеров меньше ``size``. Таймеры
+    одного тика срабатывают в порядке постановки.
+    """
+
+    __slots__ = ("now", "_slots", "_mask", "_timers", "_next_id")
+
+    def __init__(self, size: int = 64) -> None:
+        if size <= 0 or size & (size - 1):
+            raise ValueError("Размер колеса — степень двойки")
+        self.now = 0
+        self._slots: list[list[int]] = [[] for _ in range(size)]
+        self._mask = size - 1
+        # id таймера → (срок, значение); отменённые удаляются отсюда, а
+        # из ячеек — при следующем просмотре
+        self._timers: dict[int, tuple[int, T]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def schedule(self, delay: int, value: T) -> int:
+        """Ставит таймер через ``delay`` сдвигов (не меньше одного)."""
+
+        if delay < 1:
+            raise ValueError("Таймер срабатывает не раньше следующего тика")
+        timer_id = self._next_id
+        self._next_id += 1
+        due = self.now + delay
+        self._timers[timer_id] = (due, value)
+        self._slots[due & self._mask].append(timer_id)
+        return timer_id
+
+    def cancel(self, timer_id: int) -> bool:
+        return self._timers.pop(timer_id, None) is not None
+
+    def remaining(self, timer_id: int) -> int:
+        """Сколько сдвигов осталось до срабатывания (0 — таймера нет)."""
+
+        timer = self._timers.get(timer_id)
+        return timer[0] - self.now if timer is not None else 0
+
+    def advance(self) -> tuple[T, ...]:
+        """Сдвигает колесо на тик и возвращает значения сработавших.
+
+        Если ничего не сработало, возвращается общий пустой кортеж.
+        """
+
+        self.now = now = self.now + 1
+        slot = self._slots[now & self._mask]
+        if not slot:
+            return _NOTHING
+        timers = self._timers
+        fired: list[T] = []
+        waiting: list[int] = []
+        for timer_id in slot:
+            timer = timers.get(timer_id)
+            if timer is None:
+                continue
+            if timer[0] == now:
+                del timers[timer_id]
+                fired.append(timer[1])
+            else:
+                waiting.append(timer_id)
+        slot[:] = waiting
+        return tuple(fired)
+
+    def clear(self) -> None:
+        for slot in self._slots:
+            slot.clear()
+        self._timers.clear()
+
+    def copy(self) -> TimerWheel[T]:
+        clone: TimerWheel[T] = TimerWheel.__new__(TimerWheel)
+        clone.now = self.now
+        clone._slots = [list(slot) for slot in self._slots]
+        clone._mask = self._mask
+        clone._timers = dict(self._timers)
+        clone._next_id = self._next_id
+        return clone
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class EffectScheduler:
+    """Активные эффекты: не больше одного таймера на эффект.
+
+    ``active`` — словарь эффект → id таймера; его истинность — дешёвая
+    проверка «есть ли активные эффекты» для горячих циклов.
+    """
+
+    __slots__ = ("active", "_wheel")
+
+    def __init__(self, wheel_size: int = 64) -> None:
+        self.active: dict[Effect, int] = {}
+        self._wheel: TimerWheel[Effect] = TimerWheel(wheel_size)
+
+    def __bool__(self) -> bool:
+        return bool(self.active)
+
+    def __contains__(self, effect: Effect) -> bool:
+        return effect in self.active
+
+    def start(self, effect: Effect, ticks: int) -> bool:
+        """Включает эффект на ``ticks`` следующих тиков.
+
+        Повторный запуск продлевает эффект с текущего тика. Возвращает
+        True, если эффект до этого не был активен.
+        """
+
+        timer_id = self.active.get(effect)
+        if timer_id is not None:
+            self._wheel.cancel(timer_id)
+        # Тик запуска уже идёт: эффект снимается на ticks + 1-м сдвиге
+        self.active[effect] = self._wheel.schedule(ticks + 1, effect)
+        return timer_id is None
+
+    def cancel(self, effect: Effect) -> bool:
+        timer_id = self.active.pop(effect, None)
+        if timer_id is None:
+            return False
+        self._wheel.cancel(timer_id)
+        return True
+
+    def remaining(self, effect: Effect) -> int:
+        """Сколько тиков эффект ещё действует (0 — не активен)."""
+
+        timer_id = self.active.get(effect)
+        if timer_id is None:
+            return 0
+        return self._wheel.remaining(timer_id) - 1
+
+    def advance(self) -> tuple[Effect, ...]:
+        """Сдвигает время на тик и возвращает истёкшие эффекты."""
+
+        expired = self._wheel.advance()
+        for effect in expired:
+            del self.active[effect]
+        return expired
+
+    def clear(self) -> None:
+        self.active.clear()
+        self._wheel.clear()
+
+    def copy(self) -> EffectScheduler:
+        clone = EffectScheduler.__new__(EffectScheduler)
+        clone.active = dict(self.active)
+        clone._wheel = self._wheel.copy()
+        return clone
+
+
+__all__ = ["Effect", "EffectScheduler", "TimerWheel"]
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
-from enum import Enum, auto
+from enum import IntFlag, auto
+from typing import NamedTuple
 
+from .state import Point, SnakeGameState
 
-class GameStepEvent(Enum):
-    """События, которые может породить одно обновление игры."""
+
+class GameStepEvent(IntFlag):
+    """События, которые может породить одно обновление игры.
+
+    Это битовая маска: результат шага хранит все события одним значением,
+    а проверка ``GameStepEvent.FOOD_EATEN in result.events`` — битовая.
+    """
 
     MOVED = auto()
     FOOD_EATEN = auto()
@@ -15,10 +23,119 @@ class GameStepEvent(Enum):
     GAME_OVER = auto()
     RESIZED = auto()
 
+    @property
+    def mask(self) -> int:
+        """Бит события для компактных кодов (пакетный движок, журналы)."""
+
+        return int(self.value)
+
+
+NO_EVENTS = GameStepEvent(0)
+
+
+class GameStepResult(NamedTuple):
+    """Результат выполнения одного шага игрового движка.
+
+    Помимо событий результат несёт разницу поля за тик фиксированными
+    полями: новую голову, освободившийся хвост (если змейка не выросла),
+    прежнее и новое положение еды (если её съели). Неизменившиеся поля
+    равны None, поэтому фронтенд может перерисовать только эти клетки.
 
-@dataclass(frozen=True, slots=True)
-class GameStepResult:
-    """Результат выполнения одного шага игрового движка."""
+    Результаты без изменений клеток (пауза, столкновение) берутся готовыми
+    через :meth:`cached`. Это кортеж, а не dataclass: тики с движением
+    создают результат через ``tuple.__new__`` без медленного ``__init__``
+    неизменяемого dataclass.
+    """
 
-    events: frozenset[GameStepEvent] = field(default_factory=frozenset)
+    events: GameStepEvent = NO_EVENTS
     needs_redraw: bool = True
+    head: Point | None = None
+    tail: Point | None = None
+    old_food: Point | None = None
+    new_food: Point | None = None
+
+    @staticmethod
+    def cached(events: int, needs_redraw: bool = True) -> GameStepResult:
+        """Возвращает общий экземпляр с пустой разницей для этих событий."""
+
+        return _RESULTS[events << 1 | needs_redraw]
+
+    @property
+    def changed_cells(self) -> tuple[Point, ...]:
+        """Клетки, которые нужно перерисовать после этого шага."""
+
+        return tuple(
+            cell
+            for cell in (self.head, self.tail, self.old_food, self.new_food)
+            if cell is not None
+        )
+
+
+# Все комбинации событий: индекс — (маска << 1) | needs_redraw
+_RESULTS: tuple[GameStepResult, ...] = tuple(
+    GameStepResult(GameStepEvent(index >> 1), bool(index & 1))
+    for index in range(2 << len(GameStepEvent))
+)
+
+
+@dataclass(slots=True)
+class RunSummary:
+    """Сводка пакетного прогона ``SnakeGameEngine.run``."""
+
+    state: SnakeGameState
+    events: array[int]  # коды событий по тикам, биты GameStepEvent.mask
+    ticks: int
+    game_over_tick: int | None = None
+
+
+# Задержки от этого числа тиков и больше попадают в последнюю корзину
+INPUT_LATENCY_BUCKETS = 16
+
+
+@dataclass(slots=True)
+class InputStats:
+    """Задержка ввода: через сколько тиков нажатие стало поворотом.
+
+    ``latency[k]`` — сколько поворотов применено на ``k``-м тике после
+    нажатия (0 — на ближайшем же тике), последняя корзина — задержки
+    ``INPUT_LATENCY_BUCKETS - 1`` и больше. ``replaced`` — нажатия,
+    вытеснившие последний поворот из заполненной очереди.
+    """
+
+    applied: int = 0
+    replaced: int = 0
+    latency: list[int] = field(
+        default_factory=lambda: [0] * INPUT_LATENCY_BUCKETS
+    )
+
+    def record(self, ticks: int) -> None:
+        self.applied += 1
+        self.latency[max(0, min(ticks, len(self.latency) - 1))] += 1
+
+    @property
+    def mean(self) -> float:
+        """Средняя задержка в тиках (хвост считается по нижней границе)."""
+
+        if not self.applied:
+            return 0.0
+        return sum(t * count for t, count in enumerate(self.latency)) / (
+            self.applied
+        )
+
+    def percentile(self, percent: float) -> int:
+        """Задержка в тиках, которую не превышают ``percent`` поворотов."""
+
+        if not self.applied:
+            return 0
+        rank = max(1, -(-self.applied * percent // 100))
+        seen = 0
+        for ticks, count in enumerate(self.latency):
+            seen += count
+            if seen >= rank:
+                return ticks
+        return len(self.latency) - 1
+
+    def reset(self) -> None:
+        self.applied = 0
+        self.replaced = 0
+        self.latency = [0] * len(self.latency)
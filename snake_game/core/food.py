@@ -0,0 +1,236 @@
+"""Типы еды и предрасчитанные таблицы их вероятностей.
+
+Вероятность особой еды растёт линейно с уровнем и счётом до своего
+потолка ``cap``, а сумма вероятностей ограничена ``max_total`` (при
+превышении все доли пропорционально уменьшаются). Поскольку рост
+упирается в потолки, начиная с некоторых уровня и счёта распределение
+больше не меняется. :class:`FoodTable` заранее строит кумулятивные
+таблицы для всех различимых пар (уровень, счёт), и выбор типа еды
+стоит одну выборку генератора и ``bisect``.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+
+class FoodType(Enum):
+    """Тип еды на поле."""
+
+    NORMAL = "normal"
+    BONUS = "bonus"
+    SPEED = "speed"
+    SHIELD = "shield"
+
+
+@dataclass(frozen=True, slots=True)
+class FoodTypeSpec:
+    """Что даёт еда: очки и эффект (None — без эффекта)."""
+
+    score: int
+    effect: str | None = None
+
+
+FOOD_TYPE_CONFIG: dict[FoodType, FoodTypeSpec] = {
+    FoodType.NORMAL: FoodTypeSpec(score=1),
+    FoodType.BONUS: FoodTypeSpec(score=5),
+    FoodType.SPEED: FoodTypeSpec(score=1, effect="speed"),
+    FoodType.SHIELD: FoodTypeSpec(score=1, effect="shield"),
+}
+
+# Порядок столбцов кумулятивной таблицы; обычная еда — всё остальное.
+# FoodTable.sample возвращает индексы в этом кортеже.
+FOOD_TYPES: tuple[FoodType, ...] = (
+    FoodType.BONUS,
+    FoodType.SHIELD,
+    FoodType.SPEED,
+    FoodType.NORMAL,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FoodChance:
+    """Вероятность ``base + level·уровень + score·счёт``, не выше ``cap``."""
+
+    base: float
+    level: float = 0.0
+    score: float = 0.0
+    cap: float = 1.0
+
+    def at(self, level: int, score: int) -> float:
+        return min(
+            self.cap, self.base + level * self.level + score * self.score
+        )
+
+    def saturation(self, coefficient: float) -> int:
+        """Сколько шагов по ``coefficient`` от ``base`` до потолка."""
+
+        if coefficient <= 0 or self.base >= self.cap:
+            return 0
+        steps = max(0, math.ceil((self.cap - self.base) / coefficient))
+        # Поправка на округление: ровно то же выражение, что и в at()
+        while self.base + steps * coefficient < self.cap:
+            steps += 1
+        return steps
+
+
+@dataclass(slots=True)
+class ModeFoodConfig:
+    """Вероятности особой еды в режиме игры."""
+
+    bonus: FoodChance
+    shield: FoodChance
+    speed: FoodChance
+    max_total: float = 1.0
+
+    def chances(self) -> tuple[FoodChance, ...]:
+        """Вероятности в порядке ``FOOD_TYPES`` (без обычной еды)."""
+
+        return (self.bonus, self.shield, self.speed)
+
+
+MODE_FOOD_CONFIG: dict[str, ModeFoodConfig] = {
+    "mvp": ModeFoodConfig(
+        bonus=FoodChance(0.03, 0.01, 0.005, 0.18),
+        shield=FoodChance(0.02, 0.008, 0.004, 0.16),
+        speed=FoodChance(0.03, 0.012, 0.006, 0.2),
+        max_total=0.55,
+    ),
+    "map": ModeFoodConfig(
+        bonus=FoodChance(0.07, 0.02, 0.01, 0.35),
+        shield=FoodChance(0.06, 0.018, 0.009, 0.32),
+        speed=FoodChance(0.05, 0.02, 0.01, 0.3),
+        max_total=0.75,
+    ),
+    "survival": ModeFoodConfig(
+        bonus=FoodChance(0.04, 0.012, 0.007, 0.25),
+        shield=FoodChance(0.07, 0.015, 0.01, 0.35),
+        speed=FoodChance(0.06, 0.02, 0.012, 0.32),
+        max_total=0.65,
+    ),
+}
+
+
+class FoodTable:
+    """Кумулятивные распределения типа еды по уровню и счёту.
+
+    Уровень и счёт зажимаются в ``max_level`` и ``max_score``: дальше
+    все вероятности уже на потолке, и таблица точная для любых значений.
+    """
+
+    __slots__ = ("config", "max_level", "max_score", "_cdfs", "_array")
+
+    def __init__(self, config: ModeFoodConfig) -> None:
+        chances = config.chances()
+        for chance in chances:
+            if chance.level < 0 or chance.score < 0:
+                raise ValueError("Вероятность еды не должна убывать")
+        self.config = config
+        self.max_level = max(c.saturation(c.level) for c in chances)
+        # Худший случай — нулевой уровень: на старших уровнях потолок
+        # достигается при меньшем счёте
+        self.max_score = max(c.saturation(c.score) for c in chances)
+        self._cdfs: list[tuple[float, ...]] = [
+            self._cdf(chances, config.max_total, level, score)
+            for level in range(self.max_level + 1)
+            for score in range(self.max_score + 1)
+        ]
+        self._array: np.ndarray | None = None
+
+    @staticmethod
+    def _cdf(
+        chances: tuple[FoodChance, ...],
+        max_total: float,
+        level: int,
+        score: int,
+    ) -> tuple[float, ...]:
+        probabilities = [chance.at(level, score) for chance in chances]
+        total = sum(probabilities)
+        if total > max_total:
+            probabilities = [p * max_total / total for p in probabilities]
+        cdf = []
+        running = 0.0
+        for probability in probabilities:
+            running += probability
+            cdf.append(running)
+        return tuple(cdf)
+
+    def cdf(self, level: int, score: int) -> tuple[float, ...]:
+        """Границы интервалов для типов ``FOOD_TYPES`` (без последнего)."""
+
+        level = min(max(level, 0), self.max_level)
+        score = min(max(score, 0), self.max_score)
+        return self._cdfs[level * (self.max_score + 1) + score]
+
+    def probabilities(self, level: int, score: int) -> dict[FoodType, float]:
+        cdf = self.cdf(level, score)
+        result: dict[FoodType, float] = {}
+        previous = 0.0
+        for food_type, bound in zip(FOOD_TYPES, (*cdf, 1.0), strict=True):
+            result[food_type] = bound - previous
+            previous = bound
+        return result
+
+    def choose(self, rng: random.Random, level: int, score: int) -> FoodType:
+        """Тип еды для одного появления: одна выборка и ``bisect``."""
+
+        return FOOD_TYPES[bisect_right(self.cdf(level, score), rng.random())]
+
+    def sample(
+        self,
+        rng: np.random.Generator,
+        levels: npt.ArrayLike,
+        scores: npt.ArrayLike,
+    ) -> npt.NDArray[np.intp]:
+        """Векторная выборка для пакетных симуляторов.
+
+        Возвращает индексы в ``FOOD_TYPES`` той же формы, что и
+        ``levels``/``scores`` после broadcast.
+        """
+
+        import numpy as np
+
+        table = self._array
+        if table is None:
+            table = self._array = np.array(self._cdfs).reshape(
+                self.max_level + 1, self.max_score + 1, len(FOOD_TYPES) - 1
+            )
+        level_index = np.clip(np.asarray(levels), 0, self.max_level)
+        score_index = np.clip(np.asarray(scores), 0, self.max_score)
+        cdf = table[level_index, score_index]
+        draws = rng.random(cdf.shape[:-1])
+        # Как bisect_right: число границ, не превышающих выборку
+        return np.count_nonzero(draws[..., None] >= cdf, axis=-1)
+
+
+def build_food_tables(
+    configs: Mapping[str, ModeFoodConfig],
+) -> dict[str, FoodTable]:
+    return {mode: FoodTable(config) for mode, config in configs.items()}
+
+
+FOOD_TABLES: dict[str, FoodTable] = build_food_tables(MODE_FOOD_CONFIG)
+
+
+__all__ = [
+    "FOOD_TABLES",
+    "FOOD_TYPES",
+    "FOOD_TYPE_CONFIG",
+    "MODE_FOOD_CONFIG",
+    "FoodChance",
+    "FoodTable",
+    "FoodType",
+    "FoodTypeSpec",
+    "ModeFoodConfig",
+    "build_food_tables",
+]
@@ -3,30 +3,126 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
 
+from .body import RingBody
 from .direction import Direction
-from .events import GameStepEvent, GameStepResult
-from .state import Point, SnakeGameConfig, SnakeGameState
+from .effects import Effect, EffectScheduler
+from .events import GameStepEvent, GameStepResult, InputStats, RunSummary
+from .food import FOOD_TABLES, FOOD_TYPE_CONFIG, FoodType
+from .grid import (
+    BODY,
+    CELL_FOOD,
+    CELL_HEAD,
+    RASTER_CODES,
+    FreeCellSet,
+    wall_bitmap,
+)
+from .journal import (
+    EATEN,
+    FOOD_TYPE_SHIFT,
+    MOVE_MASK,
+    NO_CELL,
+    PREVIOUS_SHIFT,
+    SPEED_CHANGED,
+    DeltaJournal,
+)
+from .native import mypyc_attr
+from .snapshot import EngineSnapshot
+from .state import Point, SnakeBody, SnakeGameConfig, SnakeGameState
+from .zobrist import ZobristKeys, zobrist_keys
 
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
 
-@dataclass(slots=True)
-class StepContext:
-    """Вспомогательная структура для передачи параметров шага."""
+# Политика для пакетного прогона: по движку выбирает направление
+Policy = Callable[["SnakeGameEngine"], Direction | None]
 
-    direction: Direction
-    next_head: Point
-    wrapped: bool = False
+_MOVED = GameStepEvent.MOVED.mask
+_FOOD_EATEN = GameStepEvent.FOOD_EATEN.mask
+_SPEED_CHANGED = GameStepEvent.SPEED_CHANGED.mask
+_GAME_OVER = GameStepEvent.GAME_OVER.mask
 
+# Готовые результаты для тиков без движения и для столкновений
+_IDLE_RESULT = GameStepResult.cached(0, needs_redraw=False)
+_CRASH_RESULT = GameStepResult.cached(_MOVED | _GAME_OVER)
+# Результаты с разницей клеток создаются в обход NamedTuple.__new__,
+# флаги событий берутся готовыми, без вызова конструктора IntFlag
+_new_result = tuple.__new__
+_EVENT_FLAGS = tuple(
+    GameStepEvent(mask) for mask in range(1 << len(GameStepEvent))
+)
+_MOVED_FLAG = _EVENT_FLAGS[_MOVED]
 
+_DIRECTIONS: tuple[Direction, ...] = tuple(Direction)
+_DIRECTION_CODES = {
+    direction: code for code, direction in enumerate(_DIRECTIONS)
+}
+_FOOD_TYPES: tuple[FoodType, ...] = tuple(FoodType)
+_FOOD_TYPE_CODES = {
+    food_type: code for code, food_type in enumerate(_FOOD_TYPES)
+}
+
+# Ключи Zobrist до первого state_hash: без хеша они не нужны, а на
+# большом поле занимают 24 байта на клетку
+_NO_ZOBRIST_KEYS = ZobristKeys(0)
+
+# Начальная ёмкость компактного тела (RingBody), если поле больше
+_MIN_BODY = 64
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
 class SnakeGameEngine:
     """Движок змейки, управляющий состоянием и игровыми событиями."""
 
     def __init__(self, config: SnakeGameConfig) -> None:
         if config.cols <= 0 or config.rows <= 0:
             raise ValueError("Размер игрового поля должен быть положительным")
+        if config.input_queue_size < 1:
+            raise ValueError("Очередь ввода должна вмещать хотя бы поворот")
+        mode = config.food_mode
+        if mode is not None and mode not in FOOD_TABLES:
+            raise ValueError(f"Неизвестный режим еды: {mode}")
         self.config = config
         self._rng = random.Random(config.rng_seed)  # noqa: B311,S311  # nosec
+        # Кэш getstate(): сбрасывается при каждом обращении к генератору,
+        # чтобы снимки без новых выборок не копировали его заново
+        self._rng_state: tuple[Any, ...] | None = None
+        # Сетка занятости: по байту на клетку (индекс y * cols + x),
+        # BODY для тела и WALL для стен. Любое ненулевое значение —
+        # столкновение, которое проверяется за O(1).
+        self._occupied = bytearray()
+        # Свободные клетки для размещения еды без перебора всего поля
+        self._free = FreeCellSet(0)
+        self._indexed_cols = config.cols
+        self._indexed_state: SnakeGameState | None = None
+        self._indexed_snake: SnakeBody | None = None
+        # Очередь поворотов: (направление, state.steps в момент нажатия).
+        # Пока она не пуста, state.pending_direction равно её первому
+        # повороту — тому, что применится на ближайшем тике.
+        self._turns: deque[tuple[Direction, int]] = deque()
+        self.input_stats = InputStats()
+        # Журнал для отката (enable_journal); None — не ведётся
+        self._journal: DeltaJournal | None = None
+        # Ускорение, щит и срок особой еды; время идёт только в step()
+        self._effects = EffectScheduler()
+        # Zobrist-хеш тела с головой; None — ещё не запрошен или сброшен
+        # пересборкой индексов (state_hash посчитает его заново)
+        self._zobrist: int | None = None
+        # Ключи хеша; валидны, пока _zobrist не None
+        self._zobrist_keys = _NO_ZOBRIST_KEYS
+        # Растр render_into: буфер прошлого вызова, его плоский вид, клетки
+        # головы и еды на нём и клетки, изменённые с тех пор. None вместо
+        # журнала клеток — буфер нужно нарисовать заново целиком.
+        self._raster_target: object = None
+        self._raster_view = memoryview(b"")
+        self._raster_head = NO_CELL
+        self._raster_food = NO_CELL
+        self._dirty: array[int] | None = None
         self.state = self._create_initial_state(config)
 
     # ------------------------------------------------------------------
@@ -42,6 +138,109 @@ class SnakeGameEngine:
     def is_running(self) -> bool:
         return not self.state.paused and not self.state.game_over
 
+    @property
+    def board_full(self) -> bool:
+        """True, если на поле не осталось свободных клеток (за O(1))."""
+
+        return self._free.full
+
+    @property
+    def queued_turns(self) -> tuple[Direction, ...]:
+        """Повороты в очереди ввода в порядке применения."""
+
+        self._sync_turns()
+        return tuple(direction for direction, _ in self._turns)
+
+    @property
+    def state_hash(self) -> int:
+        """64-битный Zobrist-хеш позиции: тело, голова, направление, еда.
+
+        Первое обращение считает хеш тела за O(длины змейки), дальше
+        движок обновляет его за O(1) на тик. Одинаковые позиции на поле
+        одного размера дают одинаковый хеш в любом движке и процессе.
+        """
+
+        self._ensure_indexes()
+        state = self.state
+        cols = state.cols
+        keys = self._zobrist_keys
+        body = self._zobrist
+        if body is None:
+            # Ключи нужны только хешу: строим их при первом обращении
+            keys = self._zobrist_keys = zobrist_keys(cols * state.rows)
+            body = self._zobrist = keys.body_hash(self._body_cells())
+        food_x, food_y = state.food
+        return (
+            body
+            ^ keys.food[food_y * cols + food_x]
+            ^ keys.directions[state.direction]
+        )
+
+    def render_into(self, buf: WriteableBuffer) -> None:
+        """Рисует поле в ``buf``: байт на клетку с индексом ``y * cols + x``.
+
+        Коды клеток — ``CELL_*`` из :mod:`snake_game.core.grid`. Подходит
+        любой непрерывный буфер байтов длиной ``cols * rows``: bytearray,
+        memoryview или массив NumPy ``uint8`` формы ``(rows, cols)``.
+        Первый вызов заполняет буфер целиком, следующие с тем же буфером
+        переписывают только клетки, изменившиеся с прошлого вызова, — за
+        O(изменений) без выделения памяти. Между вызовами буфер менять
+        нельзя; после restore, смены размера или подмены состояния поле
+        рисуется заново целиком.
+        """
+
+        self._ensure_indexes()
+        state = self.state
+        cols = state.cols
+        occupied = self._occupied
+        dirty = self._dirty
+        if buf is self._raster_target and dirty is not None:
+            view = self._raster_view
+            for cell in dirty:
+                view[cell] = RASTER_CODES[occupied[cell]]
+            del dirty[:]
+            # Прежние голова и еда стали телом или пустыми клетками
+            cell = self._raster_head
+            view[cell] = RASTER_CODES[occupied[cell]]
+            cell = self._raster_food
+            if cell != NO_CELL:
+                view[cell] = RASTER_CODES[occupied[cell]]
+        else:
+            view = memoryview(buf)
+            if view.itemsize != 1:
+                raise TypeError("Растр поля — буфер байтов (uint8)")
+            view = view.cast("B")
+            if len(view) != len(occupied):
+                raise ValueError(
+                    f"Растр поля {cols}x{state.rows} — {len(occupied)} байт,"
+                    f" а не {len(view)}"
+                )
+            view[:] = occupied.translate(RASTER_CODES)
+            self._raster_target = buf
+            self._raster_view = view
+            self._dirty = array("i")
+
+        head_x, head_y = state.snake[0]
+        cell = self._raster_head = head_y * cols + head_x
+        view[cell] = CELL_HEAD
+        food_x, food_y = state.food
+        cell = food_y * cols + food_x
+        if 0 <= food_x < cols and 0 <= food_y < state.rows and not (
+            occupied[cell]
+        ):
+            view[cell] = CELL_FOOD
+            self._raster_food = cell
+        else:
+            # Еды нет: поле заполнено
+            self._raster_food = NO_CELL
+
+    def is_occupied(self, cell: Point) -> bool:
+        """True, если клетку занимает змейка (за O(1))."""
+
+        self._ensure_indexes()
+        x, y = cell
+        return bool(self._occupied[y * self._indexed_cols + x])
+
     # ------------------------------------------------------------------
     # Управление игрой
     # ------------------------------------------------------------------
@@ -54,6 +253,28 @@ class SnakeGameEngine:
             self.config = self.config.with_board(cols, rows)
         self.state = self._create_initial_state(self.config)
 
+    def reset_steps(self) -> None:
+        """Обнуляет счётчик шагов, сохраняя задержку нажатий в очереди.
+
+        Нажатия помечены номером шага, поэтому их метки сдвигаются
+        вместе со счётчиком.
+        """
+
+        state = self.state
+        self._sync_turns()
+        offset = state.steps
+        turns = self._turns
+        for index, (direction, pressed_at) in enumerate(turns):
+            turns[index] = (direction, pressed_at - offset)
+        state.steps = 0
+
+    def reseed(self, rng_seed: int | None) -> None:
+        """Пересоздаёт генератор случайных чисел с новым сидом."""
+
+        self.config = replace(self.config, rng_seed=rng_seed)
+        self._rng = random.Random(rng_seed)  # noqa: B311,S311  # nosec
+        self._rng_state = None
+
     def resize(
         self, cols: int, rows: int, *, preserve_state: bool = False
     ) -> None:
@@ -67,42 +288,341 @@ class SnakeGameEngine:
             self.state = self._create_initial_state(self.config)
             return
 
-        # Обновляем текущее состояние, сохраняя змейку и счёт
         state = self.state
+        if cols == state.cols and rows == state.rows:
+            # UI присылает события размера и без фактических изменений
+            state.cell_size = self.config.cell_size
+            self._ensure_indexes()
+            return
+
+        # Обновляем текущее состояние, сохраняя змейку и счёт
         state.cols = cols
         state.rows = rows
         state.cell_size = self.config.cell_size
 
-        # Обрезаем сегменты, выходящие за границы
+        # Обрезаем сегменты, выходящие за границы. Повторы и сегменты на
+        # стенах отсекаем по новой сетке занятости, так что проход по
+        # змейке линейный.
+        occupied = wall_bitmap(cols, rows, self.config.walls)
         clamped_snake: list[Point] = []
-        for segment in state.snake:
-            x = min(max(segment[0], 0), cols - 1)
-            y = min(max(segment[1], 0), rows - 1)
-            point = (x, y)
-            if point not in clamped_snake:
-                clamped_snake.append(point)
-        if not clamped_snake:
-            clamped_snake = self._initial_snake(cols, rows)
+        max_x = cols - 1
+        max_y = rows - 1
+        for x, y in state.snake:
+            if x < 0:
+                x = 0
+            elif x > max_x:
+                x = max_x
+            if y < 0:
+                y = 0
+            elif y > max_y:
+                y = max_y
+            cell = y * cols + x
+            if not occupied[cell]:
+                occupied[cell] = BODY
+                clamped_snake.append((x, y))
+        if clamped_snake:
+            state.snake = self._new_body(cols, rows, clamped_snake)
+            self._install_indexes(cols, rows, occupied)
+            self._indexed_state = state
+            self._indexed_snake = state.snake
+        else:
+            state.snake = self._initial_snake(cols, rows)
             state.score = 0
-        state.snake = clamped_snake
+            self._rebuild_indexes()
 
         # Корректируем еду
         fx, fy = state.food
-        if (
-            not (0 <= fx < cols and 0 <= fy < rows)
-            or state.food in state.snake
-        ):
+        food_inside = 0 <= fx < cols and 0 <= fy < rows
+        if not food_inside or self._occupied[fy * cols + fx]:
             self._spawn_food(state)
 
     def set_direction(self, direction: Direction) -> None:
-        """Меняет направление движения, если оно допустимо."""
+        """Ставит поворот в очередь ввода, если он допустим.
+
+        Каждый тик применяет один поворот из очереди. Разворот назад
+        проверяется относительно направления, которое будет у змейки к
+        моменту применения, то есть после уже стоящих в очереди
+        поворотов. В заполненной очереди новое нажатие заменяет
+        последнее.
+        """
 
         state = self.state
-        if direction == state.pending_direction:
+        turns = self._turns
+        self._sync_turns()
+        last = turns[-1][0] if turns else state.pending_direction
+        if direction == last:
             return
-        if direction.is_opposite(state.direction) and len(state.snake) > 1:
+        full = len(turns) >= self.config.input_queue_size
+        if full:
+            base = turns[-2][0] if len(turns) > 1 else state.direction
+        else:
+            base = last if turns else state.direction
+        if direction.is_opposite(base) and len(state.snake) > 1:
             return
-        state.pending_direction = direction
+        if full:
+            turns.pop()
+            self.input_stats.replaced += 1
+        turns.append((direction, state.steps))
+        state.pending_direction = turns[0][0]
+
+    # ------------------------------------------------------------------
+    # Снимки и ветвление
+    # ------------------------------------------------------------------
+    def snapshot(self, into: EngineSnapshot | None = None) -> EngineSnapshot:
+        """Сохраняет состояние и генератор случайных чисел в снимок.
+
+        Если передан ``into`` (например, из :class:`SnapshotPool`), его
+        буферы перезаписываются на месте. Время и память — O(поля), см.
+        :class:`EngineSnapshot`.
+        """
+
+        self._ensure_indexes()
+        snapshot = into if into is not None else EngineSnapshot()
+        state = self.state
+        cols = state.cols
+        body = snapshot.body
+        del body[:]
+        body.extend(self._body_cells())
+        snapshot.occupied[:] = self._occupied
+        self._free.dump(snapshot.free_cells, snapshot.free_positions)
+        if self._rng_state is None:
+            self._rng_state = self._rng.getstate()
+        snapshot.rng_state = self._rng_state
+        snapshot.config = self.config
+        snapshot.cols = cols
+        snapshot.rows = state.rows
+        snapshot.cell_size = state.cell_size
+        snapshot.direction = state.direction
+        snapshot.pending_direction = state.pending_direction
+        self._sync_turns()
+        snapshot.turns[:] = self._turns
+        snapshot.food = state.food
+        snapshot.score = state.score
+        snapshot.speed = state.speed
+        snapshot.paused = state.paused
+        snapshot.game_over = state.game_over
+        snapshot.steps = state.steps
+        snapshot.level_threshold = state.level_threshold
+        snapshot.speed_multiplier = state.speed_multiplier
+        snapshot.food_type = state.food_type
+        snapshot.zobrist = self._zobrist
+        effects = self._effects
+        snapshot.effects = effects.copy() if effects.active else None
+        return snapshot
+
+    def restore(self, snapshot: EngineSnapshot) -> None:
+        """Возвращает движок к снимку, не создавая новых объектов состояния.
+
+        Объект ``state`` и тело ``state.snake`` остаются прежними, поэтому
+        ссылки на них у UI и ботов не устаревают.
+        """
+
+        if snapshot.config is None:
+            raise ValueError("Снимок ещё не заполнен")
+        self.config = snapshot.config
+        state = self.state
+        cols = snapshot.cols
+        state.cols = cols
+        state.rows = snapshot.rows
+        state.cell_size = snapshot.cell_size
+        snake = state.snake
+        if isinstance(snake, RingBody):
+            snake.load_cells(snapshot.body, cols)
+        else:
+            snake[:] = [(cell % cols, cell // cols) for cell in snapshot.body]
+        state.direction = snapshot.direction
+        state.pending_direction = snapshot.pending_direction
+        self._turns.clear()
+        self._turns.extend(snapshot.turns)
+        state.food = snapshot.food
+        state.score = snapshot.score
+        state.speed = snapshot.speed
+        state.paused = snapshot.paused
+        state.game_over = snapshot.game_over
+        state.steps = snapshot.steps
+        state.level_threshold = snapshot.level_threshold
+        state.speed_multiplier = snapshot.speed_multiplier
+        state.food_type = snapshot.food_type
+        self._zobrist = snapshot.zobrist
+        self._zobrist_keys = (
+            _NO_ZOBRIST_KEYS
+            if snapshot.zobrist is None
+            else zobrist_keys(cols * snapshot.rows)
+        )
+        self._dirty = None
+        if snapshot.effects is not None:
+            # Снимок может восстанавливаться много раз: берём копию
+            self._effects = snapshot.effects.copy()
+        else:
+            self._effects.clear()
+        self._occupied[:] = snapshot.occupied
+        self._free.load(snapshot.free_cells, snapshot.free_positions)
+        self._indexed_cols = cols
+        self._indexed_state = state
+        self._indexed_snake = state.snake
+        if self._journal is not None:
+            self._journal.clear()
+        if snapshot.rng_state is not self._rng_state:
+            self._rng.setstate(snapshot.rng_state)
+            self._rng_state = snapshot.rng_state
+
+    def fork(self) -> SnakeGameEngine:
+        """Создаёт независимую копию движка с тем же состоянием генератора.
+
+        Дальнейшие шаги копии и оригинала с одинаковым вводом совпадают.
+        """
+
+        self._ensure_indexes()
+        clone = type(self).__new__(type(self))
+        clone.config = self.config
+        # Состояние генератора всё равно заменяется, сид не важен
+        clone._rng = random.Random(0)  # noqa: B311,S311  # nosec
+        clone._rng.setstate(self._rng.getstate())
+        clone._rng_state = None
+        clone._occupied = bytearray(self._occupied)
+        clone._free = self._free.copy()
+        clone._indexed_cols = self._indexed_cols
+        clone.state = self.state.copy()
+        self._sync_turns()
+        clone._turns = deque(self._turns)
+        clone.input_stats = InputStats()
+        clone._journal = None
+        clone._effects = self._effects.copy()
+        clone._zobrist = self._zobrist
+        clone._zobrist_keys = self._zobrist_keys
+        clone._raster_target = None
+        clone._raster_view = memoryview(b"")
+        clone._raster_head = clone._raster_food = NO_CELL
+        clone._dirty = None
+        clone._indexed_state = clone.state
+        clone._indexed_snake = clone.state.snake
+        return clone
+
+    # ------------------------------------------------------------------
+    # Откат
+    # ------------------------------------------------------------------
+    def enable_journal(self, window: int) -> None:
+        """Начинает записывать последние ``window`` тиков для отката.
+
+        Журнал хранит только разницу тиков, поэтому его память зависит
+        от окна, а не от длины змейки. Смена поля, сброс и
+        :meth:`restore` очищают журнал.
+        """
+
+        self._journal = DeltaJournal(window)
+
+    def disable_journal(self) -> None:
+        self._journal = None
+
+    @property
+    def rewindable_ticks(self) -> int:
+        """На сколько тиков с движением можно откатиться."""
+
+        self._ensure_indexes()
+        return len(self._journal) if self._journal is not None else 0
+
+    def rewind(self, ticks: int) -> int:
+        """Откатывает до ``ticks`` последних тиков с движением за O(ticks).
+
+        Змейка, еда, счёт и скорость возвращаются к состоянию до этих
+        тиков, конец игры снимается, очередь ввода очищается. Генератор
+        случайных чисел и эффекты не откатываются: после отката еда
+        появляется в новых местах, а ускорение и щит продолжают идти.
+        Возвращает число откаченных тиков.
+        """
+
+        if ticks < 0:
+            raise ValueError("Количество тиков не может быть отрицательным")
+        self._ensure_indexes()
+        journal = self._journal
+        if journal is None:
+            return 0
+        ticks = min(ticks, len(journal))
+        if not ticks:
+            return 0
+
+        state = self.state
+        cols = state.cols
+        occupied = self._occupied
+        free = self._free
+        tails: list[Point] = []
+        points = 0
+        speed_changes = 0
+        food = NO_CELL
+        food_type = FoodType.NORMAL
+        flags = 0
+        zobrist = self._zobrist
+        keys = self._zobrist_keys
+        dirty = self._dirty
+        if zobrist is not None:
+            head_x, head_y = state.snake[0]
+            zobrist ^= keys.head[head_y * cols + head_x]
+        for _ in range(ticks):
+            flags, head, tail, old_food = journal.pop()
+            occupied[head] = 0
+            free.add(head)
+            if zobrist is not None:
+                zobrist ^= keys.body[head]
+                if tail != NO_CELL:
+                    zobrist ^= keys.body[tail]
+            if dirty is not None:
+                dirty.append(head)
+                if tail != NO_CELL:
+                    dirty.append(tail)
+            if tail != NO_CELL:
+                occupied[tail] = BODY
+                free.discard(tail)
+                tails.append((tail % cols, tail // cols))
+            if flags & EATEN:
+                food = old_food
+                food_type = _FOOD_TYPES[flags >> FOOD_TYPE_SHIFT]
+                points += FOOD_TYPE_CONFIG[food_type].score
+                if flags & SPEED_CHANGED:
+                    speed_changes += 1
+
+        # Хвосты возвращаются в конец, головы снимаются с начала. Операции
+        # на разных концах перестановочны, поэтому делаем их пачками.
+        snake = state.snake
+        snake.extend(tails)
+        del snake[:ticks]
+        self._indexed_snake = snake
+        if zobrist is not None:
+            head_x, head_y = snake[0]
+            self._zobrist = zobrist ^ keys.head[head_y * cols + head_x]
+
+        direction = _DIRECTIONS[flags >> PREVIOUS_SHIFT & MOVE_MASK]
+        state.direction = state.pending_direction = direction
+        self._turns.clear()
+        if food != NO_CELL:
+            state.food = (food % cols, food // cols)
+            if self.config.food_mode is not None:
+                # Срок вернувшейся особой еды отсчитывается заново
+                self._set_food_type(state, food_type)
+        state.score -= points
+        state.speed -= speed_changes * self.config.speed_increment
+        state.speed_multiplier -= speed_changes
+        state.steps -= ticks
+        state.game_over = False
+        return ticks
+
+    # ------------------------------------------------------------------
+    # Эффекты
+    # ------------------------------------------------------------------
+    @property
+    def effects(self) -> EffectScheduler:
+        """Активные эффекты; остаток — ``effects.remaining(effect)``."""
+
+        return self._effects
+
+    def start_effect(self, effect: Effect, ticks: int | None = None) -> None:
+        """Включает эффект на ``ticks`` тиков (по умолчанию из конфига).
+
+        Повторный запуск продлевает эффект, не складывая ускорения.
+        """
+
+        if ticks is not None and ticks < 1:
+            raise ValueError("Эффект должен длиться хотя бы тик")
+        self._start_effect(effect, ticks)
 
     def toggle_pause(self) -> None:
         self.state.paused = not self.state.paused
@@ -121,51 +641,379 @@ class SnakeGameEngine:
         """Делает один шаг игры и возвращает возникшие события."""
 
         state = self.state
-        if state.game_over:
-            return GameStepResult(frozenset(), needs_redraw=False)
-        if state.paused:
-            return GameStepResult(frozenset(), needs_redraw=False)
+        if state.game_over or state.paused:
+            return _IDLE_RESULT
+        self._ensure_indexes()
 
-        state.direction = state.pending_direction
-        ctx = self._build_step_context(state)
-        events: set[GameStepEvent] = {GameStepEvent.MOVED}
+        events = _MOVED
+        # Клетка еды, сменившей тип на этом тике (особая стала обычной)
+        refreshed: Point | None = None
+        if self._effects.active:
+            # Время эффектов идёт только шагами игры, пауза его не двигает
+            expired = self._effects.advance()
+            if expired:
+                events |= self._expire_effects(expired)
+                if Effect.FOOD_EXPIRY in expired:
+                    refreshed = state.food
 
-        # Столкновение со стеной
-        if not ctx.wrapped and not self._within_bounds(ctx.next_head, state):
-            self._apply_game_over()
-            events.add(GameStepEvent.GAME_OVER)
-            return GameStepResult(frozenset(events))
+        direction = (
+            self._take_turn(state.steps)
+            if self._turns
+            else state.pending_direction
+        )
+        previous = state.direction
+        state.direction = direction
+        dx, dy = direction.value
+        head_x, head_y = state.snake[0]
+        next_x = head_x + dx
+        next_y = head_y + dy
+        if self.config.wrap_edges:
+            next_x %= state.cols
+            next_y %= state.rows
+        elif not (0 <= next_x < state.cols and 0 <= next_y < state.rows):
+            # Столкновение со стеной
+            return self._collide(events, refreshed)
 
-        # Столкновение с собой
-        if ctx.next_head in state.snake:
-            self._apply_game_over()
-            events.add(GameStepEvent.GAME_OVER)
-            return GameStepResult(frozenset(events))
+        # Столкновение с собой: хвост ещё не сдвинут, поэтому он тоже занят
+        occupied = self._occupied
+        next_cell = next_y * state.cols + next_x
+        if occupied[next_cell]:
+            return self._collide(events, refreshed)
 
-        state.snake.insert(0, ctx.next_head)
+        next_head = (next_x, next_y)
+        state.snake.insert(0, next_head)
+        occupied[next_cell] = 1
+        self._free.discard(next_cell)
+        dirty = self._dirty
+        if dirty is not None:
+            if len(dirty) > len(occupied):
+                # render_into давно не вызывали: дешевле нарисовать заново
+                self._dirty = dirty = None
+            else:
+                dirty.append(next_cell)
+        zobrist = self._zobrist
+        if zobrist is not None:
+            keys = self._zobrist_keys
+            zobrist ^= (
+                keys.head[head_y * state.cols + head_x]
+                ^ keys.head[next_cell]
+                ^ keys.body[next_cell]
+            )
+            self._zobrist = zobrist
 
-        if ctx.next_head == state.food:
-            state.score += 1
-            events.add(GameStepEvent.FOOD_EATEN)
-            self._maybe_increase_speed(events)
-            self._spawn_food(state)
+        food = state.food
+        journal = self._journal
+        if journal is not None:
+            flags = (
+                _DIRECTION_CODES[previous] << PREVIOUS_SHIFT
+                | _DIRECTION_CODES[direction]
+            )
+        if next_head == food:
+            food_type = state.food_type
+            spec = FOOD_TYPE_CONFIG[food_type]
+            state.score += spec.score
+            events |= _FOOD_EATEN
+            leveled_up = self._maybe_increase_speed(spec.score)
+            if leveled_up:
+                events |= _SPEED_CHANGED
+            if spec.effect is not None:
+                events |= self._start_effect(Effect(spec.effect))
+            if journal is not None:
+                if leveled_up:
+                    flags |= SPEED_CHANGED
+                flags |= (
+                    EATEN | _FOOD_TYPE_CODES[food_type] << FOOD_TYPE_SHIFT
+                )
+                journal.record(flags, next_cell, NO_CELL, next_cell)
+            # Если поле заполнено, еда не появилась
+            new_food = state.food if self._spawn_food(state) else None
+            diff: tuple[Any, ...] = (
+                _EVENT_FLAGS[events], True, next_head, None, food, new_food
+            )
         else:
-            state.snake.pop()
+            tail = state.snake.pop()
+            tail_x, tail_y = tail
+            tail_cell = tail_y * state.cols + tail_x
+            occupied[tail_cell] = 0
+            self._free.add(tail_cell)
+            if zobrist is not None:
+                self._zobrist = zobrist ^ keys.body[tail_cell]
+            if dirty is not None:
+                dirty.append(tail_cell)
+            if journal is not None:
+                journal.record(flags, next_cell, tail_cell, NO_CELL)
+            diff = (
+                _EVENT_FLAGS[events],
+                True,
+                next_head,
+                tail,
+                refreshed,
+                refreshed,
+            )
 
         state.steps += 1
-        return GameStepResult(frozenset(events))
+        return _new_result(GameStepResult, diff)
+
+    def run(
+        self,
+        n_steps: int,
+        policy: Policy | None = None,
+        *,
+        directions: Sequence[Direction | None] | None = None,
+    ) -> RunSummary:
+        """Прогоняет до ``n_steps`` тиков без создания результатов шагов.
+
+        Перед тиком ``i`` применяется ``directions[i]`` (если есть), затем
+        направление, которое вернул ``policy(engine)``. Правила те же, что
+        у :meth:`step`, но события каждого тика пишутся одним байтом
+        (биты ``GameStepEvent.mask``). Прогон останавливается на конце
+        игры, а также если политика поставила игру на паузу, заменила
+        состояние или включила эффект.
+        """
+
+        if n_steps < 0:
+            raise ValueError("Количество шагов не может быть отрицательным")
+        state = self.state
+        if not self.is_running or not n_steps:
+            return RunSummary(state, array("B"), 0, None)
+        self._ensure_indexes()
+        effects_active = self._effects.active
+        if effects_active or self.config.food_mode is not None:
+            # Особая еда и эффекты меняют правила тика: быстрый цикл их
+            # не разворачивает
+            return self._run_stepwise(n_steps, policy, directions)
+
+        cols = state.cols
+        rows = state.rows
+        snake = state.snake
+        occupied = self._occupied
+        # Операции FreeCellSet развёрнуты прямо в цикле ради скорости
+        free_cells = self._free._cells
+        free_positions = self._free._positions
+        wrap = self.config.wrap_edges
+        interval = self.config.speed_increase_interval
+        increment = self.config.speed_increment
+        set_direction = self.set_direction
+        turns = self._turns
+        take_turn = self._take_turn
+        journal = self._journal
+        zobrist = self._zobrist
+        zobrist_head = self._zobrist_keys.head
+        zobrist_body = self._zobrist_keys.body
+        dirty = self._dirty
+        push_head = snake.insert
+        pop_tail = snake.pop
+        moved = _MOVED
+        # Обычный тик — просто движение, остальные коды пишутся поверх
+        codes = array("B", [moved]) * n_steps
+        game_over = _MOVED | _GAME_OVER
+        food_eaten = _MOVED | _FOOD_EATEN
+        speed_changed = food_eaten | _SPEED_CHANGED
+        planned = len(directions) if directions is not None else 0
+        # До какого тика направление может меняться извне цикла
+        controlled = n_steps if policy is not None else planned
+
+        # Направление до очередного тика — для журнала отката
+        previous_code = _DIRECTION_CODES[state.direction]
+        # Горячие поля состояния держим в локальных переменных и
+        # синхронизируем перед вызовом политики и по завершении
+        direction = state.pending_direction
+        dx, dy = direction.value
+        state.direction = direction
+        head_x, head_y = snake[0]
+        head_cell = head_y * cols + head_x
+        food_x, food_y = state.food
+        food_cell = food_y * cols + food_x
+        start_steps = state.steps
+        last_free = len(free_cells) - 1
+        crashed = False
+
+        ticks = n_steps
+        for tick in range(n_steps):
+            if tick < controlled:
+                state.steps = start_steps + tick
+                if tick < planned:
+                    wanted = directions[tick]  # type: ignore[index]
+                    if wanted is not None:
+                        set_direction(wanted)
+                if policy is not None:
+                    if zobrist is not None:
+                        self._zobrist = zobrist
+                    wanted = policy(self)
+                    if wanted is not None:
+                        set_direction(wanted)
+                    # Политика может перебирать ходы через snapshot/restore,
+                    # но обязана вернуть движок в исходное состояние
+                    if (
+                        self.state is not state
+                        or state.snake is not snake
+                        or state.steps != start_steps + tick
+                        or state.paused
+                        or state.game_over
+                        or effects_active
+                    ):
+                        ticks = tick
+                        break
+                    food_x, food_y = state.food
+                    food_cell = food_y * cols + food_x
+                    # Политика могла впервые запросить state_hash или
+                    # нарисовать поле
+                    zobrist = self._zobrist
+                    dirty = self._dirty
+            if turns:
+                turn = take_turn(start_steps + tick)
+                if turn is not direction:
+                    direction = turn
+                    dx, dy = direction.value
+                    state.direction = direction
+            elif (
+                tick < controlled
+                and state.pending_direction is not direction
+            ):
+                # Enum.value — дескриптор, читаем его только при смене
+                direction = state.pending_direction
+                dx, dy = direction.value
+                state.direction = direction
+
+            head_x += dx
+            head_y += dy
+            if wrap:
+                head_x %= cols
+                head_y %= rows
+            elif not (0 <= head_x < cols and 0 <= head_y < rows):
+                crashed = True
+                ticks = tick + 1
+                break
+            next_cell = head_y * cols + head_x
+            if occupied[next_cell]:
+                crashed = True
+                ticks = tick + 1
+                break
+
+            push_head(0, (head_x, head_y))
+            occupied[next_cell] = 1
+            index = free_positions[next_cell]
+            free_positions[next_cell] = -1
+            if zobrist is not None:
+                zobrist ^= (
+                    zobrist_head[head_cell]
+                    ^ zobrist_head[next_cell]
+                    ^ zobrist_body[next_cell]
+                )
+            head_cell = next_cell
+            if dirty is not None:
+                dirty.append(next_cell)
+
+            if next_cell == food_cell:
+                # Клетка головы уходит из свободных, список укорачивается
+                last = free_cells.pop()
+                if last != next_cell:
+                    free_cells[index] = last
+                    free_positions[last] = index
+                last_free -= 1
+                state.score += 1
+                if state.score % interval == 0:
+                    state.speed += increment
+                    state.speed_multiplier += 1
+                    codes[tick] = speed_changed
+                else:
+                    codes[tick] = food_eaten
+                if journal is not None:
+                    code = _DIRECTION_CODES[direction]
+                    flags = previous_code << PREVIOUS_SHIFT | code | EATEN
+                    if codes[tick] == speed_changed:
+                        flags |= SPEED_CHANGED
+                    journal.record(flags, next_cell, NO_CELL, next_cell)
+                    previous_code = code
+                if not self._spawn_food(state):
+                    # Поле заполнено: еду больше некуда поставить
+                    ticks = tick + 1
+                    break
+                food_x, food_y = state.food
+                food_cell = food_y * cols + food_x
+            else:
+                # Удаление головы и добавление хвоста в FreeCellSet одним
+                # обменом: длина списка свободных клеток не меняется
+                tail_x, tail_y = pop_tail()
+                tail_cell = tail_y * cols + tail_x
+                occupied[tail_cell] = 0
+                if index != last_free:
+                    last = free_cells[last_free]
+                    free_cells[index] = last
+                    free_positions[last] = index
+                free_cells[last_free] = tail_cell
+                free_positions[tail_cell] = last_free
+                if zobrist is not None:
+                    zobrist ^= zobrist_body[tail_cell]
+                if dirty is not None:
+                    dirty.append(tail_cell)
+                if journal is not None:
+                    code = _DIRECTION_CODES[direction]
+                    journal.record(
+                        previous_code << PREVIOUS_SHIFT | code,
+                        next_cell,
+                        tail_cell,
+                        NO_CELL,
+                    )
+                    previous_code = code
+
+        if zobrist is not None:
+            self._zobrist = zobrist
+        if dirty is not None and len(dirty) > len(occupied):
+            self._dirty = None
+        if crashed:
+            self._apply_game_over()
+            codes[ticks - 1] = game_over
+        state.steps = start_steps + ticks - crashed
+        del codes[ticks:]
+        game_over_tick: int | None = ticks if state.game_over else None
+        return RunSummary(self.state, codes, ticks, game_over_tick)
+
+    def _run_stepwise(
+        self,
+        n_steps: int,
+        policy: Policy | None,
+        directions: Sequence[Direction | None] | None,
+    ) -> RunSummary:
+        """Прогон через :meth:`step` с теми же правилами, что и у run."""
+
+        state = self.state
+        codes = array("B", bytes(n_steps))
+        planned = len(directions) if directions is not None else 0
+        ticks = 0
+        for tick in range(n_steps):
+            if tick < planned:
+                wanted = directions[tick]  # type: ignore[index]
+                if wanted is not None:
+                    self.set_direction(wanted)
+            if policy is not None:
+                wanted = policy(self)
+                if wanted is not None:
+                    self.set_direction(wanted)
+                if self.state is not state or state.paused or state.game_over:
+                    break
+            codes[tick] = self.step().events
+            ticks = tick + 1
+            if state.game_over:
+                break
+        del codes[ticks:]
+        game_over_tick: int | None = ticks if state.game_over else None
+        return RunSummary(state, codes, ticks, game_over_tick)
 
     # ------------------------------------------------------------------
     # Внутренняя логика
     # ------------------------------------------------------------------
     def _create_initial_state(self, config: SnakeGameConfig) -> SnakeGameState:
+        self._turns.clear()
+        self._effects.clear()
         snake = self._initial_snake(config.cols, config.rows)
         direction = Direction.RIGHT
-        food = self._random_empty_cell(config.cols, config.rows, snake)
+        self._index_board(config.cols, config.rows, snake)
+        food = self._random_empty_cell()
         if food is None:
             msg = "Не удалось разместить еду на стартовом поле"
             raise RuntimeError(msg)
-        return SnakeGameState(
+        state = SnakeGameState(
             cols=config.cols,
             rows=config.rows,
             cell_size=config.cell_size,
@@ -181,65 +1029,227 @@ class SnakeGameEngine:
             level_threshold=config.speed_increase_interval,
             speed_multiplier=1,
         )
+        if config.food_mode is not None:
+            self._choose_food_type(state)
+        self._indexed_state = state
+        self._indexed_snake = snake
+        return state
 
-    def _initial_snake(self, cols: int, rows: int) -> list[Point]:
-        cx = max(cols // 2, 1)
-        cy = max(rows // 2, 1)
-        return [(cx, cy), (cx - 1, cy), (cx - 2, cy)]
+    def _sync_turns(self) -> None:
+        turns = self._turns
+        if turns and self.state.pending_direction is not turns[0][0]:
+            # pending_direction заменили снаружи (или подменили состояние):
+            # очередь устарела
+            turns.clear()
 
-    def _build_step_context(self, state: SnakeGameState) -> StepContext:
-        head_x, head_y = state.head()
-        dx = state.direction.dx
-        dy = state.direction.dy
-        next_x = head_x + dx
-        next_y = head_y + dy
-        wrapped = False
+    def _take_turn(self, steps: int) -> Direction:
+        """Снимает с очереди поворот для тика номер ``steps``."""
 
-        if self.config.wrap_edges:
-            next_x %= state.cols
-            next_y %= state.rows
-            wrapped = True
+        self._sync_turns()
+        turns = self._turns
+        if not turns:
+            return self.state.pending_direction
+        direction, pressed_at = turns.popleft()
+        self.input_stats.record(steps - pressed_at)
+        if turns:
+            self.state.pending_direction = turns[0][0]
+        return direction
 
-        return StepContext(
-            direction=state.direction,
-            next_head=(next_x, next_y),
-            wrapped=wrapped,
-        )
+    def _ensure_indexes(self) -> None:
+        state = self.state
+        if (
+            state is not self._indexed_state
+            or state.snake is not self._indexed_snake
+        ):
+            # Состояние или список сегментов подменили снаружи
+            self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Пересобирает индексы поля по текущему состоянию."""
+
+        state = self.state
+        self._index_board(state.cols, state.rows, state.snake)
+        self._indexed_state = state
+        self._indexed_snake = state.snake
+
+    def _index_board(
+        self, cols: int, rows: int, snake: Iterable[Point]
+    ) -> None:
+        # Стены лежат в той же сетке, поэтому проверка столкновения и учёт
+        # свободных клеток их уже учитывают
+        occupied = wall_bitmap(cols, rows, self.config.walls)
+        for x, y in snake:
+            if 0 <= x < cols and 0 <= y < rows:
+                occupied[y * cols + x] = BODY
+        self._install_indexes(cols, rows, occupied)
+
+    def _install_indexes(
+        self, cols: int, rows: int, occupied: bytearray
+    ) -> None:
+        self._occupied = occupied
+        self._free = FreeCellSet.from_board(cols, rows, occupied)
+        self._indexed_cols = cols
+        self._zobrist = None
+        self._zobrist_keys = _NO_ZOBRIST_KEYS
+        self._dirty = None
+        if self._journal is not None:
+            # Журнал ссылается на клетки прежней сетки
+            self._journal.clear()
+
+    def _body_cells(self) -> list[int]:
+        """Клетки тела ``y * cols + x`` от головы к хвосту."""
+
+        snake = self.state.snake
+        if isinstance(snake, RingBody):
+            return list(snake.cells())
+        cols = self.state.cols
+        return [y * cols + x for x, y in snake]
+
+    def _new_body(
+        self, cols: int, rows: int, points: list[Point]
+    ) -> SnakeBody:
+        if self.config.compact_body:
+            # Буфер растёт сам, поэтому всё поле заранее не выделяем
+            capacity = min(cols * rows, max(len(points), _MIN_BODY))
+            return RingBody(cols, capacity, points)
+        return points
+
+    def _initial_snake(self, cols: int, rows: int) -> SnakeBody:
+        # На поле уже трёх клеток змейка короче, но целиком на поле:
+        # индексы клеток y * cols + x не знают, что клетка за краем
+        cx = min(max(cols // 2, 1), cols - 1)
+        cy = min(max(rows // 2, 1), rows - 1)
+        snake = [(x, cy) for x in range(cx, max(cx - 3, -1), -1)]
+        walls = self.config.walls
+        if walls and not walls.isdisjoint(snake):
+            snake = self._initial_snake_between_walls(cols, rows, cy)
+        return self._new_body(cols, rows, snake)
 
-    def _within_bounds(self, point: Point, state: SnakeGameState) -> bool:
-        x, y = point
-        return 0 <= x < state.cols and 0 <= y < state.rows
+    def _initial_snake_between_walls(
+        self, cols: int, rows: int, cy: int
+    ) -> list[Point]:
+        """Ближайшее к центру место без стен для стартовой змейки.
+
+        Сначала ищется строка, где перед головой есть ещё три свободные
+        клетки, затем — любой свободный отрезок из трёх клеток.
+        """
+
+        walls = self.config.walls
+        for ahead in (3, 0):
+            for offset in range(rows):
+                for y in (cy - offset, cy + offset):
+                    if not 0 <= y < rows:
+                        continue
+                    run = 0
+                    for x in range(cols):
+                        run = 0 if (x, y) in walls else run + 1
+                        if run == 3 + ahead:
+                            x -= ahead
+                            return [(x, y), (x - 1, y), (x - 2, y)]
+        raise ValueError("На поле нет места для стартовой змейки")
 
     def _apply_game_over(self) -> None:
         self.state.game_over = True
         self.state.paused = False
 
-    def _maybe_increase_speed(self, events: set[GameStepEvent]) -> None:
+    def _maybe_increase_speed(self, gained: int = 1) -> bool:
+        """Ускоряет игру на пороге очков; True, если скорость изменилась.
+
+        ``gained`` — очки за съеденную еду: бонусная еда может
+        перешагнуть порог, не попав на него точно.
+        """
+
         state = self.state
         if state.score <= 0:
-            return
-        if state.score % self.config.speed_increase_interval != 0:
-            return
+            return False
+        interval = self.config.speed_increase_interval
+        if state.score // interval == (state.score - gained) // interval:
+            return False
         state.speed += self.config.speed_increment
-        events.add(GameStepEvent.SPEED_CHANGED)
         state.speed_multiplier += 1
+        return True
+
+    def _spawn_food(self, state: SnakeGameState) -> bool:
+        """Ставит новую еду; False — поле заполнено и игра окончена."""
 
-    def _spawn_food(self, state: SnakeGameState) -> None:
-        food = self._random_empty_cell(state.cols, state.rows, state.snake)
+        food = self._random_empty_cell()
         if food is None:
             self._apply_game_over()
-            return
+            return False
         state.food = food
+        if self.config.food_mode is not None:
+            self._choose_food_type(state)
+        return True
+
+    def _choose_food_type(self, state: SnakeGameState) -> None:
+        """Выбирает тип новой еды и ставит срок особой еде."""
+
+        config = self.config
+        table = FOOD_TABLES[config.food_mode]  # type: ignore[index]
+        self._set_food_type(
+            state, table.choose(self._rng, state.speed_multiplier, state.score)
+        )
+
+    def _set_food_type(
+        self, state: SnakeGameState, food_type: FoodType
+    ) -> None:
+        state.food_type = food_type
+        effects = self._effects
+        effects.cancel(Effect.FOOD_EXPIRY)
+        ticks = self.config.special_food_ticks
+        if food_type is not FoodType.NORMAL and ticks > 0:
+            effects.start(Effect.FOOD_EXPIRY, ticks)
+
+    def _start_effect(self, effect: Effect, ticks: int | None = None) -> int:
+        """Включает эффект; возвращает биты событий (смена скорости)."""
+
+        config = self.config
+        if ticks is None:
+            ticks = (
+                config.speed_boost_ticks
+                if effect is Effect.SPEED_BOOST
+                else config.special_food_ticks
+                if effect is Effect.FOOD_EXPIRY
+                else config.shield_ticks
+            )
+        started = self._effects.start(effect, ticks)
+        if started and effect is Effect.SPEED_BOOST:
+            self.state.speed += config.speed_boost
+            return _SPEED_CHANGED
+        return 0
+
+    def _expire_effects(self, expired: tuple[Effect, ...]) -> int:
+        events = 0
+        for effect in expired:
+            if effect is Effect.SPEED_BOOST:
+                self.state.speed -= self.config.speed_boost
+                events |= _SPEED_CHANGED
+            elif effect is Effect.FOOD_EXPIRY:
+                self.state.food_type = FoodType.NORMAL
+        return events
+
+    def _collide(
+        self, events: int, refreshed: Point | None
+    ) -> GameStepResult:
+        """Столкновение: конец игры, а под щитом — тик без движения."""
+
+        if Effect.SHIELD in self._effects.active:
+            # Змейка стоит, пока игрок не свернёт или щит не истечёт
+            if refreshed is None:
+                return GameStepResult.cached(events)
+            diff = (
+                _EVENT_FLAGS[events], True, None, None, refreshed, refreshed
+            )
+            return _new_result(GameStepResult, diff)
+        self._apply_game_over()
+        if events == _MOVED:
+            return _CRASH_RESULT
+        return GameStepResult.cached(events | _GAME_OVER)
 
-    def _random_empty_cell(
-        self, cols: int, rows: int, snake: list[Point]
-    ) -> Point | None:
-        free_cells = [
-            (x, y)
-            for x in range(cols)
-            for y in range(rows)
-            if (x, y) not in snake
-        ]
-        if not free_cells:
+    def _random_empty_cell(self) -> Point | None:
+        self._rng_state = None
+        cell = self._free.choice(self._rng)
+        if cell is None:
             return None
-        return self._rng.choice(free_cells)
+        y, x = divmod(cell, self._indexed_cols)
+        return (x, y)
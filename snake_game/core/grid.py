@@ -0,0 +1,151 @@
+"""Индексы игрового поля, которые движок поддерживает инкрементально."""
+
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterable
+
+# Значения сетки занятости движка
+BODY = 1
+WALL = 2
+
+# Коды клеток в растре поля (render_into, буфер наблюдений VectorSnakeEngine)
+CELL_EMPTY = 0
+CELL_BODY = 1
+CELL_HEAD = 2
+CELL_FOOD = 3
+CELL_WALL = 4
+
+# Таблица bytes.translate: значение сетки занятости → код клетки растра
+RASTER_CODES = bytes(
+    {BODY: CELL_BODY, WALL: CELL_WALL}.get(value, CELL_EMPTY)
+    for value in range(256)
+)
+
+
+def wall_bitmap(
+    cols: int, rows: int, walls: Iterable[tuple[int, int]]
+) -> bytearray:
+    """Сетка занятости поля, на которой отмечены только стены (``WALL``).
+
+    Стены за пределами поля пропускаются.
+    """
+
+    bitmap = bytearray(cols * rows)
+    for x, y in walls:
+        if 0 <= x < cols and 0 <= y < rows:
+            bitmap[y * cols + x] = WALL
+    return bitmap
+
+
+class FreeCellSet:
+    """Множество свободных клеток с вставкой, удалением и выбором за O(1).
+
+    Клетки хранятся плотным массивом, а карта позиций позволяет удалять
+    клетку перестановкой с последним элементом. Клетка кодируется индексом
+    ``y * cols + x``.
+    """
+
+    __slots__ = ("_cells", "_positions")
+
+    def __init__(self, size: int) -> None:
+        self._cells = array("i")
+        self._positions = array("i", [-1]) * size
+
+    @classmethod
+    def from_board(
+        cls, cols: int, rows: int, occupied: bytearray
+    ) -> FreeCellSet:
+        """Собирает множество по сетке занятости.
+
+        Клетки перечисляются по столбцам, как и в прежнем полном переборе
+        поля, поэтому первая выборка с тем же ``rng_seed`` совпадает.
+        """
+
+        size = cols * rows
+        free = cls(size)
+        cells = array(
+            "i",
+            [
+                cell
+                for x in range(cols)
+                for cell in range(x, size, cols)
+                if not occupied[cell]
+            ],
+        )
+        positions = free._positions
+        for index, cell in enumerate(cells):
+            positions[cell] = index
+        free._cells = cells
+        return free
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def copy(self) -> FreeCellSet:
+        clone = FreeCellSet(0)
+        clone._cells = array("i", self._cells)
+        clone._positions = array("i", self._positions)
+        return clone
+
+    def dump(self, cells: array[int], positions: array[int]) -> None:
+        """Копирует внутренние массивы в переданные буферы."""
+
+        cells[:] = self._cells
+        positions[:] = self._positions
+
+    def load(self, cells: array[int], positions: array[int]) -> None:
+        """Восстанавливает множество из буферов, сохранённых ``dump``."""
+
+        self._cells[:] = cells
+        self._positions[:] = positions
+
+    def __contains__(self, cell: int) -> bool:
+        return self._positions[cell] >= 0
+
+    @property
+    def full(self) -> bool:
+        """True, если свободных клеток не осталось."""
+
+        return not self._cells
+
+    def add(self, cell: int) -> None:
+        positions = self._positions
+        if positions[cell] >= 0:
+            return
+        positions[cell] = len(self._cells)
+        self._cells.append(cell)
+
+    def discard(self, cell: int) -> None:
+        positions = self._positions
+        index = positions[cell]
+        if index < 0:
+            return
+        cells = self._cells
+        last = cells.pop()
+        if last != cell:
+            cells[index] = last
+            positions[last] = index
+        positions[cell] = -1
+
+    def choice(self, rng: random.Random) -> int | None:
+        """Случайная свободная клетка или None, если поле заполнено."""
+
+        if not self._cells:
+            return None
+        return rng.choice(self._cells)
+
+
+__all__ = [
+    "BODY",
+    "CELL_BODY",
+    "CELL_EMPTY",
+    "CELL_FOOD",
+    "CELL_HEAD",
+    "CELL_WALL",
+    "RASTER_CODES",
+    "WALL",
+    "FreeCellSet",
+    "wall_bitmap",
+]
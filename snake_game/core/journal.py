@@ -0,0 +1,82 @@
+"""Журнал изменений по тикам для отката игры назад."""
+
+from __future__ import annotations
+
+from array import array
+
+# Биты флагов записи: направление хода (0–1), направление до хода (2–3),
+# съедена еда, выросла скорость, тип съеденной еды (6–7)
+MOVE_MASK = 0b11
+PREVIOUS_SHIFT = 2
+EATEN = 1 << 4
+SPEED_CHANGED = 1 << 5
+FOOD_TYPE_SHIFT = 6
+
+NO_CELL = -1
+
+
+class DeltaJournal:
+    """Кольцо последних ``capacity`` тиков с движением.
+
+    Тик хранится разницей, а не копией состояния: новая голова,
+    снятый хвост (``NO_CELL``, если змейка выросла), прежняя клетка
+    еды (если её съели) и байт флагов с направлениями и типом еды —
+    13 байт на тик независимо от длины змейки. Заполненное кольцо
+    перезаписывает самые старые тики.
+    """
+
+    __slots__ = ("_flags", "_heads", "_tails", "_foods", "_end", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Журнал должен вмещать хотя бы один тик")
+        self._flags = bytearray(capacity)
+        self._heads = array("i", bytes(4 * capacity))
+        self._tails = array("i", bytes(4 * capacity))
+        self._foods = array("i", bytes(4 * capacity))
+        # Позиция следующей записи и число хранимых тиков
+        self._end = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._flags)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, flags: int, head: int, tail: int, food: int) -> None:
+        end = self._end
+        self._flags[end] = flags
+        self._heads[end] = head
+        self._tails[end] = tail
+        self._foods[end] = food
+        end += 1
+        capacity = len(self._flags)
+        self._end = 0 if end == capacity else end
+        if self._count < capacity:
+            self._count += 1
+
+    def pop(self) -> tuple[int, int, int, int]:
+        """Снимает последний тик: ``(flags, head, tail, food)``."""
+
+        if not self._count:
+            raise IndexError("pop from empty DeltaJournal")
+        end = self._end - 1
+        if end < 0:
+            end += len(self._flags)
+        self._end = end
+        self._count -= 1
+        return (
+            self._flags[end],
+            self._heads[end],
+            self._tails[end],
+            self._foods[end],
+        )
+
+    def clear(self) -> None:
+        self._end = 0
+        self._count = 0
+
+
+__all__ = ["DeltaJournal"]
@@ -0,0 +1,28 @@
+"""Пометки для необязательной сборки ядра mypyc (``build_mypyc.py``).
+
+Собранные модули лежат рядом с исходниками и загружаются вместо них;
+без сборки или на другой версии Python работает чистый Python. Без
+``mypy_extensions`` пометки ничего не делают.
+
+Собранный mypyc класс вызывает ``__init__`` прямо из ``__new__``.
+Классы, чей ``copy``/``fork`` создаёт экземпляр через ``__new__`` в
+обход ``__init__``, помечены ``allow_interpreted_subclasses=True``: с
+этой пометкой ``__new__`` ведёт себя как в Python.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from _typeshed import IdentityFunction
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # pragma: no cover - mypy_extensions нужен только mypyc
+
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> IdentityFunction:
+        return lambda cls: cls
+
+
+__all__ = ["mypyc_attr"]
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import MutableSequence
 from dataclasses import dataclass
 
+from .body import RingBody
 from .direction import Direction
+from .food import FoodType
 
 Point = tuple[int, int]
-SnakeBody = list[Point]
+# Список точек или компактный RingBody (SnakeGameConfig.compact_body)
+SnakeBody = MutableSequence[Point]
 
 
 @dataclass(slots=True)
@@ -22,6 +26,23 @@ class SnakeGameConfig:
     speed_increase_interval: int = 5
     wrap_edges: bool = False
     rng_seed: int | None = None
+    # Клетки-препятствия (режим «карта»). Движок строит по ним сетку
+    # занятости; клетки вне поля пропускаются.
+    walls: frozenset[Point] = frozenset()
+    # Хранить тело в RingBody (4 байта на сегмент) вместо списка кортежей
+    compact_body: bool = False
+    # Сколько поворотов ждёт своего тика. Быстрые нажатия внутри одного
+    # тика (крутой разворот «вверх, влево») применяются по очереди;
+    # 1 — прежнее поведение, последнее нажатие за тик побеждает.
+    input_queue_size: int = 3
+    # Режим особой еды (ключ FOOD_TABLES). None — классика: вся еда
+    # обычная, эффектов нет. Длительности эффектов — в тиках.
+    food_mode: str | None = None
+    speed_boost: float = 5.0
+    speed_boost_ticks: int = 50
+    shield_ticks: int = 60
+    # Через сколько тиков особая еда становится обычной; 0 — никогда
+    special_food_ticks: int = 70
 
     def with_board(self, cols: int, rows: int) -> SnakeGameConfig:
         return SnakeGameConfig(
@@ -33,6 +54,16 @@ class SnakeGameConfig:
             speed_increase_interval=self.speed_increase_interval,
             wrap_edges=self.wrap_edges,
             rng_seed=self.rng_seed,
+            # Стены за пределами поля не удаляем: при обратном
+            # увеличении поля они вернутся
+            walls=self.walls,
+            compact_body=self.compact_body,
+            input_queue_size=self.input_queue_size,
+            food_mode=self.food_mode,
+            speed_boost=self.speed_boost,
+            speed_boost_ticks=self.speed_boost_ticks,
+            shield_ticks=self.shield_ticks,
+            special_food_ticks=self.special_food_ticks,
         )
 
 
@@ -54,6 +85,7 @@ class SnakeGameState:
     steps: int = 0
     level_threshold: int = 5
     speed_multiplier: int = 1
+    food_type: FoodType = FoodType.NORMAL
 
     def head(self) -> Point:
         return self.snake[0]
@@ -63,7 +95,11 @@ class SnakeGameState:
             cols=self.cols,
             rows=self.rows,
             cell_size=self.cell_size,
-            snake=[(x, y) for (x, y) in self.snake],
+            snake=(
+                self.snake.copy()
+                if isinstance(self.snake, RingBody)
+                else list(self.snake)
+            ),
             direction=self.direction,
             pending_direction=self.pending_direction,
             food=self.food,
@@ -74,4 +110,5 @@ class SnakeGameState:
             steps=self.steps,
             level_threshold=self.level_threshold,
             speed_multiplier=self.speed_multiplier,
+            food_type=self.food_type,
         )
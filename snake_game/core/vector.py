@@ -0,0 +1,289 @@
+"""Пакетный движок: множество независимых полей в массивах NumPy."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from .direction import Direction
+from .events import GameStepEvent
+from .grid import (
+    CELL_BODY,
+    CELL_EMPTY,
+    CELL_FOOD,
+    CELL_HEAD,
+    CELL_WALL,
+    wall_bitmap,
+)
+from .state import SnakeGameConfig
+
+# Действие «не менять направление»
+NO_ACTION = -1
+
+DIRECTIONS: tuple[Direction, ...] = tuple(Direction)
+_DX = np.array([direction.dx for direction in DIRECTIONS], dtype=np.int64)
+_DY = np.array([direction.dy for direction in DIRECTIONS], dtype=np.int64)
+_OPPOSITE = np.array(
+    [
+        DIRECTIONS.index(Direction.from_tuple((-d.dx, -d.dy)))
+        for d in DIRECTIONS
+    ],
+    dtype=np.int64,
+)
+
+_MOVED = GameStepEvent.MOVED.mask
+_FOOD_EATEN = GameStepEvent.FOOD_EATEN.mask
+_SPEED_CHANGED = GameStepEvent.SPEED_CHANGED.mask
+_GAME_OVER = GameStepEvent.GAME_OVER.mask
+
+# Сколько раундов случайных проб делать до полного перебора поля
+_FOOD_PROBES = 8
+
+
+@dataclass(frozen=True, slots=True)
+class VectorStepResult:
+    """Результат пакетного шага.
+
+    Массивы принадлежат движку и перезаписываются следующим шагом.
+    """
+
+    rewards: npt.NDArray[np.float32]
+    events: npt.NDArray[np.uint8]
+    dones: npt.NDArray[np.bool_]
+
+
+class VectorSnakeEngine:
+    """Движок, ведущий N полей одного размера и шагающий их одним вызовом.
+
+    Правила совпадают с :class:`SnakeGameEngine`: края поля (или перенос
+    через край при ``wrap_edges``), стены из ``config.walls``, столкновение
+    с собой, еда и ускорение каждые
+    ``speed_increase_interval`` очков. Направления кодируются индексом в
+    :data:`DIRECTIONS`, ``NO_ACTION`` оставляет текущее направление.
+    """
+
+    def __init__(
+        self,
+        config: SnakeGameConfig,
+        num_boards: int,
+        *,
+        auto_reset: bool = True,
+    ) -> None:
+        if num_boards <= 0:
+            raise ValueError("Количество полей должно быть положительным")
+        if config.cols < 4 or config.rows <= 0:
+            raise ValueError("Поле слишком мало для стартовой змейки")
+        self.config = config
+        self.auto_reset = auto_reset
+        self._rng = np.random.default_rng(config.rng_seed)
+
+        cols = config.cols
+        rows = config.rows
+        cells = cols * rows
+        self._cells = cells
+        self._boards = np.arange(num_boards)
+        # Пустое поле со стенами: им заполняются поля при перезапуске
+        walls = np.frombuffer(wall_bitmap(cols, rows, config.walls), np.uint8)
+        self._empty_board = np.where(walls != 0, CELL_WALL, CELL_EMPTY).astype(
+            np.uint8
+        )
+        # Стартовая голова — как в SnakeGameEngine: строка в пределах поля
+        # и при rows == 1
+        cy = min(max(rows // 2, 1), rows - 1)
+        head = self._start_head = cy * cols + cols // 2
+        if self._empty_board[head - 2 : head + 1].any():
+            raise ValueError("Стартовая змейка пересекает стену")
+
+        # Буфер наблюдений (N, rows, cols); _grid — его плоское представление
+        self.observations = np.zeros((num_boards, rows, cols), dtype=np.uint8)
+        self._grid = self.observations.reshape(num_boards, cells)
+        # Кольцевые буферы тела: индексы клеток, голова в позиции _head_ptr
+        self._body = np.zeros((num_boards, cells), dtype=np.int64)
+        self._head_ptr = np.zeros(num_boards, dtype=np.int64)
+        self.lengths = np.zeros(num_boards, dtype=np.int64)
+        self.directions = np.zeros(num_boards, dtype=np.int64)
+        self.food = np.zeros(num_boards, dtype=np.int64)
+        self.scores = np.zeros(num_boards, dtype=np.int64)
+        self.speeds = np.zeros(num_boards, dtype=np.float64)
+        self.steps = np.zeros(num_boards, dtype=np.int64)
+        self.game_over = np.zeros(num_boards, dtype=np.bool_)
+
+        self._rewards = np.zeros(num_boards, dtype=np.float32)
+        self._events = np.zeros(num_boards, dtype=np.uint8)
+        self._dones = np.zeros(num_boards, dtype=np.bool_)
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Свойства
+    # ------------------------------------------------------------------
+    @property
+    def num_boards(self) -> int:
+        return len(self._boards)
+
+    # ------------------------------------------------------------------
+    # Управление
+    # ------------------------------------------------------------------
+    def reset(self, boards: npt.ArrayLike | None = None) -> None:
+        """Перезапускает все поля или только перечисленные."""
+
+        if boards is None:
+            selected = self._boards
+        else:
+            selected = np.asarray(boards, dtype=np.int64)
+        if not len(selected):
+            return
+
+        head = self._start_head
+        self._grid[selected] = self._empty_board
+        body = self._body
+        body[selected, 0] = head - 2
+        body[selected, 1] = head - 1
+        body[selected, 2] = head
+        self._grid[selected, head - 2] = CELL_BODY
+        self._grid[selected, head - 1] = CELL_BODY
+        self._grid[selected, head] = CELL_HEAD
+        self._head_ptr[selected] = 2
+        self.lengths[selected] = 3
+        self.directions[selected] = DIRECTIONS.index(Direction.RIGHT)
+        self.scores[selected] = 0
+        self.speeds[selected] = self.config.initial_speed
+        self.steps[selected] = 0
+        self.game_over[selected] = False
+        full = self._place_food(selected)
+        self.game_over[full] = True
+
+    def step(self, actions: npt.ArrayLike) -> VectorStepResult:
+        """Делает один шаг на всех полях.
+
+        ``actions`` — массив длины N с индексами направлений или
+        ``NO_ACTION``. Поля, закончившие игру, при ``auto_reset``
+        перезапускаются сразу, и наблюдение показывает новый эпизод.
+        """
+
+        config = self.config
+        cols = config.cols
+        rows = config.rows
+        cells = self._cells
+        grid = self._grid
+        rewards = self._rewards
+        events = self._events
+        dones = self._dones
+        rewards.fill(0.0)
+        events.fill(0)
+        dones.fill(False)
+
+        active = np.flatnonzero(~self.game_over)
+        if not len(active):
+            return VectorStepResult(rewards, events, dones)
+
+        # Смена направления по правилам SnakeGameEngine.set_direction
+        act = np.asarray(actions, dtype=np.int64)[active]
+        current = self.directions[active]
+        wanted = np.where(act >= 0, act, current)
+        reverse = (_OPPOSITE[wanted] == current) & (self.lengths[active] > 1)
+        direction = np.where(reverse, current, wanted)
+        self.directions[active] = direction
+
+        head_ptr = self._head_ptr[active]
+        head = self._body[active, head_ptr]
+        next_x = head % cols + _DX[direction]
+        next_y = head // cols + _DY[direction]
+        if config.wrap_edges:
+            next_x %= cols
+            next_y %= rows
+            outside = np.zeros(len(active), dtype=np.bool_)
+        else:
+            outside = (next_x < 0) | (next_x >= cols)
+            outside |= (next_y < 0) | (next_y >= rows)
+        next_cell = np.where(outside, 0, next_y * cols + next_x)
+        target = grid[active, next_cell]
+
+        # Хвост ещё не сдвинут, поэтому он тоже считается занятым
+        crashed = outside | ((target != CELL_EMPTY) & (target != CELL_FOOD))
+        events[active] = _MOVED
+        dead = active[crashed]
+        events[dead] |= _GAME_OVER
+        rewards[dead] = -1.0
+        self.game_over[dead] = True
+
+        alive = ~crashed
+        moved = active[alive]
+        moved_head = head[alive]
+        moved_cell = next_cell[alive]
+        ate = target[alive] == CELL_FOOD
+
+        grid[moved, moved_head] = CELL_BODY
+        new_ptr = (head_ptr[alive] + 1) % cells
+        self._body[moved, new_ptr] = moved_cell
+        self._head_ptr[moved] = new_ptr
+        grid[moved, moved_cell] = CELL_HEAD
+
+        starving = moved[~ate]
+        tail_ptr = (new_ptr[~ate] - self.lengths[starving]) % cells
+        grid[starving, self._body[starving, tail_ptr]] = CELL_EMPTY
+
+        eaters = moved[ate]
+        self.lengths[eaters] += 1
+        self.scores[eaters] += 1
+        rewards[eaters] = 1.0
+        events[eaters] |= _FOOD_EATEN
+        interval = config.speed_increase_interval
+        levelled = eaters[self.scores[eaters] % interval == 0]
+        self.speeds[levelled] += config.speed_increment
+        events[levelled] |= _SPEED_CHANGED
+        full = self._place_food(eaters)
+        events[full] |= _GAME_OVER
+        self.game_over[full] = True
+
+        self.steps[moved] += 1
+        dones[self.game_over] = True
+        if self.auto_reset:
+            self.reset(np.flatnonzero(dones))
+        return VectorStepResult(rewards, events, dones)
+
+    # ------------------------------------------------------------------
+    # Внутренняя логика
+    # ------------------------------------------------------------------
+    def _place_food(
+        self, boards: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.int64]:
+        """Ставит еду на поля; возвращает поля без свободных клеток."""
+
+        grid = self._grid
+        pending = boards
+        for _ in range(_FOOD_PROBES):
+            if not len(pending):
+                return pending
+            candidates = self._rng.integers(0, self._cells, size=len(pending))
+            free = grid[pending, candidates] == CELL_EMPTY
+            placed = pending[free]
+            self.food[placed] = candidates[free]
+            grid[placed, candidates[free]] = CELL_FOOD
+            pending = pending[~free]
+
+        # Почти заполненные поля: выбираем среди оставшихся свободных клеток
+        full = []
+        for board in pending:
+            free_cells = np.flatnonzero(grid[board] == CELL_EMPTY)
+            if not len(free_cells):
+                full.append(board)
+                continue
+            cell = free_cells[self._rng.integers(len(free_cells))]
+            self.food[board] = cell
+            grid[board, cell] = CELL_FOOD
+        return np.asarray(full, dtype=np.int64)
+
+
+__all__ = [
+    "CELL_BODY",
+    "CELL_EMPTY",
+    "CELL_FOOD",
+    "CELL_HEAD",
+    "CELL_WALL",
+    "DIRECTIONS",
+    "NO_ACTION",
+    "VectorSnakeEngine",
+    "VectorStepResult",
+]
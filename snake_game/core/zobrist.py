@@ -0,0 +1,57 @@
+"""Ключи Zobrist-хеша позиции: тело, голова, еда и направление."""
+
+from __future__ import annotations
+
+import random
+from array import array
+from functools import lru_cache
+
+from .direction import Direction
+
+# Ключи одинаковы во всех процессах: хеши можно сравнивать между ботами
+_SEED = 0x5EED_2B1D
+
+
+class ZobristKeys:
+    """Случайные 64-битные ключи для поля из ``cells`` клеток.
+
+    Хеш позиции — XOR ключей ``body`` всех клеток тела, ключа ``head``
+    клетки головы, ключа ``food`` клетки еды и ключа направления. Ход
+    меняет лишь несколько слагаемых, поэтому хеш обновляется за O(1).
+    """
+
+    __slots__ = ("body", "head", "food", "directions")
+
+    def __init__(self, cells: int) -> None:
+        rng = random.Random(_SEED)  # noqa: B311,S311  # nosec
+        self.body = _keys(rng, cells)
+        self.head = _keys(rng, cells)
+        self.food = _keys(rng, cells)
+        self.directions = {
+            direction: rng.getrandbits(64) for direction in Direction
+        }
+
+    def body_hash(self, cells: list[int]) -> int:
+        """Хеш тела по клеткам от головы к хвосту."""
+
+        body = self.body
+        value = self.head[cells[0]] if cells else 0
+        for cell in cells:
+            value ^= body[cell]
+        return value
+
+
+def _keys(rng: random.Random, count: int) -> array[int]:
+    keys = array("Q")
+    keys.frombytes(rng.randbytes(8 * count))
+    return keys
+
+
+@lru_cache(maxsize=8)
+def zobrist_keys(cells: int) -> ZobristKeys:
+    """Общие ключи для поля из ``cells`` клеток."""
+
+    return ZobristKeys(cells)
+
+
+__all__ = ["ZobristKeys", "zobrist_keys"]
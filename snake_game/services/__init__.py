@@ -1,6 +1,21 @@
 """Инфраструктурные сервисы (звук, игровые сессии и др.)."""
 
 from .audio import SoundManager
-from .session import SnakeSession
+from .bus import EventBus, SessionEvent
+from .metrics import LatencyHistogram, StepRecorder
+from .replay import Replay, ReplayRecorder, verify_many, verify_replay
+from .session import SnakeSession, StepTiming
 
-__all__ = ["SoundManager", "SnakeSession"]
+__all__ = [
+    "EventBus",
+    "LatencyHistogram",
+    "Replay",
+    "ReplayRecorder",
+    "SessionEvent",
+    "SnakeSession",
+    "SoundManager",
+    "StepRecorder",
+    "StepTiming",
+    "verify_many",
+    "verify_replay",
+]
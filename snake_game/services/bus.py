@@ -0,0 +1,114 @@
+"""Шина событий игровой сессии: подписка на события тика и команды.
+
+Подписчик указывает маску интересующих событий и вызывается не больше
+одного раза за тик, со всем результатом шага, — события тика
+рассылаются одной пачкой. Для каждой комбинации битов заранее собран
+кортеж подписчиков, поэтому рассылка — одно обращение по индексу и
+обход готового кортежа: если на события тика никто не подписан, она
+ничего не выделяет.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import IntFlag, auto
+
+from ..core import GameStepEvent, GameStepResult
+
+
+class SessionEvent(IntFlag):
+    """Изменения сессии вне тика движка."""
+
+    PAUSED = auto()
+    RESUMED = auto()
+    RESTARTED = auto()
+
+
+StepHandler = Callable[[GameStepResult], None]
+SessionHandler = Callable[[SessionEvent], None]
+
+_Subscriber = tuple[int, Callable[..., None]]
+
+
+class EventBus:
+    """Типизированная шина публикации и подписки.
+
+    ``subscribe`` — события тика (биты :class:`GameStepEvent`),
+    ``subscribe_session`` — :class:`SessionEvent`. Обработчики одной
+    рассылки вызываются в порядке подписки.
+    """
+
+    __slots__ = (
+        "_step_subscribers",
+        "_session_subscribers",
+        "_step_table",
+        "_session_table",
+    )
+
+    def __init__(self) -> None:
+        self._step_subscribers: list[_Subscriber] = []
+        self._session_subscribers: list[_Subscriber] = []
+        self._step_table: list[tuple[StepHandler, ...]] = _build_table(
+            [], len(GameStepEvent)
+        )
+        self._session_table: list[tuple[SessionHandler, ...]] = (
+            _build_table([], len(SessionEvent))
+        )
+
+    def subscribe(
+        self, events: GameStepEvent, handler: StepHandler
+    ) -> None:
+        """Вызывать ``handler(result)`` на тиках с любым из ``events``."""
+
+        self._step_subscribers.append((int(events), handler))
+        self._step_table = _build_table(
+            self._step_subscribers, len(GameStepEvent)
+        )
+
+    def subscribe_session(
+        self, events: SessionEvent, handler: SessionHandler
+    ) -> None:
+        """Вызывать ``handler(event)`` на изменениях сессии из ``events``."""
+
+        self._session_subscribers.append((int(events), handler))
+        self._session_table = _build_table(
+            self._session_subscribers, len(SessionEvent)
+        )
+
+    def unsubscribe(self, handler: StepHandler | SessionHandler) -> None:
+        """Снимает все подписки обработчика; неизвестный игнорируется."""
+
+        self._step_subscribers = [
+            s for s in self._step_subscribers if s[1] != handler
+        ]
+        self._session_subscribers = [
+            s for s in self._session_subscribers if s[1] != handler
+        ]
+        self._step_table = _build_table(
+            self._step_subscribers, len(GameStepEvent)
+        )
+        self._session_table = _build_table(
+            self._session_subscribers, len(SessionEvent)
+        )
+
+    def publish(self, result: GameStepResult) -> None:
+        for handler in self._step_table[result.events]:
+            handler(result)
+
+    def publish_session(self, event: SessionEvent) -> None:
+        for handler in self._session_table[event]:
+            handler(event)
+
+
+def _build_table(
+    subscribers: list[_Subscriber], bits: int
+) -> list[tuple[Callable[..., None], ...]]:
+    """Кортеж подписчиков для каждой маски событий."""
+
+    return [
+        tuple(handler for events, handler in subscribers if events & mask)
+        for mask in range(1 << bits)
+    ]
+
+
+__all__ = ["EventBus", "SessionEvent", "SessionHandler", "StepHandler"]
@@ -0,0 +1,324 @@
+"""Запись и проверка детерминированных повторов игровой сессии.
+
+Повтор хранит конфигурацию (включая ``rng_seed``) и все команды игрока с
+номером тика, на котором они поступили. Движок детерминирован, поэтому
+для проверки счёта достаточно заново прогнать игру без UI.
+
+Формат (все целые — беззнаковые varint)::
+
+    b"SNR1"
+    cols rows cell_size speed_increase_interval wrap_edges rng_seed
+    <initial_speed: float64 LE> <speed_increment: float64 LE>
+    wall_count wall_count × (x y)
+    input_queue_size
+    food_mode_length <food_mode: UTF-8> <speed_boost: float64 LE>
+    speed_boost_ticks shield_ticks special_food_ticks
+    ticks score game_over
+    count
+    count × (delta_tick << 3 | code) [cols rows, если code == RESIZE]
+
+``delta_tick`` — разница с тиком предыдущей команды, ``code`` 0–3 —
+индекс направления в ``Direction``. Пустой ``food_mode`` — классика
+без особой еды.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from ..core import Direction, SnakeGameConfig
+
+MAGIC = b"SNR1"
+
+DIRECTIONS: tuple[Direction, ...] = tuple(Direction)
+_DIRECTION_CODES = {
+    direction: code for code, direction in enumerate(DIRECTIONS)
+}
+RESIZE = 4
+_CODE_BITS = 3
+
+_FLOATS = struct.Struct("<dd")
+_FLOAT = struct.Struct("<d")
+
+
+class ReplayFormatError(ValueError):
+    """Повреждённые или несовместимые данные повтора."""
+
+
+@dataclass(slots=True)
+class Replay:
+    """Повтор одной игры: конфигурация, команды и итог."""
+
+    config: SnakeGameConfig
+    # Пары (тик, код команды); для RESIZE дополнительно размеры поля
+    inputs: list[tuple[int, int]] = field(default_factory=list)
+    resizes: list[tuple[int, int]] = field(default_factory=list)
+    ticks: int = 0
+    score: int = 0
+    game_over: bool = False
+
+    def to_bytes(self) -> bytes:
+        config = self.config
+        if config.rng_seed is None or config.rng_seed < 0:
+            raise ValueError("Повтор требует неотрицательный rng_seed")
+        out = bytearray(MAGIC)
+        for value in (
+            config.cols,
+            config.rows,
+            config.cell_size,
+            config.speed_increase_interval,
+            int(config.wrap_edges),
+            config.rng_seed,
+        ):
+            _write_varint(out, value)
+        out += _FLOATS.pack(config.initial_speed, config.speed_increment)
+        _write_varint(out, len(config.walls))
+        for x, y in sorted(config.walls):
+            _write_varint(out, x)
+            _write_varint(out, y)
+        _write_varint(out, config.input_queue_size)
+        food_mode = (config.food_mode or "").encode()
+        _write_varint(out, len(food_mode))
+        out += food_mode
+        out += _FLOAT.pack(config.speed_boost)
+        _write_varint(out, config.speed_boost_ticks)
+        _write_varint(out, config.shield_ticks)
+        _write_varint(out, config.special_food_ticks)
+        _write_varint(out, self.ticks)
+        _write_varint(out, self.score)
+        _write_varint(out, int(self.game_over))
+        _write_varint(out, len(self.inputs))
+        previous = 0
+        resizes = iter(self.resizes)
+        for tick, code in self.inputs:
+            _write_varint(out, (tick - previous) << _CODE_BITS | code)
+            previous = tick
+            if code == RESIZE:
+                cols, rows = next(resizes)
+                _write_varint(out, cols)
+                _write_varint(out, rows)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Replay:
+        if data[: len(MAGIC)] != MAGIC:
+            raise ReplayFormatError("Неизвестный формат повтора")
+        reader = _VarintReader(data, len(MAGIC))
+        cols, rows, cell_size, interval, wrap, seed = (
+            reader.read() for _ in range(6)
+        )
+        initial_speed, speed_increment = reader.read_floats()
+        walls = frozenset(
+            (reader.read(), reader.read()) for _ in range(reader.read())
+        )
+        input_queue_size = reader.read()
+        try:
+            food_mode = reader.read_bytes(reader.read()).decode()
+        except UnicodeDecodeError as exc:
+            raise ReplayFormatError("Повреждён режим еды") from exc
+        (speed_boost,) = reader.read_struct(_FLOAT)
+        config = SnakeGameConfig(
+            cols=cols,
+            rows=rows,
+            cell_size=cell_size,
+            initial_speed=initial_speed,
+            speed_increment=speed_increment,
+            speed_increase_interval=interval,
+            wrap_edges=bool(wrap),
+            rng_seed=seed,
+            walls=walls,
+            input_queue_size=input_queue_size,
+            food_mode=food_mode or None,
+            speed_boost=speed_boost,
+            speed_boost_ticks=reader.read(),
+            shield_ticks=reader.read(),
+            special_food_ticks=reader.read(),
+        )
+        replay = cls(config)
+        replay.ticks = reader.read()
+        replay.score = reader.read()
+        replay.game_over = bool(reader.read())
+        tick = 0
+        for _ in range(reader.read()):
+            packed = reader.read()
+            tick += packed >> _CODE_BITS
+            code = packed & ((1 << _CODE_BITS) - 1)
+            if code > RESIZE:
+                raise ReplayFormatError(f"Неизвестная команда: {code}")
+            replay.inputs.append((tick, code))
+            if code == RESIZE:
+                replay.resizes.append((reader.read(), reader.read()))
+        return replay
+
+
+class ReplayRecorder:
+    """Накапливает команды сессии для последующей проверки."""
+
+    __slots__ = ("_replay", "tick")
+
+    def __init__(self, config: SnakeGameConfig) -> None:
+        self._replay = Replay(config)
+        self.tick = 0
+
+    def start(self, config: SnakeGameConfig) -> None:
+        """Начинает новую запись (после перезапуска игры)."""
+
+        self._replay = Replay(config)
+        self.tick = 0
+
+    def on_step(self, _result: object) -> None:
+        """Подписчик шины сессии: считает тики с движением."""
+
+        self.tick += 1
+
+    def record_direction(self, direction: Direction) -> None:
+        self._replay.inputs.append((self.tick, _DIRECTION_CODES[direction]))
+
+    def record_resize(self, cols: int, rows: int) -> None:
+        self._replay.inputs.append((self.tick, RESIZE))
+        self._replay.resizes.append((cols, rows))
+
+    def finish(self, score: int, game_over: bool) -> Replay:
+        """Возвращает копию текущей записи с итоговым счётом."""
+
+        replay = self._replay
+        return Replay(
+            config=replay.config,
+            inputs=list(replay.inputs),
+            resizes=list(replay.resizes),
+            ticks=self.tick,
+            score=score,
+            game_over=game_over,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayVerdict:
+    """Результат проверки повтора."""
+
+    ok: bool
+    expected_score: int
+    actual_score: int
+    expected_ticks: int
+    actual_ticks: int
+
+
+def verify_replay(replay: Replay | bytes) -> ReplayVerdict:
+    """Прогоняет повтор без UI и сравнивает итог с записанным.
+
+    Тики между командами проходят через ``SnakeGameEngine.run``, поэтому
+    проверка не создаёт объектов на каждом тике.
+    """
+
+    from .session import SnakeSession
+
+    if isinstance(replay, bytes | bytearray | memoryview):
+        replay = Replay.from_bytes(bytes(replay))
+    session = SnakeSession(replay.config)
+    engine = session.engine
+    resizes = iter(replay.resizes)
+    tick = 0
+    for input_tick, code in replay.inputs:
+        if input_tick > replay.ticks:
+            break
+        if input_tick > tick:
+            tick += engine.run(input_tick - tick).ticks
+            if engine.state.game_over:
+                break
+        if code == RESIZE:
+            session.resize_board(*next(resizes))
+        else:
+            session.set_direction(DIRECTIONS[code])
+    if not engine.state.game_over and tick < replay.ticks:
+        tick += engine.run(replay.ticks - tick).ticks
+
+    state = engine.state
+    ok = (
+        tick == replay.ticks
+        and state.score == replay.score
+        and state.game_over == replay.game_over
+    )
+    return ReplayVerdict(ok, replay.score, state.score, replay.ticks, tick)
+
+
+def verify_many(
+    replays: Iterable[Replay | bytes],
+    *,
+    processes: int | None = None,
+    chunksize: int = 64,
+) -> list[ReplayVerdict]:
+    """Проверяет пачку повторов, распределяя их по пулу процессов.
+
+    ``processes=1`` проверяет всё в текущем процессе.
+    """
+
+    if processes == 1:
+        return [verify_replay(replay) for replay in replays]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(verify_replay, replays, chunksize=chunksize))
+
+
+# ----------------------------------------------------------------------
+# Varint
+# ----------------------------------------------------------------------
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("varint не поддерживает отрицательные значения")
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _VarintReader:
+    __slots__ = ("_data", "_offset")
+
+    def __init__(self, data: bytes, offset: int) -> None:
+        self._data = data
+        self._offset = offset
+
+    def read(self) -> int:
+        data = self._data
+        result = 0
+        shift = 0
+        while True:
+            if self._offset >= len(data):
+                raise ReplayFormatError("Неожиданный конец данных повтора")
+            byte = data[self._offset]
+            self._offset += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read_floats(self) -> tuple[float, float]:
+        return self.read_struct(_FLOATS)  # type: ignore[return-value]
+
+    def read_struct(self, layout: struct.Struct) -> tuple[float, ...]:
+        end = self._offset + layout.size
+        if end > len(self._data):
+            raise ReplayFormatError("Неожиданный конец данных повтора")
+        values = layout.unpack_from(self._data, self._offset)
+        self._offset = end
+        return values
+
+    def read_bytes(self, size: int) -> bytes:
+        end = self._offset + size
+        if end > len(self._data):
+            raise ReplayFormatError("Неожиданный конец данных повтора")
+        value = self._data[self._offset : end]
+        self._offset = end
+        return value
+
+
+__all__ = [
+    "Replay",
+    "ReplayFormatError",
+    "ReplayRecorder",
+    "ReplayVerdict",
+    "verify_many",
+    "verify_replay",
+]
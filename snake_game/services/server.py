@@ -0,0 +1,379 @@
+"""Асинхронный сервер игровых сессий для веб- и тонких клиентов.
+
+Один цикл asyncio ведёт тысячи :class:`SnakeSession`, каждую со своим
+``tick_interval``. Вместо таймера на сессию все сессии стоят на общем
+колесе таймеров (:class:`~snake_game.core.effects.TimerWheel`) с шагом
+``resolution``: единственный таймер цикла сдвигает колесо и шагает
+сессии, чей тик наступил. Срок сессии хранится дробным числом шагов
+колеса, поэтому средний темп равен ``1 / tick_interval``, а отдельный
+тик сдвигается не больше чем на половину шага.
+
+Клиенты подключаются по TCP или Unix-сокету; протокол — строки UTF-8,
+одна сессия на соединение. Клиент → сервер::
+
+    START [cols rows [seed]]    начать игру (повторный START — новая)
+    TURN UP|DOWN|LEFT|RIGHT
+    PAUSE                       пауза или продолжение
+    RESTART
+    STATS [RESET]               статистика сервера; RESET обнуляет
+                                гистограмму опоздания после ответа
+    QUIT
+
+Сервер → клиент::
+
+    STARTED <cols> <rows> <speed>
+    T <steps> <events> <score> <speed> <head_x> <head_y> <food_x> <food_y>
+    STATS key=value ...
+    ERR <описание>
+
+Строка ``T`` приходит на каждом тике с событиями; ``events`` — маска
+``GameStepEvent``. После конца игры тики останавливаются до RESTART.
+Клиент, который не успевает читать, отключается. Запуск::
+
+    python -m snake_game.services.server --tcp 127.0.0.1:8765
+    python -m snake_game.services.server --unix /tmp/snake.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import time
+from dataclasses import replace
+
+from ..core import Direction, SnakeGameConfig
+from ..core.effects import TimerWheel
+from .metrics import LatencyHistogram
+from .session import SnakeSession
+
+# Поле по умолчанию и допустимые размеры поля в START
+DEFAULT_CONFIG = SnakeGameConfig(cols=20, rows=20)
+MIN_BOARD = 5
+MAX_BOARD = 256
+
+# Сколько байт может ждать отправки клиенту, прежде чем его отключат
+MAX_BUFFERED = 64 * 1024
+
+
+class _HostedSession:
+    """Сессия на сервере: соединение, таймер и дробный срок тика."""
+
+    __slots__ = ("session", "writer", "timer", "due")
+
+    def __init__(
+        self, session: SnakeSession, writer: asyncio.StreamWriter
+    ) -> None:
+        self.session = session
+        self.writer = writer
+        # id таймера на колесе; None — сессия не тикает
+        self.timer: int | None = None
+        # Срок следующего тика в шагах колеса
+        self.due = 0.0
+
+
+class SessionServer:
+    """Хост игровых сессий на одном цикле asyncio.
+
+    ``resolution`` — шаг колеса в секундах, ``wheel_size`` — число его
+    ячеек (интервалы длиннее оборота колеса тоже работают). Опоздание
+    сдвигов колеса против расписания копится в гистограмме ``lateness``
+    (наносекунды).
+    """
+
+    def __init__(
+        self,
+        config: SnakeGameConfig = DEFAULT_CONFIG,
+        *,
+        resolution: float = 0.005,
+        wheel_size: int = 1024,
+        max_sessions: int | None = None,
+    ) -> None:
+        if resolution <= 0:
+            raise ValueError("Шаг колеса должен быть положительным")
+        self.config = config
+        self.resolution = resolution
+        self.max_sessions = max_sessions
+        self.lateness = LatencyHistogram()
+        self.ticks = 0
+        self._wheel: TimerWheel[_HostedSession] = TimerWheel(wheel_size)
+        self._sessions: set[_HostedSession] = set()
+        self._servers: list[asyncio.Server] = []
+        self._clock: asyncio.Task[None] | None = None
+        self._started_at = 0.0
+        self._cpu_at_start = 0.0
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    # ------------------------------------------------------------------
+    # Запуск и остановка
+    # ------------------------------------------------------------------
+    async def start_tcp(self, host: str, port: int) -> asyncio.Server:
+        server = await asyncio.start_server(self._serve_client, host, port)
+        return self._listen(server)
+
+    async def start_unix(self, path: str) -> asyncio.Server:
+        server = await asyncio.start_unix_server(self._serve_client, path)
+        return self._listen(server)
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+        for hosted in list(self._sessions):
+            self._drop(hosted)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        if self._clock is not None:
+            self._clock.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._clock
+            self._clock = None
+
+    def stats(self) -> dict[str, float]:
+        """Сессии, тики, время процессора и опоздание колеса в мкс."""
+
+        lateness = self.lateness
+        return {
+            "sessions": len(self._sessions),
+            "ticks": self.ticks,
+            "cpu": round(time.process_time() - self._cpu_at_start, 3),
+            "wall": round(time.perf_counter() - self._started_at, 3),
+            "late_p50_us": lateness.percentile(50) / 1000,
+            "late_p99_us": lateness.percentile(99) / 1000,
+            "late_max_us": lateness.max / 1000,
+        }
+
+    def _listen(self, server: asyncio.Server) -> asyncio.Server:
+        self._servers.append(server)
+        if self._clock is None:
+            self._started_at = time.perf_counter()
+            self._cpu_at_start = time.process_time()
+            self._clock = asyncio.get_running_loop().create_task(
+                self._run_clock()
+            )
+        return server
+
+    # ------------------------------------------------------------------
+    # Колесо тиков
+    # ------------------------------------------------------------------
+    async def _run_clock(self) -> None:
+        loop = asyncio.get_running_loop()
+        wheel = self._wheel
+        resolution = self.resolution
+        start = loop.time() - wheel.now * resolution
+        record = self.lateness.record
+        while True:
+            target = start + (wheel.now + 1) * resolution
+            delay = target - loop.time()
+            # Отстав, всё равно отдаём управление: иначе догоняющие
+            # сдвиги не дадут прочитать ввод клиентов
+            await asyncio.sleep(max(delay, 0.0))
+            record(int((loop.time() - target) * 1e9))
+            self._advance()
+
+    def _advance(self) -> None:
+        """Сдвигает колесо на шаг и шагает сессии, чей тик наступил."""
+
+        for hosted in self._wheel.advance():
+            hosted.timer = None
+            self._tick(hosted)
+
+    def _tick(self, hosted: _HostedSession) -> None:
+        session = hosted.session
+        result = session.step()
+        self.ticks += 1
+        if result.events:
+            state = session.state
+            head_x, head_y = state.snake[0]
+            food_x, food_y = state.food
+            writer = hosted.writer
+            writer.write(
+                f"T {state.steps} {result.events.mask} {state.score} "
+                f"{state.speed:g} {head_x} {head_y} {food_x} {food_y}\n"
+                .encode()
+            )
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                # Клиент не читает: не копим для него память
+                self._drop(hosted)
+                return
+        if session.state.game_over or session.state.paused:
+            return
+        self._schedule(hosted)
+
+    def _schedule(self, hosted: _HostedSession) -> None:
+        now = self._wheel.now
+        hosted.due += hosted.session.tick_interval / self.resolution
+        delay = round(hosted.due) - now
+        if delay < 1:
+            # Тик опоздал больше чем на интервал: долг не копим
+            hosted.due = now + 1.0
+            delay = 1
+        hosted.timer = self._wheel.schedule(delay, hosted)
+
+    def _start_ticking(self, hosted: _HostedSession) -> None:
+        self._stop_ticking(hosted)
+        hosted.due = float(self._wheel.now)
+        self._schedule(hosted)
+
+    def _stop_ticking(self, hosted: _HostedSession) -> None:
+        if hosted.timer is not None:
+            self._wheel.cancel(hosted.timer)
+            hosted.timer = None
+
+    def _drop(self, hosted: _HostedSession) -> None:
+        self._stop_ticking(hosted)
+        self._sessions.discard(hosted)
+        hosted.writer.close()
+
+    # ------------------------------------------------------------------
+    # Протокол
+    # ------------------------------------------------------------------
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        hosted: _HostedSession | None = None
+        try:
+            while line := await reader.readline():
+                command, *args = line.decode(errors="replace").split() or [""]
+                command = command.upper()
+                if command == "QUIT":
+                    break
+                if command == "STATS":
+                    stats = " ".join(
+                        f"{key}={value}" for key, value in self.stats().items()
+                    )
+                    writer.write(f"STATS {stats}\n".encode())
+                    if [arg.upper() for arg in args] == ["RESET"]:
+                        self.lateness.reset()
+                elif command == "START":
+                    if hosted is not None:
+                        self._drop(hosted)
+                    hosted = self._start_session(args, writer)
+                elif hosted is None or hosted not in self._sessions:
+                    writer.write(_error("игра не начата, отправьте START"))
+                else:
+                    self._handle(hosted, command, args)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if hosted is not None:
+                self._drop(hosted)
+            writer.close()
+
+    def _start_session(
+        self, args: list[str], writer: asyncio.StreamWriter
+    ) -> _HostedSession | None:
+        if (
+            self.max_sessions is not None
+            and len(self._sessions) >= self.max_sessions
+        ):
+            writer.write(_error("сервер заполнен"))
+            return None
+        try:
+            config = self._session_config(args)
+        except ValueError as error:
+            writer.write(_error(str(error)))
+            return None
+        hosted = _HostedSession(SnakeSession(config), writer)
+        self._sessions.add(hosted)
+        writer.write(
+            f"STARTED {config.cols} {config.rows} "
+            f"{hosted.session.state.speed:g}\n".encode()
+        )
+        self._start_ticking(hosted)
+        return hosted
+
+    def _session_config(self, args: list[str]) -> SnakeGameConfig:
+        if len(args) not in (0, 2, 3):
+            raise ValueError("формат: START [cols rows [seed]]")
+        values = [int(arg) for arg in args]
+        config = self.config
+        if values:
+            cols, rows = values[0], values[1]
+            if not (
+                MIN_BOARD <= cols <= MAX_BOARD
+                and MIN_BOARD <= rows <= MAX_BOARD
+            ):
+                raise ValueError(
+                    f"сторона поля — от {MIN_BOARD} до {MAX_BOARD} клеток"
+                )
+            config = config.with_board(cols, rows)
+        if len(values) == 3:
+            config = replace(config, rng_seed=values[2])
+        return config
+
+    def _handle(
+        self, hosted: _HostedSession, command: str, args: list[str]
+    ) -> None:
+        session = hosted.session
+        if command == "TURN" and len(args) == 1:
+            direction = Direction.__members__.get(args[0].upper())
+            if direction is None:
+                hosted.writer.write(_error("неизвестное направление"))
+            else:
+                session.set_direction(direction)
+        elif command == "PAUSE":
+            session.toggle_pause()
+            if session.state.paused:
+                self._stop_ticking(hosted)
+            elif not session.state.game_over:
+                self._start_ticking(hosted)
+        elif command == "RESTART":
+            session.restart()
+            self._start_ticking(hosted)
+        else:
+            hosted.writer.write(_error(f"неизвестная команда {command}"))
+
+
+def _error(message: str) -> bytes:
+    return f"ERR {message}\n".encode()
+
+
+async def serve(
+    server: SessionServer,
+    *,
+    tcp: tuple[str, int] | None = None,
+    unix: str | None = None,
+) -> None:
+    """Слушает адреса и работает до отмены задачи."""
+
+    if tcp is not None:
+        await server.start_tcp(*tcp)
+    if unix is not None:
+        await server.start_unix(unix)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def _address(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tcp", type=_address, metavar="HOST:PORT")
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--resolution", type=float, default=0.005)
+    parser.add_argument("--max-sessions", type=int)
+    args = parser.parse_args(argv)
+    if args.tcp is None and args.unix is None:
+        parser.error("укажите --tcp или --unix")
+    server = SessionServer(
+        resolution=args.resolution, max_sessions=args.max_sessions
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(server, tcp=args.tcp, unix=args.unix))
+
+
+__all__ = ["SessionServer", "serve"]
+
+
+if __name__ == "__main__":
+    main()
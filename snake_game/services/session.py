@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import replace
+import secrets
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 
 from ..core import (
     Direction,
@@ -13,19 +16,73 @@ from ..core import (
     SnakeGameState,
 )
 from .audio import SoundManager
+from .bus import EventBus, SessionEvent
+from .replay import Replay, ReplayRecorder
+
+
+@dataclass(slots=True)
+class StepTiming:
+    """Длительности последнего тика в наносекундах.
+
+    Экземпляр один на сессию и перезаписывается каждым тиком.
+    """
+
+    engine_ns: int = 0
+    dispatch_ns: int = 0
+    total_ns: int = 0
+
+
+# Звуки событий тика в порядке проигрывания
+_EVENT_SOUNDS: tuple[tuple[GameStepEvent, str], ...] = (
+    (GameStepEvent.FOOD_EATEN, "eat"),
+    (GameStepEvent.SPEED_CHANGED, "level_up"),
+    (GameStepEvent.GAME_OVER, "death"),
+)
+_RESIZED_RESULT = GameStepResult.cached(GameStepEvent.RESIZED.mask)
+
+PreStepHook = Callable[["SnakeSession"], None]
+PostStepHook = Callable[["SnakeSession", GameStepResult, StepTiming], None]
 
 
 class SnakeSession:
-    """Обёртка над игровым движком с учетом внешних сервисов."""
+    """Обёртка над игровым движком с учетом внешних сервисов.
+
+    События каждого тика публикуются в шину ``bus`` (:class:`EventBus`):
+    на неё подписаны звуки и запись повтора, а UI и телеметрия
+    подписываются сами вместо опроса состояния. Смена размера поля
+    публикуется как результат с ``GameStepEvent.RESIZED``, пауза и
+    перезапуск — как :class:`SessionEvent`.
+
+    Хуки ``add_pre_step_hook``/``add_post_step_hook`` вызываются вокруг
+    каждого тика; post-хуки получают результат шага и его тайминги.
+    Пока хуков нет, ``step`` — обычный метод без замеров времени:
+    инструментированная версия подставляется в экземпляр только при
+    добавлении первого хука.
+    """
 
     def __init__(
         self,
         config: SnakeGameConfig,
         sound_manager: SoundManager | None = None,
+        *,
+        record_replay: bool = False,
     ) -> None:
+        if record_replay and config.rng_seed is None:
+            # Без сида игру нельзя воспроизвести, выбираем его сами
+            config = replace(config, rng_seed=_new_seed())
         self._config = config
         self._engine = SnakeGameEngine(config)
-        self._sound_manager = sound_manager
+        self._bus = EventBus()
+        self._recorder = ReplayRecorder(config) if record_replay else None
+        if self._recorder is not None:
+            # Тики без движения (пауза) в повтор не попадают
+            self._bus.subscribe(GameStepEvent.MOVED, self._recorder.on_step)
+        if sound_manager is not None:
+            for event, alias in _EVENT_SOUNDS:
+                self._bus.subscribe(event, _sound_player(sound_manager, alias))
+        self._pre_step_hooks: list[PreStepHook] = []
+        self._post_step_hooks: list[PostStepHook] = []
+        self._timing = StepTiming()
 
     # ------------------------------------------------------------------
     # Свойства
@@ -34,6 +91,10 @@ class SnakeSession:
     def engine(self) -> SnakeGameEngine:
         return self._engine
 
+    @property
+    def bus(self) -> EventBus:
+        return self._bus
+
     @property
     def state(self) -> SnakeGameState:
         return self._engine.state
@@ -42,47 +103,118 @@ class SnakeSession:
     def tick_interval(self) -> float:
         return self._engine.tick_interval
 
+    @property
+    def replay(self) -> Replay | None:
+        """Запись текущей игры или None, если запись выключена."""
+
+        if self._recorder is None:
+            return None
+        state = self.state
+        return self._recorder.finish(state.score, state.game_over)
+
     # ------------------------------------------------------------------
     # Игровой цикл
     # ------------------------------------------------------------------
     def step(self) -> GameStepResult:
         result = self._engine.step()
-        self._handle_events(result)
+        self._bus.publish(result)
+        return result
+
+    def _instrumented_step(self) -> GameStepResult:
+        for pre_hook in self._pre_step_hooks:
+            pre_hook(self)
+        clock = time.perf_counter_ns
+        start = clock()
+        result = self._engine.step()
+        stepped = clock()
+        self._bus.publish(result)
+        end = clock()
+        timing = self._timing
+        timing.engine_ns = stepped - start
+        timing.dispatch_ns = end - stepped
+        timing.total_ns = end - start
+        for post_hook in self._post_step_hooks:
+            post_hook(self, result, timing)
         return result
 
+    # ------------------------------------------------------------------
+    # Хуки
+    # ------------------------------------------------------------------
+    def add_pre_step_hook(self, hook: PreStepHook) -> None:
+        """Вызывать ``hook(session)`` перед каждым тиком."""
+
+        self._pre_step_hooks.append(hook)
+        self._update_step()
+
+    def add_post_step_hook(self, hook: PostStepHook) -> None:
+        """Вызывать ``hook(session, result, timing)`` после каждого тика."""
+
+        self._post_step_hooks.append(hook)
+        self._update_step()
+
+    def remove_step_hook(self, hook: PreStepHook | PostStepHook) -> None:
+        """Убирает хук из обоих списков; неизвестный хук игнорируется."""
+
+        for hooks in (self._pre_step_hooks, self._post_step_hooks):
+            if hook in hooks:
+                hooks.remove(hook)  # type: ignore[arg-type]
+        self._update_step()
+
+    def _update_step(self) -> None:
+        if self._pre_step_hooks or self._post_step_hooks:
+            self.step = self._instrumented_step  # type: ignore[method-assign]
+        else:
+            # Возвращаем метод класса: без хуков нет и замеров
+            self.__dict__.pop("step", None)
+
     # ------------------------------------------------------------------
     # Управление состоянием
     # ------------------------------------------------------------------
     def set_direction(self, direction: Direction) -> None:
+        if self._recorder is not None:
+            self._recorder.record_direction(direction)
         self._engine.set_direction(direction)
 
     def toggle_pause(self) -> None:
         self._engine.toggle_pause()
+        self._bus.publish_session(
+            SessionEvent.PAUSED if self.state.paused else SessionEvent.RESUMED
+        )
 
     def restart(self) -> None:
-        self._engine.reset()
+        if self._recorder is not None:
+            # Новая игра — новый сид, иначе повтор нельзя проиграть с нуля
+            self._engine.reseed(_new_seed())
+            self._engine.reset()
+            self._recorder.start(self._engine.config)
+        else:
+            self._engine.reset()
+        self._bus.publish_session(SessionEvent.RESTARTED)
 
     def resize_board(self, cols: int, rows: int) -> None:
+        if self._recorder is not None:
+            self._recorder.record_resize(cols, rows)
         previous_state = replace(self.state)
         self._engine.resize(cols, rows, preserve_state=True)
         if (
             previous_state.cols != self.state.cols
             or previous_state.rows != self.state.rows
         ):
-            self._engine.state.steps = 0
+            self._engine.reset_steps()
+            self._bus.publish(_RESIZED_RESULT)
 
-    # ------------------------------------------------------------------
-    # События
-    # ------------------------------------------------------------------
-    def _handle_events(self, result: GameStepResult) -> None:
-        if not self._sound_manager:
-            return
-        if GameStepEvent.FOOD_EATEN in result.events:
-            self._sound_manager.play("eat")
-        if GameStepEvent.SPEED_CHANGED in result.events:
-            self._sound_manager.play("level_up")
-        if GameStepEvent.GAME_OVER in result.events:
-            self._sound_manager.play("death")
-
-
-__all__ = ["SnakeSession"]
+
+def _sound_player(
+    sound_manager: SoundManager, alias: str
+) -> Callable[[GameStepResult], None]:
+    def play(_result: GameStepResult) -> None:
+        sound_manager.play(alias)
+
+    return play
+
+
+def _new_seed() -> int:
+    return secrets.randbits(32)
+
+
+__all__ = ["PostStepHook", "PreStepHook", "SnakeSession", "StepTiming"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import os
 
 from kivy.app import App
@@ -14,18 +15,23 @@ from kivy.uix.label import Label
 from kivy.uix.widget import Widget
 
 from ..core import Direction, GameStepEvent, SnakeGameConfig
-from ..services import SnakeSession, SoundManager
+from ..services import SessionEvent, SnakeSession, SoundManager, StepRecorder
 
 CELL_SIZE = 20
 BG_COLOR = (0.1, 0.1, 0.1, 1)
 GRID_COLOR = (0.3, 0.3, 0.3, 1)
 SNAKE_COLOR = (0.2, 0.7, 0.2, 1)
 FOOD_COLOR = (0.8, 0.2, 0.2, 1)
+WALL_COLOR = (0.6, 0.6, 0.6, 1)
 SOUND_FILES = {
     "eat": "eat.mp3",
     "death": "death.mp3",
     "level_up": "level_up.mp3",
 }
+# События, после которых меняется строка статуса
+STATUS_EVENTS = (
+    GameStepEvent.FOOD_EATEN | GameStepEvent.GAME_OVER | GameStepEvent.RESIZED
+)
 
 
 class SnakeBoard(Widget):
@@ -51,6 +57,17 @@ class SnakeBoard(Widget):
 
         config = SnakeGameConfig(cols=10, rows=10, cell_size=self._cell_size)
         self.session = SnakeSession(config, sound_manager)
+        # Гистограммы задержек тика (SNAKE_GAME_METRICS=1); без переменной
+        # хуков нет и step работает без замеров
+        self.metrics: StepRecorder | None = None
+        if os.environ.get("SNAKE_GAME_METRICS"):
+            self.metrics = StepRecorder()
+            self.metrics.attach(self.session)
+        bus = self.session.bus
+        bus.subscribe(GameStepEvent.SPEED_CHANGED, self._on_speed_changed)
+        bus.subscribe(GameStepEvent.GAME_OVER, self._on_game_over)
+        # Каждый тик с движением меняет клетки поля
+        bus.subscribe(GameStepEvent.MOVED, self._on_board_changed)
 
         self.bind(size=self._on_size_changed)
         self._bind_keyboard()
@@ -106,13 +123,16 @@ class SnakeBoard(Widget):
             self._tick_event = None
 
     def _on_tick(self, _dt) -> None:
-        result = self.session.step()
-        if GameStepEvent.SPEED_CHANGED in result.events:
-            self._schedule_tick()
-        if GameStepEvent.GAME_OVER in result.events:
-            self._cancel_tick()
-        if result.needs_redraw or result.events:
-            self._redraw()
+        self.session.step()
+
+    def _on_speed_changed(self, _result) -> None:
+        self._schedule_tick()
+
+    def _on_game_over(self, _result) -> None:
+        self._cancel_tick()
+
+    def _on_board_changed(self, _result) -> None:
+        self._redraw()
 
     # ------------------------------------------------------------------
     # Управление состоянием
@@ -172,6 +192,18 @@ class SnakeBoard(Widget):
                     width=1,
                 )
 
+            Color(*WALL_COLOR)
+            for wx, wy in self.session.engine.config.walls:
+                if wx >= state.cols or wy >= state.rows:
+                    continue
+                Rectangle(
+                    pos=(
+                        self.x + wx * self._cell_size,
+                        self.y + wy * self._cell_size,
+                    ),
+                    size=(self._cell_size, self._cell_size),
+                )
+
             Color(*SNAKE_COLOR)
             for segment in state.snake:
                 sx, sy = segment
@@ -205,10 +237,26 @@ class SnakeApp(App):
         root.add_widget(self.status_label)
         root.add_widget(self.board)
 
-        Clock.schedule_interval(self._update_status, 0.1)
+        # Статус обновляется по событиям сессии, а не опросом состояния
+        bus = self.board.session.bus
+        bus.subscribe(STATUS_EVENTS, self._update_status)
+        bus.subscribe_session(
+            SessionEvent.PAUSED
+            | SessionEvent.RESUMED
+            | SessionEvent.RESTARTED,
+            self._update_status,
+        )
+        self._update_status()
         return root
 
-    def _update_status(self, _dt) -> None:
+    def on_stop(self) -> None:
+        metrics = self.board.metrics
+        if metrics is not None and metrics.tick.count:
+            logging.getLogger(__name__).info(
+                "Метрики тиков: %s", metrics.summary()
+            )
+
+    def _update_status(self, _event=None) -> None:
         state = self.board.session.state
         status = f"Score: {state.score}"
         if state.game_over:
@@ -0,0 +1,189 @@
+from collections import deque
+
+import pytest
+
+from snake_game.ai import (
+    Autopilot,
+    DistanceField,
+    HamiltonianCycle,
+    HamiltonianSolver,
+)
+from snake_game.ai.autopilot import UNREACHABLE
+from snake_game.ai.bitboard import BitBoard
+from snake_game.ai.hamiltonian import CACHE_ENV
+from snake_game.core import Direction, SnakeGameConfig, SnakeGameEngine
+from snake_game.services import SnakeSession
+
+
+def _bfs(cols, rows, blocked, source):
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nxt = (x + dx, y + dy)
+            if (
+                0 <= nxt[0] < cols
+                and 0 <= nxt[1] < rows
+                and nxt not in blocked
+                and nxt not in dist
+            ):
+                dist[nxt] = dist[(x, y)] + 1
+                queue.append(nxt)
+    return dist
+
+
+def test_distance_field_matches_bfs():
+    cols, rows = 9, 7
+    blocked = {(4, y) for y in range(1, 7)} | {(1, 2), (2, 2), (6, 0)}
+    board = BitBoard(cols, rows, wrap=False)
+    free = board.full & ~board.from_cells(
+        y * cols + x for x, y in blocked
+    )
+    field = DistanceField(board, 2 * cols + 7)
+    expected = _bfs(cols, rows, blocked, (7, 2))
+
+    for y in range(rows):
+        for x in range(cols):
+            if (x, y) in blocked:
+                continue
+            distance = field.distance(y * cols + x, free)
+            assert distance == expected.get((x, y), UNREACHABLE)
+
+
+def test_bitboard_spread_wraps_edges():
+    board = BitBoard(3, 2, wrap=True)
+    # Клетка (0, 0): соседи (1, 0), (2, 0) через край и (0, 1)
+    assert board.spread(1) == 0b1110
+    assert BitBoard(3, 2, wrap=False).spread(1) == 0b1010
+
+
+def test_autopilot_plays_as_run_policy():
+    engine = SnakeGameEngine(SnakeGameConfig(cols=10, rows=10, rng_seed=0))
+
+    summary = engine.run(2_000, Autopilot())
+
+    assert engine.state.score >= 10
+    assert summary.ticks > engine.state.score
+
+
+def test_autopilot_avoids_dead_end():
+    # Еда в кармане из двух клеток у верхнего края: змейке длины 5 туда
+    # нельзя, хотя это кратчайший путь
+    engine = SnakeGameEngine(SnakeGameConfig(cols=7, rows=3, rng_seed=1))
+    engine.state.snake = [(2, 2), (2, 1), (1, 1), (0, 1), (0, 0)]
+    engine.state.direction = Direction.UP
+    engine.state.pending_direction = Direction.UP
+    engine.state.food = (0, 2)
+
+    assert Autopilot().decide(engine) is Direction.RIGHT
+
+
+def test_autopilot_steers_session_and_resyncs_after_restore():
+    session = SnakeSession(SnakeGameConfig(cols=8, rows=8, rng_seed=4))
+    autopilot = Autopilot()
+    snapshot = session.engine.snapshot()
+
+    for _ in range(20):
+        assert autopilot.steer(session) is not None
+        session.step()
+    session.engine.restore(snapshot)
+    for _ in range(20):
+        autopilot.steer(session)
+        session.step()
+
+    assert not session.state.game_over
+    session.state.game_over = True
+    assert autopilot.steer(session) is None
+
+
+def test_hamiltonian_cycle_visits_every_cell_once():
+    for cols, rows in ((2, 2), (4, 3), (3, 4), (6, 5), (8, 8)):
+        cycle = HamiltonianCycle.build(cols, rows)
+        cells = list(cycle.cells)
+        assert sorted(cells) == list(range(cols * rows))
+        for position, cell in enumerate(cells):
+            y1, x1 = divmod(cell, cols)
+            y2, x2 = divmod(cells[position - 1], cols)
+            assert abs(x1 - x2) + abs(y1 - y2) == 1
+
+    with pytest.raises(ValueError):
+        HamiltonianCycle.build(5, 5)
+
+
+def test_hamiltonian_cycle_is_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(HamiltonianCycle, "_loaded", {})
+    built = HamiltonianCycle.for_board(6, 4, tmp_path)
+    assert (tmp_path / "hamiltonian" / "6x4.bin").exists()
+
+    monkeypatch.setattr(HamiltonianCycle, "_loaded", {})
+    monkeypatch.setattr(
+        HamiltonianCycle,
+        "build",
+        classmethod(lambda cls, cols, rows: pytest.fail("не из кэша")),
+    )
+    loaded = HamiltonianCycle.for_board(6, 4, tmp_path)
+    assert list(loaded.cells) == list(built.cells)
+    assert list(loaded.order) == list(built.order)
+
+
+def test_cycle_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(HamiltonianCycle, "_loaded", {})
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    HamiltonianCycle.for_board(6, 4)
+    assert not any(tmp_path.iterdir())
+
+    monkeypatch.setattr(HamiltonianCycle, "_loaded", {})
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+    HamiltonianCycle.for_board(6, 4)
+    assert (tmp_path / "cache" / "hamiltonian" / "6x4.bin").exists()
+
+
+def test_corrupt_cycle_cache_is_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / "hamiltonian" / "6x4.bin"
+    built = HamiltonianCycle.for_board(6, 4, tmp_path)
+    original = path.read_bytes()
+    flipped = bytearray(original)
+    flipped[-5] ^= 1
+    for data in (original[:-3], bytes(flipped)):
+        path.write_bytes(data)
+        monkeypatch.setattr(HamiltonianCycle, "_loaded", {})
+
+        loaded = HamiltonianCycle.for_board(6, 4, tmp_path)
+
+        assert list(loaded.cells) == list(built.cells)
+        assert path.read_bytes() != data
+
+
+def test_hamiltonian_solver_fills_the_board(tmp_path):
+    for cols, rows, wrap in ((6, 6, False), (7, 4, False), (6, 6, True)):
+        config = SnakeGameConfig(
+            cols=cols, rows=rows, rng_seed=2, wrap_edges=wrap
+        )
+        engine = SnakeGameEngine(config)
+
+        engine.run(100_000, HamiltonianSolver(cache_dir=tmp_path))
+
+        assert engine.state.game_over
+        assert len(engine.state.snake) == cols * rows
+
+
+def test_hamiltonian_solver_falls_back_on_odd_board(tmp_path):
+    engine = SnakeGameEngine(SnakeGameConfig(cols=9, rows=9, rng_seed=2))
+
+    engine.run(500, HamiltonianSolver(cache_dir=tmp_path))
+
+    assert engine.state.score > 0
+
+
+def test_autopilot_goes_around_walls():
+    walls = frozenset((x, 5) for x in range(1, 10))
+    engine = SnakeGameEngine(
+        SnakeGameConfig(cols=10, rows=10, rng_seed=7, walls=walls)
+    )
+
+    engine.run(300, Autopilot())
+
+    assert engine.state.score >= 3
+    assert walls.isdisjoint(engine.state.snake)
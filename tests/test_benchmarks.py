@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.bench_core import compare, run_suite, to_json
+
+
+def test_suite_runs_every_operation_on_a_small_board():
+    results = run_suite([(10, 10)], min_time=0.0, rounds=1)
+
+    assert set(results) == {
+        f"{operation}/10x10/len{length}"
+        for operation in ("step", "session_step", "spawn_food", "resize")
+        for length in (3, 10, 50)
+    }
+    assert all(m.ops_per_second > 0 for m in results.values())
+
+
+def test_compare_flags_only_slowdowns_above_threshold():
+    results = run_suite([(10, 10)], ["step"], min_time=0.0, rounds=1)
+    baseline = to_json(results)
+    current = to_json(results)
+    names = sorted(current["results"])
+    current["results"][names[0]]["ops_per_second"] *= 0.5
+    current["results"][names[1]]["ops_per_second"] *= 0.95
+    current["results"][names[2]]["ops_per_second"] *= 3.0
+
+    regressions = compare(current, baseline, threshold=0.1)
+
+    assert [r.name for r in regressions] == [names[0]]
+    assert regressions[0].change == pytest.approx(-0.5)
@@ -0,0 +1,67 @@
+import sys
+
+from snake_game.core import GameStepEvent, GameStepResult, SnakeGameConfig
+from snake_game.services import EventBus, SessionEvent, SnakeSession
+
+
+class _Sounds:
+    def __init__(self):
+        self.played = []
+
+    def play(self, alias):
+        self.played.append(alias)
+
+
+def test_handler_called_once_per_tick_with_all_events():
+    bus = EventBus()
+    calls = []
+    bus.subscribe(
+        GameStepEvent.FOOD_EATEN | GameStepEvent.SPEED_CHANGED, calls.append
+    )
+    events = (
+        GameStepEvent.MOVED
+        | GameStepEvent.FOOD_EATEN
+        | GameStepEvent.SPEED_CHANGED
+    )
+    result = GameStepResult.cached(events.mask)
+
+    bus.publish(GameStepResult.cached(GameStepEvent.MOVED.mask))
+    bus.publish(result)
+    assert calls == [result]
+
+    bus.unsubscribe(calls.append)
+    bus.publish(result)
+    assert calls == [result]
+
+
+def test_publish_without_subscribers_does_not_allocate():
+    bus = EventBus()
+    bus.subscribe(GameStepEvent.GAME_OVER, lambda _result: None)
+    result = GameStepResult.cached(GameStepEvent.MOVED.mask)
+    publish = bus.publish
+    publish(result)
+
+    before = sys.getallocatedblocks()
+    for _ in range(10_000):
+        publish(result)
+    assert sys.getallocatedblocks() - before < 10
+
+
+def test_session_publishes_sounds_and_session_events():
+    sounds = _Sounds()
+    session = SnakeSession(
+        SnakeGameConfig(cols=10, rows=10, rng_seed=1), sounds
+    )
+    changes = []
+    session.bus.subscribe_session(
+        SessionEvent.PAUSED | SessionEvent.RESTARTED, changes.append
+    )
+    head_x, head_y = session.state.head()
+    session.state.food = (head_x + 1, head_y)
+    session.step()
+    session.toggle_pause()
+    session.toggle_pause()
+    session.restart()
+
+    assert sounds.played == ["eat"]
+    assert changes == [SessionEvent.PAUSED, SessionEvent.RESTARTED]
@@ -0,0 +1,110 @@
+import pytest
+
+from snake_game.core import Direction, GameStepEvent, SnakeGameConfig
+from snake_game.core.arena import EMPTY, FOOD, WALL, MultiSnakeEngine
+
+GAME_OVER = GameStepEvent.GAME_OVER.mask
+FOOD_EATEN = GameStepEvent.FOOD_EATEN.mask
+
+
+@pytest.fixture
+def arena():
+    return MultiSnakeEngine(SnakeGameConfig(cols=12, rows=8, rng_seed=5))
+
+
+def _place_food(arena, cell):
+    for x, y in list(arena.food):
+        arena._owners[y * arena.config.cols + x] = EMPTY
+    arena.food = {cell}
+    x, y = cell
+    arena._owners[y * arena.config.cols + x] = FOOD
+
+
+def test_snakes_move_and_own_their_cells(arena):
+    left = arena.add_snake([(3, 2), (2, 2), (1, 2)])
+    right = arena.add_snake([(8, 5), (9, 5), (10, 5)], Direction.LEFT)
+    _place_food(arena, (0, 0))
+
+    result = arena.step()
+
+    assert result.alive == 2
+    assert left.head() == (4, 2)
+    assert right.head() == (7, 5)
+    assert arena.owner((4, 2)) == left.id + 1
+    assert arena.owner((1, 2)) == EMPTY
+    assert arena.owner((10, 5)) == EMPTY
+
+
+def test_head_to_head_longer_snake_wins_and_eats(arena):
+    long = arena.add_snake([(3, 4), (2, 4), (1, 4), (0, 4)])
+    short = arena.add_snake([(5, 4), (6, 4), (7, 4)], Direction.LEFT)
+    _place_food(arena, (4, 4))
+
+    result = arena.step()
+
+    assert long.alive and long.score == 1 and len(long.body) == 5
+    assert not short.alive and short.killed_by == long.id
+    assert result.events[long.id] & FOOD_EATEN
+    assert result.events[short.id] & GAME_OVER
+    # Тело проигравшего убрано с поля, еда появилась заново
+    assert all(arena.owner(cell) == EMPTY for cell in [(6, 4), (7, 4)])
+    assert len(arena.food) == 1
+
+
+def test_head_to_head_equal_length_kills_both(arena):
+    first = arena.add_snake([(3, 4), (2, 4), (1, 4)])
+    second = arena.add_snake([(5, 4), (6, 4), (7, 4)], Direction.LEFT)
+    _place_food(arena, (0, 0))
+
+    result = arena.step()
+
+    assert result.alive == 0
+    assert not first.alive and not second.alive
+    assert first.killed_by == second.id and second.killed_by == first.id
+
+
+def test_head_into_body_and_tail_is_a_collision(arena):
+    runner = arena.add_snake([(3, 3), (2, 3), (1, 3)])
+    wall = arena.add_snake([(4, 1), (4, 2), (4, 3)], Direction.DOWN)
+    _place_food(arena, (0, 0))
+
+    arena.step()
+
+    # Хвост (4, 3) ещё не сдвинулся, поэтому он тоже занят
+    assert not runner.alive and runner.killed_by == wall.id
+    assert wall.alive
+
+
+def test_random_spawns_keep_food_count():
+    arena = MultiSnakeEngine(
+        SnakeGameConfig(cols=20, rows=20, rng_seed=1, wrap_edges=True),
+        food_count=3,
+    )
+    snakes = [arena.add_snake() for _ in range(6)]
+
+    for _ in range(50):
+        arena.step()
+
+    assert len(arena.food) == 3
+    assert all(arena.owner(cell) == FOOD for cell in arena.food)
+    for snake in (snake for snake in snakes if snake.alive):
+        owner = snake.id + 1
+        assert all(arena.owner(cell) == owner for cell in snake.body)
+    with pytest.raises(ValueError):
+        arena.add_snake([next(iter(arena.food)), (-1, 0)])
+
+
+def test_walls_kill_snakes_and_never_get_food():
+    walls = frozenset((x, 3) for x in range(2, 10))
+    arena = MultiSnakeEngine(
+        SnakeGameConfig(cols=12, rows=8, rng_seed=2, walls=walls),
+        food_count=5,
+    )
+    snake = arena.add_snake([(4, 2), (4, 1), (4, 0)], Direction.UP)
+
+    assert arena.owner((5, 3)) == WALL
+    assert walls.isdisjoint(arena.food)
+    with pytest.raises(ValueError):
+        arena.add_snake([(6, 3)])
+    arena.step()
+    assert not snake.alive and snake.killed_by is None
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from snake_game.ai import Autopilot
+from snake_game.core import Direction, SnakeGameConfig, SnakeGameEngine
+from snake_game.core.body import RingBody
+
+
+def test_ring_body_behaves_like_a_list():
+    body = RingBody(5, 6, [(1, 0), (0, 0)])
+    expected = [(1, 0), (0, 0)]
+    for head in [(2, 0), (3, 0), (3, 1), (2, 1)]:
+        body.insert(0, head)
+        expected.insert(0, head)
+        assert body.pop() == expected.pop()
+        assert body == expected
+    body.insert(0, (1, 1))
+    expected.insert(0, (1, 1))
+
+    assert len(body) == 3 and body[0] == (1, 1) and body[-1] == (3, 1)
+    assert body[1:] == expected[1:]
+    assert list(body.cells()) == [6, 7, 8]
+    body[:] = [(4, 0)]
+    assert body == [(4, 0)] and body.copy() == body
+    with pytest.raises(IndexError):
+        body[3]
+
+
+def test_ring_body_grows_when_full():
+    body = RingBody(10, 2, [(0, 0), (1, 0)])
+    body.pop()
+    body.insert(0, (5, 5))
+    # Голова в конце буфера, хвост в начале: рост сохраняет порядок
+    for x in range(6, 10):
+        body.insert(0, (x, 5))
+
+    assert body.capacity == 18
+    assert body == [(9, 5), (8, 5), (7, 5), (6, 5), (5, 5), (0, 0)]
+
+
+def _play(config, ticks=3_000):
+    engine = SnakeGameEngine(config)
+    rng = random.Random(11)  # noqa: S311
+    autopilot = Autopilot()
+    for tick in range(ticks):
+        if engine.state.game_over:
+            break
+        if rng.random() < 0.05:
+            engine.set_direction(rng.choice(list(Direction)))
+        else:
+            direction = autopilot.decide(engine)
+            if direction is not None:
+                engine.set_direction(direction)
+        if tick == 500:
+            engine.resize(14, 12, preserve_state=True)
+        engine.step()
+    return engine
+
+
+def test_compact_body_plays_identically():
+    config = SnakeGameConfig(cols=12, rows=10, rng_seed=9)
+    plain = _play(config)
+    compact = _play(
+        SnakeGameConfig(cols=12, rows=10, rng_seed=9, compact_body=True)
+    )
+
+    assert isinstance(compact.state.snake, RingBody)
+    assert compact.state.snake == plain.state.snake
+    assert compact.state.score == plain.state.score
+    assert compact.state.food == plain.state.food
+
+
+def test_compact_body_survives_snapshot_restore_and_run():
+    engine = SnakeGameEngine(
+        SnakeGameConfig(cols=10, rows=8, rng_seed=2, compact_body=True)
+    )
+    snapshot = engine.snapshot()
+    engine.resize(20, 20, preserve_state=True)
+    engine.run(40, Autopilot())
+
+    engine.restore(snapshot)
+
+    assert isinstance(engine.state.snake, RingBody)
+    assert engine.state.snake == [(5, 4), (4, 4), (3, 4)]
+    assert engine.fork().state.snake == engine.state.snake
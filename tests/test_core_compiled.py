@@ -0,0 +1,109 @@
+"""Сверка собранного mypyc ядра с чистым Python на одинаковых играх.
+
+Тест играет партии здесь и в отдельном процессе на копии пакета без
+собранных модулей и сравнивает итоговые состояния. Без сборки
+(``python build_mypyc.py build_ext --inplace``) тест пропускается.
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import snake_game
+from snake_game.core import (
+    COMPILED,
+    Direction,
+    SnakeGameConfig,
+    SnakeGameEngine,
+)
+
+SEEDS = range(12)
+
+
+def play(seed):
+    """Партия со случайным вводом; возвращает итоговое состояние."""
+
+    rng = random.Random(seed)  # noqa: B311,S311  # nosec
+    config = SnakeGameConfig(
+        cols=12,
+        rows=10,
+        rng_seed=seed,
+        wrap_edges=seed % 2 == 0,
+        compact_body=seed % 3 == 0,
+        walls=frozenset({(0, 0), (6, 2)}) if seed % 4 == 1 else frozenset(),
+        food_mode="survival" if seed % 3 == 1 else None,
+    )
+    engine = SnakeGameEngine(config)
+    engine.enable_journal(20)
+    raster = bytearray(config.cols * config.rows)
+    directions = list(Direction)
+    events = []
+    snapshot = None
+    for _ in range(300):
+        if engine.state.game_over:
+            engine.rewind(rng.randint(1, 5))
+        action = rng.random()
+        if action < 0.6:
+            engine.set_direction(rng.choice(directions))
+            events.append(int(engine.step().events))
+        elif action < 0.8:
+            summary = engine.run(rng.randint(1, 10))
+            events.extend(summary.events)
+        elif action < 0.85:
+            snapshot = engine.snapshot()
+        elif action < 0.9 and snapshot is not None:
+            engine.restore(snapshot)
+        else:
+            engine = engine.fork()
+        engine.render_into(raster)
+    state = engine.state
+    return {
+        "snake": list(state.snake),
+        "food": state.food,
+        "food_type": state.food_type.name,
+        "direction": state.direction.name,
+        "score": state.score,
+        "speed": state.speed,
+        "steps": state.steps,
+        "game_over": state.game_over,
+        "hash": engine.state_hash,
+        "raster": raster.hex(),
+        "events": events,
+    }
+
+
+def _play_all():
+    return json.loads(json.dumps([play(seed) for seed in SEEDS]))
+
+
+@pytest.mark.skipif(not COMPILED, reason="ядро не собрано mypyc")
+def test_compiled_core_matches_pure_python(tmp_path):
+    package = Path(snake_game.__file__).parent
+    shutil.copytree(
+        package,
+        tmp_path / "snake_game",
+        ignore=shutil.ignore_patterns("*.so", "*.pyd", "__pycache__"),
+    )
+    env = dict(os.environ, PYTHONPATH=str(tmp_path))
+    pure = subprocess.run(  # noqa: S603  # nosec
+        [sys.executable, __file__],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    compiled, results = json.loads(pure.stdout)
+
+    assert not compiled
+    assert _play_all() == results
+
+
+if __name__ == "__main__":
+    print(json.dumps([COMPILED, _play_all()]))
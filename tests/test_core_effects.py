@@ -0,0 +1,150 @@
+import pytest
+
+from snake_game.core import (
+    Direction,
+    GameStepEvent,
+    SnakeGameConfig,
+    SnakeGameEngine,
+)
+from snake_game.core.effects import Effect, EffectScheduler, TimerWheel
+from snake_game.core.food import FoodType
+from snake_game.services import Replay, SnakeSession, verify_replay
+
+
+def test_timer_wheel_fires_on_due_tick_across_rounds():
+    wheel = TimerWheel(4)
+    wheel.schedule(2, "a")
+    far = wheel.schedule(6, "far")
+    wheel.schedule(2, "b")
+    cancelled = wheel.schedule(3, "cancelled")
+    assert wheel.cancel(cancelled)
+
+    fired = [wheel.advance() for _ in range(6)]
+
+    assert fired[1] == ("a", "b")
+    assert fired[5] == ("far",)
+    assert all(not fired[tick] for tick in (0, 2, 3, 4))
+    assert len(wheel) == 0 and wheel.remaining(far) == 0
+    with pytest.raises(ValueError):
+        TimerWheel(6)
+
+
+def test_effect_lasts_the_given_number_of_ticks():
+    effects = EffectScheduler()
+    effects.start(Effect.SHIELD, 3)
+    remaining = []
+    for _ in range(4):
+        effects.advance()
+        remaining.append(effects.remaining(Effect.SHIELD))
+
+    assert remaining == [2, 1, 0, 0]
+    assert Effect.SHIELD not in effects
+
+
+def _engine(**options):
+    config = SnakeGameConfig(
+        cols=12, rows=12, rng_seed=3, food_mode="map", **options
+    )
+    return SnakeGameEngine(config)
+
+
+def _feed(engine, food_type):
+    head_x, head_y = engine.state.head()
+    engine.state.food = (head_x + 1, head_y)
+    engine.state.food_type = food_type
+    return engine.step()
+
+
+def test_speed_food_boosts_for_ticks_and_pauses_with_game():
+    engine = _engine(speed_boost=4.0, speed_boost_ticks=3)
+    speed = engine.state.speed
+
+    result = _feed(engine, FoodType.SPEED)
+    assert GameStepEvent.SPEED_CHANGED in result.events
+    assert engine.state.speed == speed + 4.0
+
+    engine.step()
+    engine.pause()
+    for _ in range(10):
+        engine.step()
+    engine.resume()
+    engine.step()
+    assert engine.effects.remaining(Effect.SPEED_BOOST) == 1
+    engine.step()
+    result = engine.step()
+    assert GameStepEvent.SPEED_CHANGED in result.events
+    assert engine.state.speed == speed
+
+
+def test_shield_blocks_collisions_until_it_expires():
+    engine = _engine(shield_ticks=2)
+    engine.state.snake = [(11, 5), (10, 5), (9, 5)]
+    engine.start_effect(Effect.SHIELD)
+
+    for _ in range(2):
+        result = engine.step()
+        assert result.events == GameStepEvent.MOVED
+        assert engine.state.head() == (11, 5)
+    result = engine.step()
+    assert GameStepEvent.GAME_OVER in result.events
+
+
+def test_special_food_turns_normal_after_its_time():
+    engine = _engine(special_food_ticks=2)
+    engine.state.food = (0, 0)
+    engine._set_food_type(engine.state, FoodType.BONUS)
+    engine.step()
+    engine.step()
+    assert engine.state.food_type is FoodType.BONUS
+
+    result = engine.step()
+    assert engine.state.food_type is FoodType.NORMAL
+    assert result.old_food == result.new_food == (0, 0)
+
+
+def test_bonus_food_scores_and_rewinds():
+    engine = _engine()
+    engine.enable_journal(8)
+    _feed(engine, FoodType.BONUS)
+    assert engine.state.score == 5
+
+    engine.rewind(1)
+    assert engine.state.score == 0
+    assert engine.state.food_type is FoodType.BONUS
+
+
+def test_effects_replay_deterministically():
+    moves = [Direction.UP, None, Direction.LEFT, None, Direction.DOWN] * 40
+    moves += [None, Direction.RIGHT, None, Direction.UP] * 50
+    stepped = _engine()
+    codes = []
+    for direction in moves:
+        if stepped.state.game_over:
+            break
+        if direction is not None:
+            stepped.set_direction(direction)
+        codes.append(stepped.step().events)
+    ran = _engine()
+    summary = ran.run(len(moves), directions=moves)
+
+    assert list(summary.events) == codes
+    assert ran.state == stepped.state
+    assert ran.effects.active.keys() == stepped.effects.active.keys()
+
+
+def test_replay_keeps_food_mode():
+    config = SnakeGameConfig(
+        cols=10, rows=10, rng_seed=8, food_mode="survival", shield_ticks=9
+    )
+    session = SnakeSession(config, record_replay=True)
+    for tick in range(150):
+        if tick % 7 == 0:
+            session.set_direction(list(Direction)[tick // 7 % 4])
+        session.step()
+        if session.state.game_over:
+            break
+
+    restored = Replay.from_bytes(session.replay.to_bytes())
+    assert restored.config.food_mode == "survival"
+    assert restored.config.shield_ticks == 9
+    assert verify_replay(restored).ok
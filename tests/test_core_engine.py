@@ -0,0 +1,560 @@
+import pytest
+
+from snake_game.core import (
+    Direction,
+    GameStepEvent,
+    SnakeGameConfig,
+    SnakeGameEngine,
+    SnapshotPool,
+)
+from snake_game.core.grid import (
+    CELL_BODY,
+    CELL_EMPTY,
+    CELL_FOOD,
+    CELL_HEAD,
+    CELL_WALL,
+)
+from snake_game.services import SnakeSession
+
+
+@pytest.fixture()
+def engine():
+    # С сидом еда стоит одинаково в каждом прогоне и в собранном ядре
+    config = SnakeGameConfig(cols=10, rows=10, cell_size=20, rng_seed=1)
+    return SnakeGameEngine(config)
+
+
+def test_step_moves_snake_forward(engine):
+    start_head = engine.state.head()
+    result = engine.step()
+
+    assert engine.state.head() == (start_head[0] + 1, start_head[1])
+    assert GameStepEvent.MOVED in result.events
+
+
+def test_eating_food_increases_score_and_length(engine):
+    head_x, head_y = engine.state.head()
+    engine.state.food = (head_x + 1, head_y)
+
+    previous_length = len(engine.state.snake)
+    result = engine.step()
+
+    assert engine.state.score == 1
+    assert len(engine.state.snake) == previous_length + 1
+    assert GameStepEvent.FOOD_EATEN in result.events
+
+
+def test_collision_with_wall_triggers_game_over(engine):
+    engine.state.snake = [(engine.state.cols - 1, engine.state.rows // 2)]
+    engine.state.pending_direction = Direction.RIGHT
+    engine.state.direction = Direction.RIGHT
+
+    result = engine.step()
+
+    assert engine.state.game_over is True
+    assert GameStepEvent.GAME_OVER in result.events
+
+
+def test_self_collision_triggers_game_over(engine):
+    engine.state.snake = [(5, 5), (5, 4), (4, 4), (4, 5), (4, 6)]
+    engine.state.direction = Direction.LEFT
+    engine.state.pending_direction = Direction.LEFT
+
+    result = engine.step()
+
+    assert engine.state.game_over is True
+    assert GameStepEvent.GAME_OVER in result.events
+
+
+def test_occupancy_grid_follows_snake(engine):
+    for _ in range(3):
+        engine.step()
+
+    cols = engine.state.cols
+    expected = {y * cols + x for x, y in engine.state.snake}
+    occupied = {i for i, flag in enumerate(engine._occupied) if flag}
+    assert occupied == expected
+
+
+def test_occupancy_grid_rebuilt_on_resize_and_reset(engine):
+    engine.resize(15, 12, preserve_state=True)
+    assert len(engine._occupied) == 15 * 12
+    assert sum(engine._occupied) == len(engine.state.snake)
+
+    engine.reset(cols=8, rows=6)
+    assert len(engine._occupied) == 8 * 6
+    assert sum(engine._occupied) == len(engine.state.snake)
+
+
+def test_free_cells_exclude_snake_after_steps(engine):
+    for _ in range(5):
+        engine.step()
+
+    cols = engine.state.cols
+    snake_cells = {y * cols + x for x, y in engine.state.snake}
+    assert len(engine._free) == cols * engine.state.rows - len(snake_cells)
+    assert all(cell not in engine._free for cell in snake_cells)
+
+
+def test_indexes_match_snake_and_walls_on_small_boards():
+    for cols, rows in ((1, 4), (2, 3), (3, 6), (4, 1)):
+        # На поле 3×6 хвост за краем совпал бы по индексу со стеной
+        walls = frozenset({(2, 2)}) if cols == 3 else frozenset()
+        for seed in range(20):
+            config = SnakeGameConfig(
+                cols=cols, rows=rows, rng_seed=seed, walls=walls
+            )
+            engine = SnakeGameEngine(config)
+            engine.set_direction(Direction.UP)
+            for _ in range(3):
+                if seed % 2:
+                    engine.step()
+                else:
+                    engine.run(1)
+
+            state = engine.state
+            blocked = {y * cols + x for x, y in (*state.snake, *walls)}
+            occupied = {i for i, flag in enumerate(engine._occupied) if flag}
+            assert all(0 <= x < cols and 0 <= y < rows for x, y in state.snake)
+            assert occupied == blocked
+            assert not any(cell in engine._free for cell in blocked)
+            assert len(engine._free) == cols * rows - len(blocked)
+            fx, fy = state.food
+            assert state.game_over or fy * cols + fx not in blocked
+
+
+def test_food_never_spawns_on_snake():
+    config = SnakeGameConfig(cols=6, rows=6, rng_seed=7)
+    engine = SnakeGameEngine(config)
+    for _ in range(30):
+        head_x, head_y = engine.state.head()
+        engine.state.food = (head_x + 1, head_y) if head_x + 1 < 6 else (0, 0)
+        engine.step()
+        if engine.state.game_over:
+            break
+        assert engine.state.food not in engine.state.snake
+
+
+def test_same_seed_gives_same_food():
+    config = SnakeGameConfig(cols=12, rows=9, rng_seed=42)
+    first = SnakeGameEngine(config)
+    second = SnakeGameEngine(config)
+    assert first.state.food == second.state.food
+
+
+def test_run_matches_step_loop():
+    config = SnakeGameConfig(cols=8, rows=8, rng_seed=11)
+    moves = [Direction.UP, None, Direction.LEFT, None, Direction.DOWN] * 20
+    stepped = SnakeGameEngine(config)
+    codes = []
+    for direction in moves:
+        if stepped.state.game_over:
+            break
+        if direction is not None:
+            stepped.set_direction(direction)
+        result = stepped.step()
+        codes.append(sum(event.mask for event in result.events))
+
+    summary = SnakeGameEngine(config).run(len(moves), directions=moves)
+
+    assert list(summary.events) == codes
+    assert summary.state == stepped.state
+    assert summary.ticks == len(codes)
+
+
+def test_run_stops_at_game_over(engine):
+    summary = engine.run(100)
+
+    assert engine.state.game_over is True
+    assert summary.game_over_tick == summary.ticks
+    assert summary.events[-1] & GameStepEvent.GAME_OVER.mask
+    assert engine.state.steps == summary.ticks - 1
+
+
+def test_run_with_policy(engine):
+    calls = []
+
+    def policy(current):
+        calls.append(current.state.steps)
+        return Direction.UP if len(calls) == 1 else None
+
+    summary = engine.run(3, policy)
+
+    assert calls == [0, 1, 2]
+    assert summary.ticks == 3
+    assert engine.state.direction is Direction.UP
+
+
+def test_step_results_are_shared_instances(engine):
+    # Еда вдали от головы: первый шаг после паузы — простой ход
+    engine.state.food = (0, 0)
+    engine._rebuild_indexes()
+    engine.pause()
+    assert engine.step() is engine.step()
+    assert not engine.step().events
+
+    engine.resume()
+    first = engine.step()
+    assert first.events == GameStepEvent.MOVED
+    assert GameStepEvent.FOOD_EATEN not in first.events
+
+
+def test_step_result_carries_cell_diff(engine):
+    engine.state.food = (0, 0)
+    engine._rebuild_indexes()
+    tail = engine.state.snake[-1]
+
+    result = engine.step()
+
+    assert result.head == engine.state.head()
+    assert result.tail == tail
+    assert result.old_food is None and result.new_food is None
+    assert result.changed_cells == (result.head, tail)
+
+    engine.state.food = (engine.state.head()[0] + 1, engine.state.head()[1])
+    eaten = engine.state.food
+    result = engine.step()
+
+    assert result.head == eaten
+    assert result.tail is None
+    assert result.old_food == eaten
+    assert result.new_food == engine.state.food
+
+    engine.pause()
+    assert engine.step().changed_cells == ()
+
+
+def _play(engine, moves):
+    for direction in moves:
+        engine.set_direction(direction)
+        engine.step()
+
+
+def test_snapshot_restore_replays_identically():
+    config = SnakeGameConfig(cols=6, rows=6, rng_seed=3)
+    engine = SnakeGameEngine(config)
+    moves = [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT] * 5
+    snapshot = engine.snapshot()
+    snake = engine.state.snake
+
+    _play(engine, moves)
+    expected = engine.state.copy()
+
+    engine.restore(snapshot)
+    assert engine.state.snake is snake
+    assert engine.state.steps == 0
+    _play(engine, moves)
+    assert engine.state == expected
+
+
+def test_fork_is_independent(engine):
+    clone = engine.fork()
+    clone.set_direction(Direction.UP)
+    clone.step()
+
+    assert clone.state.head() != engine.state.head()
+    engine.set_direction(Direction.UP)
+    engine.step()
+    assert clone.state == engine.state
+
+
+def test_snapshot_pool_reuses_buffers(engine):
+    pool = SnapshotPool()
+    snapshot = engine.snapshot(into=pool.acquire())
+    body = snapshot.body
+    pool.release(snapshot)
+
+    again = engine.snapshot(into=pool.acquire())
+    assert again is snapshot and again.body is body
+    assert len(pool) == 0
+
+
+def test_resize_clamps_and_deduplicates_segments(engine):
+    engine.state.snake = [(9, 4), (8, 4), (7, 4), (6, 4), (6, 5), (7, 5)]
+    engine.state.food = (9, 9)
+
+    engine.resize(8, 5, preserve_state=True)
+
+    assert engine.state.snake == [(7, 4), (6, 4)]
+    assert engine.state.food not in engine.state.snake
+    fx, fy = engine.state.food
+    assert 0 <= fx < 8 and 0 <= fy < 5
+    assert sum(engine._occupied) == len(engine.state.snake)
+
+
+def test_walls_block_the_snake_and_food():
+    walls = frozenset((x, y) for x in range(10) for y in (0, 9))
+    walls |= {(5, 5), (6, 5)}
+    engine = SnakeGameEngine(
+        SnakeGameConfig(cols=10, rows=10, rng_seed=3, walls=walls)
+    )
+
+    # Центр занят стеной: змейку переносят на свободную строку
+    assert walls.isdisjoint(engine.state.snake)
+    for _ in range(200):
+        assert engine.state.food not in walls
+        engine._spawn_food(engine.state)
+
+    engine.state.snake = [(4, 5), (3, 5)]
+    engine.state.direction = engine.state.pending_direction = Direction.RIGHT
+    result = engine.step()
+    assert GameStepEvent.GAME_OVER in result.events
+
+    engine.resize(12, 12, preserve_state=True)
+    assert engine.is_occupied((5, 5)) and engine.is_occupied((9, 9))
+
+
+def test_quick_presses_within_one_tick_are_applied_in_order(engine):
+    head_x, head_y = engine.state.head()
+    engine.set_direction(Direction.UP)
+    engine.set_direction(Direction.LEFT)
+
+    assert engine.queued_turns == (Direction.UP, Direction.LEFT)
+    engine.step()
+    assert engine.state.head() == (head_x, head_y + 1)
+    engine.step()
+    assert engine.state.head() == (head_x - 1, head_y + 1)
+    assert engine.state.game_over is False
+    assert engine.input_stats.applied == 2
+    assert engine.input_stats.latency[:2] == [1, 1]
+
+
+def test_queued_turn_is_checked_against_previous_turn(engine):
+    engine.set_direction(Direction.UP)
+    # Влево нельзя было бы повернуть сразу, но после «вверх» — можно,
+    # а «вниз» после «вверх» — разворот назад
+    engine.set_direction(Direction.DOWN)
+    engine.set_direction(Direction.LEFT)
+
+    assert engine.queued_turns == (Direction.UP, Direction.LEFT)
+
+
+def test_full_input_queue_replaces_last_turn():
+    config = SnakeGameConfig(cols=10, rows=10, input_queue_size=1)
+    engine = SnakeGameEngine(config)
+    engine.set_direction(Direction.UP)
+    engine.set_direction(Direction.DOWN)
+
+    assert engine.queued_turns == (Direction.DOWN,)
+    assert engine.input_stats.replaced == 1
+    # Прежнее поведение: разворот назад отсекается по текущему ходу
+    engine.set_direction(Direction.LEFT)
+    assert engine.state.pending_direction is Direction.DOWN
+
+
+def test_run_consumes_input_queue_like_step():
+    config = SnakeGameConfig(cols=10, rows=10, rng_seed=4)
+    stepped = SnakeGameEngine(config)
+    ran = SnakeGameEngine(config)
+    for engine in (stepped, ran):
+        engine.set_direction(Direction.UP)
+        engine.set_direction(Direction.LEFT)
+        engine.set_direction(Direction.DOWN)
+    for _ in range(4):
+        stepped.step()
+    ran.run(4)
+
+    assert ran.state == stepped.state
+    assert ran.queued_turns == ()
+    assert ran.input_stats == stepped.input_stats
+
+
+def test_resize_keeps_latency_of_queued_turn():
+    session = SnakeSession(SnakeGameConfig(cols=40, rows=40, rng_seed=1))
+    for _ in range(18):
+        session.step()
+    session.set_direction(Direction.UP)
+    session.resize_board(30, 30)
+    session.step()
+
+    assert session.state.steps == 1
+    assert session.engine.input_stats.latency[:2] == [1, 0]
+
+
+def test_snapshot_keeps_input_queue(engine):
+    engine.set_direction(Direction.UP)
+    engine.set_direction(Direction.LEFT)
+    snapshot = engine.snapshot()
+    engine.step()
+    engine.step()
+    engine.restore(snapshot)
+
+    assert engine.queued_turns == (Direction.UP, Direction.LEFT)
+    assert engine.fork().queued_turns == (Direction.UP, Direction.LEFT)
+
+
+@pytest.mark.parametrize("compact_body", [False, True])
+def test_rewind_restores_earlier_ticks(compact_body):
+    config = SnakeGameConfig(
+        cols=8, rows=8, rng_seed=9, compact_body=compact_body
+    )
+    engine = SnakeGameEngine(config)
+    engine.enable_journal(40)
+    moves = [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT]
+    history = []
+    for tick in range(60):
+        history.append(engine.state.copy())
+        engine.set_direction(moves[tick // 3 % 4])
+        engine.step()
+        if engine.state.game_over:
+            break
+    ticks = len(history)
+    assert engine.rewindable_ticks == min(ticks, 40)
+
+    assert engine.rewind(15) == 15
+    expected = history[ticks - 15]
+    state = engine.state
+    assert list(state.snake) == list(expected.snake)
+    assert (state.food, state.score, state.speed, state.steps) == (
+        expected.food,
+        expected.score,
+        expected.speed,
+        expected.steps,
+    )
+    assert state.direction is expected.direction
+    assert not state.game_over
+    # Индексы поля совпадают с пересобранными с нуля
+    occupied = bytearray(engine._occupied)
+    engine._rebuild_indexes()
+    assert engine._occupied == occupied
+
+
+def test_rewind_after_run_and_game_over(engine):
+    engine.enable_journal(100)
+    summary = engine.run(100)
+    assert engine.state.game_over
+
+    assert engine.rewind(summary.ticks) == summary.ticks - 1
+    assert engine.state.head() == (5, 5)
+    assert engine.state.steps == 0
+    assert engine.rewind(1) == 0
+    engine.step()
+    assert engine.state.head() == (6, 5)
+
+
+def _fresh_hash(engine):
+    engine._zobrist = None
+    return engine.state_hash
+
+
+@pytest.mark.parametrize("compact_body", [False, True])
+def test_state_hash_is_updated_incrementally(compact_body):
+    config = SnakeGameConfig(
+        cols=8, rows=8, rng_seed=4, compact_body=compact_body
+    )
+    engine = SnakeGameEngine(config)
+    engine.enable_journal(50)
+    initial = engine.state_hash
+    moves = [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT]
+    for tick in range(12):
+        engine.set_direction(moves[tick // 3 % 4])
+        engine.step()
+        current = engine.state_hash
+        assert current == _fresh_hash(engine)
+        assert current != initial
+
+    engine.run(6, policy=lambda e: moves[e.state.steps // 2 % 4])
+    current = engine.state_hash
+    assert current == _fresh_hash(engine)
+
+    engine.rewind(10)
+    current = engine.state_hash
+    assert current == _fresh_hash(engine)
+
+    snapshot = engine.snapshot()
+    engine.step()
+    engine.restore(snapshot)
+    assert engine.state_hash == current
+    assert engine.fork().state_hash == current
+
+
+def test_state_hash_keys_are_built_on_first_use():
+    engine = SnakeGameEngine(SnakeGameConfig(cols=12, rows=9, rng_seed=1))
+    engine.run(5)
+    snapshot = engine.snapshot()
+    assert len(engine._zobrist_keys.body) == 0
+
+    current = engine.state_hash
+    assert len(engine._zobrist_keys.body) == 12 * 9
+    engine.resize(20, 20, preserve_state=True)
+    assert len(engine._zobrist_keys.body) == 0
+    assert engine.state_hash == _fresh_hash(engine)
+    assert len(engine._zobrist_keys.body) == 20 * 20
+
+    engine.restore(snapshot)
+    assert len(engine._zobrist_keys.body) == 0
+    assert engine.state_hash == current
+
+
+def test_state_hash_identifies_positions():
+    config = SnakeGameConfig(cols=10, rows=10, wrap_edges=True)
+    engine = SnakeGameEngine(config)
+    engine.state.food = (0, 0)
+    start = engine.state_hash
+    # Полный круг по тору возвращает змейку в ту же позицию
+    engine.run(10)
+    assert engine.state.head() == (5, 5)
+    assert engine.state_hash == start
+
+    engine.set_direction(Direction.UP)
+    assert engine.state_hash == start
+    engine.state.direction = Direction.UP
+    assert engine.state_hash != start
+    engine.state.direction = Direction.RIGHT
+    engine.state.food = (0, 1)
+    assert engine.state_hash != start
+
+
+def _expected_raster(engine):
+    state = engine.state
+    raster = bytearray(state.cols * state.rows)
+    for x, y in state.snake:
+        raster[y * state.cols + x] = CELL_BODY
+    head_x, head_y = state.head()
+    raster[head_y * state.cols + head_x] = CELL_HEAD
+    food_x, food_y = state.food
+    raster[food_y * state.cols + food_x] = CELL_FOOD
+    return raster
+
+
+def test_render_into_updates_only_changed_cells(engine):
+    # Еда в углу: ни змейка, ни еда не попадут на пробную клетку 99
+    engine.state.food = (0, 0)
+    engine._rebuild_indexes()
+    raster = bytearray(100)
+    engine.render_into(raster)
+    assert raster == _expected_raster(engine)
+
+    # Клетку вдали от змейки инкрементальная отрисовка не трогает
+    raster[99] = CELL_WALL
+    engine.set_direction(Direction.DOWN)
+    engine.step()
+    engine.run(2)
+    engine.render_into(raster)
+    assert raster[99] == CELL_WALL
+    raster[99] = CELL_EMPTY
+    assert raster == _expected_raster(engine)
+
+    # Другой буфер и restore рисуются заново целиком
+    snapshot = engine.snapshot()
+    engine.step()
+    engine.restore(snapshot)
+    raster[99] = CELL_WALL
+    engine.render_into(raster)
+    assert raster == _expected_raster(engine)
+
+
+def test_render_into_numpy_board():
+    np = pytest.importorskip("numpy")
+    config = SnakeGameConfig(cols=6, rows=4, walls=frozenset({(0, 0)}))
+    engine = SnakeGameEngine(config)
+    board = np.zeros((4, 6), dtype=np.uint8)
+    engine.render_into(board)
+    assert board[0, 0] == CELL_WALL
+    head_x, head_y = engine.state.head()
+    assert board[head_y, head_x] == CELL_HEAD
+
+    with pytest.raises(ValueError):
+        engine.render_into(np.zeros((3, 6), dtype=np.uint8))
+    with pytest.raises(TypeError):
+        engine.render_into(np.zeros((4, 6), dtype=np.int32))
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from snake_game.core import FOOD_TABLES, FoodTable, FoodType
+from snake_game.core.food import (
+    FOOD_TYPES,
+    MODE_FOOD_CONFIG,
+    FoodChance,
+    ModeFoodConfig,
+)
+
+
+def _expected(config, level, score):
+    probabilities = [c.at(level, score) for c in config.chances()]
+    total = sum(probabilities)
+    if total > config.max_total:
+        probabilities = [p * config.max_total / total for p in probabilities]
+    return probabilities
+
+
+def test_tables_match_formula_beyond_saturation():
+    for mode, table in FOOD_TABLES.items():
+        config = MODE_FOOD_CONFIG[mode]
+        for level in range(0, 40, 3):
+            for score in range(0, 300, 7):
+                cdf = table.cdf(level, score)
+                expected = _expected(config, level, score)
+                assert cdf[0] == pytest.approx(expected[0])
+                assert cdf[-1] == pytest.approx(sum(expected))
+                assert cdf[-1] <= config.max_total + 1e-12
+
+
+def test_choose_uses_one_draw_and_bisect():
+    table = FoodTable(
+        ModeFoodConfig(
+            bonus=FoodChance(0.1),
+            shield=FoodChance(0.2),
+            speed=FoodChance(0.3),
+            max_total=0.5,
+        )
+    )
+    # max_total урезает 0.6 до 0.5: границы 1/12, 3/12, 6/12
+    draws = iter([0.05, 0.2, 0.45, 0.5])
+
+    class Draws(random.Random):
+        def random(self):
+            return next(draws)
+
+    rng = Draws()
+    chosen = [table.choose(rng, 0, 0) for _ in range(4)]
+    assert chosen == [
+        FoodType.BONUS,
+        FoodType.SHIELD,
+        FoodType.SPEED,
+        FoodType.NORMAL,
+    ]
+
+
+def test_vectorized_sample_matches_distribution():
+    np = pytest.importorskip("numpy")
+    table = FOOD_TABLES["map"]
+    rng = np.random.default_rng(0)
+
+    codes = table.sample(rng, np.full(100_000, 2), np.full(100_000, 10))
+
+    frequencies = np.bincount(codes, minlength=len(FOOD_TYPES)) / codes.size
+    expected = table.probabilities(2, 10)
+    for index, food_type in enumerate(FOOD_TYPES):
+        assert frequencies[index] == pytest.approx(
+            expected[food_type], abs=0.01
+        )
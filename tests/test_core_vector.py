@@ -0,0 +1,102 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snake_game.core import (  # noqa: E402
+    Direction,
+    GameStepEvent,
+    SnakeGameConfig,
+)
+from snake_game.core.vector import (  # noqa: E402
+    CELL_BODY,
+    CELL_EMPTY,
+    CELL_FOOD,
+    CELL_HEAD,
+    CELL_WALL,
+    DIRECTIONS,
+    NO_ACTION,
+    VectorSnakeEngine,
+)
+
+
+def _keep(engine):
+    return np.full(engine.num_boards, NO_ACTION)
+
+
+def _put_food(engine, board, cell):
+    engine._grid[board, engine.food[board]] = CELL_EMPTY
+    engine.food[board] = cell
+    engine._grid[board, cell] = CELL_FOOD
+
+
+def test_wall_collision_resets_board():
+    config = SnakeGameConfig(cols=8, rows=6, rng_seed=1)
+    engine = VectorSnakeEngine(config, 4)
+    observations = engine.observations
+
+    for _ in range(3):
+        result = engine.step(_keep(engine))
+        assert not result.dones.any()
+
+    result = engine.step(_keep(engine))
+    assert result.dones.all()
+    assert (result.events & GameStepEvent.GAME_OVER.mask).all()
+    assert (result.rewards == -1.0).all()
+    # Автосброс: новый эпизод в том же буфере наблюдений
+    assert engine.observations is observations
+    assert (engine.lengths == 3).all()
+    assert (engine.steps == 0).all()
+
+
+def test_single_row_board_starts_inside():
+    engine = VectorSnakeEngine(SnakeGameConfig(cols=6, rows=1, rng_seed=2), 3)
+
+    row = engine.observations[:, 0]
+    assert (row[:, 3] == CELL_HEAD).all()
+    assert (row[:, 1:3] == CELL_BODY).all()
+    result = engine.step(_keep(engine))
+    assert not result.dones.any()
+    assert (engine.observations[:, 0, 4] == CELL_HEAD).all()
+
+
+def test_eating_food_grows_and_speeds_up():
+    config = SnakeGameConfig(
+        cols=10, rows=10, speed_increase_interval=1, rng_seed=3
+    )
+    engine = VectorSnakeEngine(config, 2)
+    head = engine._body[0, engine._head_ptr[0]]
+    _put_food(engine, 0, head + 1)
+
+    result = engine.step(_keep(engine))
+
+    assert result.rewards[0] == 1.0
+    assert result.events[0] & GameStepEvent.FOOD_EATEN.mask
+    assert result.events[0] & GameStepEvent.SPEED_CHANGED.mask
+    assert engine.lengths[0] == 4 and engine.lengths[1] == 3
+    assert engine.speeds[0] == config.initial_speed + config.speed_increment
+    assert engine.observations[0].reshape(-1)[head + 1] == CELL_HEAD
+    assert (engine.observations[0] == CELL_FOOD).sum() == 1
+
+
+def test_reverse_direction_is_ignored():
+    config = SnakeGameConfig(cols=10, rows=10, rng_seed=5)
+    engine = VectorSnakeEngine(config, 1)
+    left = DIRECTIONS.index(Direction.LEFT)
+
+    result = engine.step(np.array([left]))
+
+    assert not result.dones[0]
+    assert DIRECTIONS[engine.directions[0]] is Direction.RIGHT
+
+
+def test_inner_walls_are_collisions():
+    # Начальная голова в (5, 3), стена прямо перед ней
+    walls = frozenset({(6, 3), (0, 0)})
+    config = SnakeGameConfig(cols=10, rows=6, rng_seed=2, walls=walls)
+    engine = VectorSnakeEngine(config, 2)
+
+    assert (engine.observations[:, 0, 0] == CELL_WALL).all()
+    result = engine.step(_keep(engine))
+
+    assert result.dones.all()
+    assert (engine.observations[:, 3, 6] == CELL_WALL).all()
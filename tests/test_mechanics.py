@@ -4,6 +4,8 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
+from snake_game.core.food import FoodChance, FoodTable, ModeFoodConfig
+
 os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
 os.environ['SNAKE_GAME_SKIP_LOOP'] = '1'
 
@@ -26,8 +28,7 @@ class GameMechanicsTests(unittest.TestCase):
             'level': self.game.level,
             'score': self.game.score,
             'speed_boost_on_food': self.game.speed_boost_on_food,
-            'speed_boost_active_until': self.game.speed_boost_active_until,
-            'invincible_until': self.game.invincible_until,
+            'effects': self.game.effects.copy(),
             'snake_body': [segment[:] for segment in self.game.snake_body],
             'walls': list(self.game.walls),
             'moving_walls': [dict(item) for item in self.game.moving_walls],
@@ -43,10 +44,7 @@ class GameMechanicsTests(unittest.TestCase):
         self.game.level = self.state['level']
         self.game.score = self.state['score']
         self.game.speed_boost_on_food = self.state['speed_boost_on_food']
-        self.game.speed_boost_active_until = (
-            self.state['speed_boost_active_until']
-        )
-        self.game.invincible_until = self.state['invincible_until']
+        self.game.effects = self.state['effects']
         self.game.snake_body = [
             segment[:] for segment in self.state['snake_body']
         ]
@@ -71,7 +69,7 @@ class GameMechanicsTests(unittest.TestCase):
         self.game.mode = 'mvp'
         self.game.level = 7
         self.game.score = 120
-        with mock.patch.object(self.game.rng, 'random', return_value=0.0):
+        with mock.patch.object(self.game.food_rng, 'random', return_value=0.0):
             result = self.game.choose_food_type()
         self.assertEqual(result, 'normal')
 
@@ -88,27 +86,30 @@ class GameMechanicsTests(unittest.TestCase):
         self.game.mode = 'map'
         self.game.level = 6
         self.game.score = 90
-        with mock.patch.object(self.game.rng, 'random', return_value=0.0):
+        with mock.patch.object(self.game.food_rng, 'random', return_value=0.0):
             result = self.game.choose_food_type()
         self.assertEqual(result, 'bonus')
 
     def test_choose_food_type_survival_shield_priority(self):
-        custom_config = {
-            'bonus': {'base': 0.05, 'level': 0.0, 'score': 0.0, 'cap': 1.0},
-            'shield': {'base': 0.5, 'level': 0.0, 'score': 0.0, 'cap': 1.0},
-            'speed': {'base': 0.0, 'level': 0.0, 'score': 0.0, 'cap': 1.0},
-            'max_total': 1.0,
-        }
+        custom_table = FoodTable(
+            ModeFoodConfig(
+                bonus=FoodChance(0.05),
+                shield=FoodChance(0.5),
+                speed=FoodChance(0.0),
+            )
+        )
         with mock.patch.dict(
-            self.game.MODE_FOOD_CONFIG,
-            {'survival': custom_config},
+            self.game.FOOD_TABLES,
+            {'survival': custom_table},
             clear=False,
         ):
             self.game.speed_boost_on_food = False
             self.game.mode = 'survival'
             self.game.level = 1
             self.game.score = 0
-            with mock.patch.object(self.game.rng, 'random', return_value=0.3):
+            with mock.patch.object(
+                self.game.food_rng, 'random', return_value=0.3
+            ):
                 result = self.game.choose_food_type()
         self.assertEqual(result, 'shield')
 
@@ -116,6 +117,7 @@ class GameMechanicsTests(unittest.TestCase):
         self.game.speed_boost_on_food = False
         self.game.snake_body = []
         self.game.walls = []
+        self.game.wall_cells = set()
         self.game.moving_walls = []
         with mock.patch.object(self.game.rng, 'randrange', side_effect=[5, 6]):
             self.game.spawn_food(force_type='shield')
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from snake_game.core import GameStepEvent, SnakeGameConfig
+from snake_game.services import (
+    LatencyHistogram,
+    SnakeSession,
+    StepRecorder,
+)
+
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(3)  # noqa: S311
+    values = [int(rng.lognormvariate(10, 1.5)) for _ in range(20_000)]
+    histogram = LatencyHistogram(precision_bits=8)
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for percent in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * percent / 100) - 1]
+        assert histogram.percentile(percent) == pytest.approx(
+            exact, rel=2 ** -7
+        )
+    assert histogram.max == values[-1] and histogram.min == values[0]
+    assert histogram.percentile(100) == values[-1]
+
+
+def test_histogram_merge_and_small_values_are_exact():
+    first = LatencyHistogram()
+    second = LatencyHistogram()
+    for value in range(100):
+        (first if value % 2 else second).record(value)
+
+    first.merge(second)
+
+    assert first.count == 100 and first.min == 0 and first.max == 99
+    assert first.percentile(50) == 49
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(precision_bits=4))
+
+
+def test_session_hooks_and_recorder():
+    session = SnakeSession(SnakeGameConfig(cols=6, rows=6, rng_seed=1))
+    calls = []
+    recorder = StepRecorder()
+
+    def pre_step(current):
+        calls.append(current.state.steps)
+
+    session.add_pre_step_hook(pre_step)
+    recorder.attach(session)
+    while not session.state.game_over:
+        session.step()
+
+    assert calls == list(range(len(calls)))
+    assert recorder.tick.count == len(calls)
+    assert recorder.engine.max <= recorder.tick.max
+    events = recorder.events
+    assert events[GameStepEvent.GAME_OVER] == 1
+    assert events[GameStepEvent.MOVED] == len(calls)
+    assert recorder.summary()["tick"]["count"] == len(calls)
+
+    # Без хуков сессия снова использует обычный step без замеров
+    recorder.detach()
+    session.remove_step_hook(pre_step)
+    assert "step" not in vars(session)
@@ -0,0 +1,93 @@
+import random
+
+from snake_game.core import Direction, SnakeGameConfig
+from snake_game.services import (
+    Replay,
+    SnakeSession,
+    verify_many,
+    verify_replay,
+)
+
+
+def _play(session, seed, ticks=400):
+    rng = random.Random(seed)  # noqa: S311
+    for tick in range(ticks):
+        if rng.random() < 0.3:
+            session.set_direction(rng.choice(list(Direction)))
+        if tick == 40:
+            session.toggle_pause()
+        if tick == 45:
+            session.toggle_pause()
+        if tick == 60:
+            session.resize_board(14, 11)
+        session.step()
+        if session.state.game_over:
+            break
+
+
+def test_recorded_game_verifies():
+    session = SnakeSession(
+        SnakeGameConfig(cols=12, rows=12), record_replay=True
+    )
+    _play(session, seed=1)
+    replay = session.replay
+
+    assert replay.config.rng_seed is not None
+    verdict = verify_replay(replay)
+    assert verdict.ok, verdict
+    assert verdict.actual_score == session.state.score
+
+
+def test_replay_bytes_roundtrip_and_tampering():
+    session = SnakeSession(
+        SnakeGameConfig(cols=10, rows=8, rng_seed=5), record_replay=True
+    )
+    _play(session, seed=2)
+    data = session.replay.to_bytes()
+
+    restored = Replay.from_bytes(data)
+    assert restored.inputs == session.replay.inputs
+    assert verify_replay(data).ok
+
+    restored.score += 10
+    assert not verify_replay(restored).ok
+
+
+def test_restart_starts_new_verifiable_recording():
+    session = SnakeSession(
+        SnakeGameConfig(cols=10, rows=10, rng_seed=3), record_replay=True
+    )
+    _play(session, seed=3, ticks=50)
+    session.restart()
+    _play(session, seed=4)
+
+    # Тик столкновения записан, но змейка на нём уже не двигается
+    state = session.state
+    assert session.replay.ticks == state.steps + state.game_over
+    verdicts = verify_many([session.replay.to_bytes()] * 3, processes=1)
+    assert all(verdict.ok for verdict in verdicts)
+
+
+def test_replay_keeps_walls():
+    walls = frozenset({(2, 2), (3, 2), (7, 5)})
+    session = SnakeSession(
+        SnakeGameConfig(cols=10, rows=8, rng_seed=6, walls=walls),
+        record_replay=True,
+    )
+    _play(session, seed=5, ticks=100)
+
+    restored = Replay.from_bytes(session.replay.to_bytes())
+    assert restored.config.walls == walls
+    assert verify_replay(restored).ok
+
+
+def test_replay_keeps_input_queue_size():
+    session = SnakeSession(
+        SnakeGameConfig(cols=10, rows=8, rng_seed=7, input_queue_size=2),
+        record_replay=True,
+    )
+    _play(session, seed=6, ticks=100)
+
+    restored = Replay.from_bytes(session.replay.to_bytes())
+    assert restored.config.input_queue_size == 2
+    assert verify_replay(restored).ok
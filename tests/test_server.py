@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+from snake_game.core import GameStepEvent, SnakeGameConfig
+from snake_game.services import SnakeSession
+from snake_game.services.server import SessionServer, _HostedSession
+
+
+async def _listen(server):
+    listener = await server.start_tcp("127.0.0.1", 0)
+    return listener.sockets[0].getsockname()[1]
+
+
+async def _send(writer, line):
+    writer.write(f"{line}\n".encode())
+    await writer.drain()
+
+
+def test_session_plays_over_line_protocol():
+    async def scenario():
+        server = SessionServer(resolution=0.002)
+        port = await _listen(server)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await _send(writer, "TURN UP")
+        assert (await reader.readline()).startswith(b"ERR ")
+
+        await _send(writer, "START 10 10 1")
+        assert await reader.readline() == b"STARTED 10 10 10\n"
+        moved = str(GameStepEvent.MOVED.mask).encode()
+        first = (await reader.readline()).split()
+        assert first[:3] == [b"T", b"1", moved]
+        assert first[5:7] == [b"6", b"5"]
+
+        await _send(writer, "TURN UP")
+        await _send(writer, "STATS")
+        while not (line := await reader.readline()).startswith(b"STATS"):
+            assert line.startswith(b"T ")
+        assert b"sessions=1" in line
+
+        await _send(writer, "QUIT")
+        assert await reader.read() == b""
+        assert server.session_count == 0
+        await server.close()
+
+    asyncio.run(scenario())
+
+
+class _Writer:
+    """Заглушка StreamWriter: копит строки, буфер отправки пуст."""
+
+    def __init__(self):
+        self.lines = []
+        self.transport = SimpleNamespace(get_write_buffer_size=lambda: 0)
+
+    def write(self, data):
+        self.lines.append(data)
+
+    def close(self):
+        pass
+
+
+def _host(server, config):
+    hosted = _HostedSession(SnakeSession(config), _Writer())
+    server._sessions.add(hosted)
+    server._start_ticking(hosted)
+    return hosted
+
+
+def test_sessions_share_one_wheel_at_their_own_rate():
+    # Шаг колеса 10 мс: интервалы 2,5, 4 и 10 шагов колеса
+    server = SessionServer(resolution=0.01)
+    hosted = [
+        _host(
+            server,
+            SnakeGameConfig(
+                cols=50,
+                rows=50,
+                wrap_edges=True,
+                initial_speed=speed,
+                speed_increment=0.0,
+            ),
+        )
+        for speed in (40.0, 25.0, 10.0)
+    ]
+    for _ in range(100):
+        server._advance()
+
+    assert [h.session.state.steps for h in hosted] == [40, 25, 10]
+    assert [len(h.writer.lines) for h in hosted] == [40, 25, 10]
+    assert server.ticks == 75
+
+    # Пауза снимает сессию с колеса, остальные идут в своём темпе
+    server._handle(hosted[0], "PAUSE", [])
+    for _ in range(100):
+        server._advance()
+    assert [h.session.state.steps for h in hosted] == [40, 50, 20]